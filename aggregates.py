@@ -0,0 +1,384 @@
+# ============================================
+# آمار تجمعی افزایشی (Running Aggregates)
+# ============================================
+#
+# شمارنده‌های پرتکرار یک رابط مشترک دارند (increment، most_common، get، items):
+# TopKCounter دقیق است و SpaceSavingCounter حافظه ثابت و تخمین با کران خطا دارد.
+# EmotionTracker وضعیت عاطفی گفتگو را با امتیازهای میرا و پسماند دنبال می‌کند.
+
+import heapq
+import math
+
+from ring_buffer import RingBuffer
+
+
+class RunningStats:
+    """آمار یک مقدار عددی که با هر نمونه در O(1) به‌روز می‌شود
+
+    مجموع به همان ترتیب sum() روی تاریخچه جمع می‌شود تا میانگین دقیقاً برابر بماند؛
+    واریانس با روش Welford و EWMA با ضریب ewma_alpha محاسبه می‌شوند.
+    """
+
+    def __init__(self, ewma_alpha=0.1):
+        self.ewma_alpha = ewma_alpha
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.ewma = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        """افزودن یک نمونه"""
+        self.count += 1
+        self.total += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        if self.count == 1:
+            self.minimum = self.maximum = self.ewma = value
+        else:
+            self.minimum = min(self.minimum, value)
+            self.maximum = max(self.maximum, value)
+            self.ewma += self.ewma_alpha * (value - self.ewma)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self):
+        """واریانس جامعه نمونه‌ها"""
+        return self._m2 / self.count if self.count else 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "std": math.sqrt(self.variance),
+            "min": self.minimum,
+            "max": self.maximum,
+            "ewma": self.ewma
+        }
+
+
+class TopKCounter:
+    """شمارنده دقیق که k عضو پرتکرار را هنگام افزایش شمارش به‌روز نگه می‌دارد
+
+    ترتیب اعضای هم‌شمار مثل sorted() روی دیکشنری است (اول، کلیدی که زودتر دیده شده)؛
+    درخواست بیش از k عضو با مرتب‌سازی کامل پاسخ داده می‌شود.
+    """
+
+    def __init__(self, k=5):
+        self.k = k
+        self.counts = {}
+        # ترتیب اولین مشاهده هر کلید برای شکستن تساوی
+        self._rank = {}
+        self._top = []
+
+    def increment(self, key, amount=1):
+        """افزایش شمارش یک کلید"""
+        counts = self.counts
+        if key in counts:
+            counts[key] += amount
+        else:
+            counts[key] = amount
+            self._rank[key] = len(self._rank)
+        if amount < 0:
+            # با کاهش شمارش، فهرست برترها در اولین درخواست از نو ساخته می‌شود
+            self._top = None
+        elif self._top is not None:
+            self._promote(key)
+
+    def _sort_key(self, key):
+        return (-self.counts[key], self._rank[key])
+
+    def _promote(self, key):
+        top = self._top
+        if key in top:
+            top.sort(key=self._sort_key)
+        elif len(top) < self.k:
+            top.append(key)
+            top.sort(key=self._sort_key)
+        elif self._sort_key(key) < self._sort_key(top[-1]):
+            top[-1] = key
+            top.sort(key=self._sort_key)
+
+    def most_common(self, n=None):
+        """n کلید پرتکرار به صورت (کلید، شمارش)"""
+        if n is None or n > self.k:
+            return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+        if self._top is None:
+            self._top = sorted(self.counts, key=self._sort_key)[:self.k]
+        return [(key, self.counts[key]) for key in self._top[:n]]
+
+    def get(self, key, default=0):
+        return self.counts.get(key, default)
+
+    def items(self):
+        return self.counts.items()
+
+    def clear(self):
+        self.counts.clear()
+        self._rank.clear()
+        self._top = []
+
+    def __getitem__(self, key):
+        return self.counts[key]
+
+    def __contains__(self, key):
+        return key in self.counts
+
+    def __iter__(self):
+        return iter(self.counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __bool__(self):
+        return bool(self.counts)
+
+    def __eq__(self, other):
+        if isinstance(other, TopKCounter):
+            return self.counts == other.counts
+        if isinstance(other, dict):
+            return self.counts == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TopKCounter({self.counts!r}, k={self.k})"
+
+
+class SpaceSavingCounter:
+    """شمارنده تقریبی پرتکرارها با حافظه ثابت (الگوریتم Space-Saving)
+
+    حداکثر capacity کلید نگه داشته می‌شود؛ کلید جدید در صورت پر بودن جای کم‌شمارترین
+    کلید را می‌گیرد و شمارش آن را به ارث می‌برد. شمارش گزارش شده هر کلید حداکثر به
+    اندازه error آن بیشتر از مقدار واقعی است و error هرگز از total / capacity بیشتر نمی‌شود.
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("ظرفیت شمارنده باید حداقل ۱ باشد")
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        self._heap = []
+        self._sequence = 0
+
+    def increment(self, key, amount=1):
+        """افزایش شمارش یک کلید (amount باید مثبت باشد)"""
+        if amount < 1:
+            raise ValueError("Space-Saving فقط افزایش شمارش را پشتیبانی می‌کند")
+        counts = self.counts
+        self.total += amount
+        if key in counts:
+            counts[key] += amount
+        elif len(counts) < self.capacity:
+            counts[key] = amount
+            self.errors[key] = 0
+        else:
+            evicted, minimum = self._pop_minimum()
+            del counts[evicted]
+            del self.errors[evicted]
+            counts[key] = minimum + amount
+            self.errors[key] = minimum
+        self._push(key)
+
+    def _push(self, key):
+        # ورودی‌های کهنه در heap باقی می‌مانند و هنگام برداشتن نادیده گرفته می‌شوند
+        self._sequence += 1
+        heapq.heappush(self._heap, (self.counts[key], self._sequence, key))
+        if len(self._heap) > 2 * self.capacity:
+            self._rebuild_heap()
+
+    def _pop_minimum(self):
+        heap = self._heap
+        while True:
+            count, _, key = heapq.heappop(heap)
+            if self.counts.get(key) == count:
+                return key, count
+
+    def _rebuild_heap(self):
+        self._heap = [(count, index, key) for index, (key, count) in enumerate(self.counts.items())]
+        self._sequence = len(self._heap)
+        heapq.heapify(self._heap)
+
+    def most_common(self, n=None):
+        """n کلید پرتکرار به صورت (کلید، شمارش تخمینی)"""
+        if n is None:
+            return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+    def most_common_with_error(self, n=None):
+        """n کلید پرتکرار به صورت (کلید، شمارش تخمینی، حداکثر خطا)؛
+        شمارش واقعی در بازه [شمارش - خطا، شمارش] است"""
+        return [(key, count, self.errors[key]) for key, count in self.most_common(n)]
+
+    def error(self, key):
+        """حداکثر بیش‌برآورد شمارش کلید (برای کلید ناموجود: کران کلی)"""
+        if key in self.errors:
+            return self.errors[key]
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    @property
+    def error_bound(self):
+        """کران بالای خطای هر شمارش: total / capacity"""
+        return self.total / self.capacity
+
+    def get(self, key, default=0):
+        return self.counts.get(key, default)
+
+    def items(self):
+        return self.counts.items()
+
+    def clear(self):
+        self.counts.clear()
+        self.errors.clear()
+        self.total = 0
+        self._heap = []
+        self._sequence = 0
+
+    def __getstate__(self):
+        # heap از روی شمارش‌ها بازسازی می‌شود و ذخیره نمی‌شود
+        state = dict(vars(self))
+        del state["_heap"]
+        return state
+
+    def __setstate__(self, state):
+        vars(self).update(state)
+        self._rebuild_heap()
+
+    def __getitem__(self, key):
+        return self.counts[key]
+
+    def __contains__(self, key):
+        return key in self.counts
+
+    def __iter__(self):
+        return iter(self.counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __bool__(self):
+        return bool(self.counts)
+
+    def __repr__(self):
+        return f"SpaceSavingCounter({self.counts!r}, capacity={self.capacity})"
+
+
+class EmotionTracker:
+    """وضعیت عاطفی گفتگو با امتیازهای میرا، پنجره کشویی و پسماند (hysteresis)
+
+    هر نوبت امتیاز همه هیجان‌ها با ضریب decay کم می‌شود و شواهد نوبت (نسبت به
+    قوی‌ترین هیجان همان نوبت) با وزن 1 - decay اضافه می‌شود، پس امتیازها میانگین
+    نمایی و بین ۰ و ۱ هستند. امتیازها تا precision رقم اعشار گرد و امتیاز کمتر از
+    floor حذف می‌شود تا نوبت‌های تکراری به وضعیت‌های تکراری برسند (برای حافظه نهان
+    نتایج) و وضعیت پس از نوبت‌های بی‌هیجان دقیقاً به حالت اولیه برگردد. وضعیت فعلی با رسیدن امتیاز به
+    enter_threshold از neutral وارد یک هیجان، با افت آن زیر exit_threshold به neutral
+    برمی‌گردد و فقط وقتی به هیجان دیگر می‌رود که امتیاز آن دست کم switch_margin بیشتر
+    باشد. window هیجان اصلی آخرین نوبت‌ها با شمارش هر کدام است.
+
+    هزینه هر نوبت به تعداد هیجان‌های با امتیاز غیرصفر (حداکثر تعداد هیجان‌های جدول)
+    بستگی دارد و به طول گفتگو وابسته نیست.
+    """
+
+    def __init__(self, decay=0.7, window=3, enter_threshold=0.25, exit_threshold=0.1,
+                 switch_margin=0.15, precision=2, floor=0.02, neutral="neutral"):
+        if not 0 <= decay < 1:
+            raise ValueError("ضریب میرایی باید در بازه [0, 1) باشد")
+        if exit_threshold > enter_threshold:
+            raise ValueError("آستانه خروج نباید از آستانه ورود بیشتر باشد")
+        self.decay = decay
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.switch_margin = switch_margin
+        self.precision = precision
+        self.floor = floor
+        self.neutral = neutral
+        self.emotion = neutral
+        self.scores = {}
+        self.recent = RingBuffer(window)
+        self.recent_counts = {}
+
+    def observe(self, evidence, primary=None):
+        """ثبت یک نوبت: evidence هیجان -> اطمینان، primary هیجان اصلی نوبت؛ وضعیت جدید را برمی‌گرداند"""
+        decay = self.decay
+        scores = self.scores
+        for emotion in scores:
+            scores[emotion] *= decay
+        top = max(evidence.values(), default=0)
+        if top > 0:
+            for emotion, confidence in evidence.items():
+                scores[emotion] = scores.get(emotion, 0.0) + (1 - decay) * confidence / top
+        for emotion, score in list(scores.items()):
+            score = round(score, self.precision)
+            if score < self.floor:
+                del scores[emotion]
+            else:
+                scores[emotion] = score
+
+        self._push_recent(primary if primary is not None else self.neutral)
+        self.emotion = self._next_emotion()
+        return self.emotion
+
+    def _push_recent(self, emotion):
+        recent, counts = self.recent, self.recent_counts
+        if len(recent) == recent.capacity:
+            evicted = recent[0]
+            counts[evicted] -= 1
+            if not counts[evicted]:
+                del counts[evicted]
+        recent.append(emotion)
+        counts[emotion] = counts.get(emotion, 0) + 1
+
+    def _next_emotion(self):
+        scores = self.scores
+        emotion = self.emotion
+        current = scores.get(emotion, 0.0)
+        if emotion != self.neutral and current < self.exit_threshold:
+            emotion, current = self.neutral, 0.0
+        leader = max(scores, key=scores.__getitem__, default=None)
+        if leader is None or leader == emotion:
+            return emotion
+        if emotion == self.neutral:
+            return leader if scores[leader] >= self.enter_threshold else emotion
+        return leader if scores[leader] >= current + self.switch_margin else emotion
+
+    def count(self, emotion):
+        """تعداد نوبت‌های پنجره با هیجان اصلی emotion"""
+        return self.recent_counts.get(emotion, 0)
+
+    def get_state(self):
+        """وضعیت قابل مقایسه و بازگرداندنی (بدون پارامترها)"""
+        return {
+            "emotion": self.emotion,
+            "scores": dict(self.scores),
+            "recent": list(self.recent)
+        }
+
+    def set_state(self, state):
+        self.emotion = state["emotion"]
+        self.scores = dict(state["scores"])
+        self.recent.clear()
+        self.recent_counts = {}
+        for emotion in state["recent"]:
+            self._push_recent(emotion)
+
+    def __getstate__(self):
+        state = dict(vars(self))
+        del state["recent_counts"]
+        return state
+
+    def __setstate__(self, state):
+        vars(self).update(state)
+        self.recent_counts = {}
+        for emotion in self.recent:
+            self.recent_counts[emotion] = self.recent_counts.get(emotion, 0) + 1
+
+    def __repr__(self):
+        return f"EmotionTracker({self.emotion!r}, scores={self.scores!r})"
@@ -0,0 +1,90 @@
+# ============================================
+# متن تحلیل‌شده (Analyzed Text)
+# ============================================
+
+from functools import cached_property
+
+from lexicon import LEXICON
+
+
+class AnalyzedText(str):
+    """متنی که یک بار برای هر درخواست تحلیل می‌شود و همه ماژول‌ها از آن می‌خوانند
+
+    چون زیرکلاس str است، هر جایی که رشته پذیرفته می‌شود این شیء هم پذیرفته می‌شود؛
+    شکل نرمال‌شده، توکن‌ها و جمله‌ها فقط در اولین دسترسی محاسبه و نگه داشته می‌شوند.
+    """
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AnalyzedText تغییرناپذیر است")
+
+    def __delattr__(self, name):
+        raise AttributeError("AnalyzedText تغییرناپذیر است")
+
+    def __reduce__(self):
+        return (AnalyzedText, (str(self),))
+
+    @cached_property
+    def normalized(self):
+        """شکل نرمال‌شده (حروف کوچک) متن"""
+        return self.lower()
+
+    @cached_property
+    def tokens(self):
+        """کلمات متن با جداسازی بر اساس فاصله"""
+        return tuple(self.split())
+
+    @cached_property
+    def normalized_tokens(self):
+        """کلمات شکل نرمال‌شده متن"""
+        return tuple(self.normalized.split())
+
+    @cached_property
+    def token_set(self):
+        """مجموعه کلمات یکتای شکل نرمال‌شده"""
+        return frozenset(self.normalized_tokens)
+
+    @cached_property
+    def word_count(self):
+        """تعداد کلمات متن"""
+        return len(self.tokens)
+
+    @cached_property
+    def sentence_spans(self):
+        """بازه‌های (شروع، پایان) جمله‌ها با جداسازی بر اساس نقطه"""
+        spans = []
+        start = 0
+        end = self.find(".")
+        while end != -1:
+            spans.append((start, end))
+            start = end + 1
+            end = self.find(".", start)
+        spans.append((start, len(self)))
+        return tuple(spans)
+
+    @cached_property
+    def sentences(self):
+        """جمله‌های متن"""
+        return tuple(self[start:end] for start, end in self.sentence_spans)
+
+    @cached_property
+    def sentence_word_counts(self):
+        """تعداد کلمات هر جمله"""
+        return tuple(len(sentence.split()) for sentence in self.sentences)
+
+    @cached_property
+    def keywords(self):
+        """کلیدواژه‌های واژگان مشترک که در متن وجود دارند"""
+        return LEXICON.scan(self)
+
+    @cached_property
+    def normalized_keywords(self):
+        """کلیدواژه‌های شکل نرمال‌شده (اگر متن از قبل نرمال باشد همان keywords)"""
+        normalized = self.normalized
+        return self.keywords if normalized == self else LEXICON.scan(normalized)
+
+
+def analyze(text):
+    """تبدیل رشته به متن تحلیل‌شده (متن تحلیل‌شده بدون تغییر بازگردانده می‌شود)"""
+    if isinstance(text, AnalyzedText):
+        return text
+    return AnalyzedText(text)
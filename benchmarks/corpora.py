@@ -0,0 +1,162 @@
+# ============================================
+# پیکره‌های مصنوعی قطعی برای بنچمارک‌ها (فارسی و انگلیسی)
+# ============================================
+#
+# هر نوبت گفتگو یک dict با ورودی کاربر، پاسخ، بازخورد و متن‌های کمکی است. واژه‌ها
+# از جدول‌های کلیدواژه ماژول‌ها برداشته می‌شوند تا همه شاخه‌های تحلیل فعال شوند؛
+# با اندازه و seed یکسان، پیکره در هر اجرا و هر commit یکسان است.
+
+import hashlib
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cognitive_monitoring
+import performance_evaluation
+import self_awareness
+import user_mental_model
+
+REACTIONS = ["satisfied", "confused", "neutral"]
+
+
+def persian_vocabulary():
+    """واژگان پیکره فارسی از جدول‌های user_mental_model و performance_evaluation"""
+    return {
+        "topics": user_mental_model.COMMON_TOPICS,
+        "questions": [
+            "{topic} چیست؟",
+            "معنی {topic} چیست؟",
+            "چگونه {topic} را یاد بگیرم؟",
+            "روش یادگیری {topic} کدام است؟",
+            "چرا {topic} مهم است؟",
+            "دلیل اهمیت {topic} چیست؟",
+            "تفاوت {topic} و {other} چیست؟",
+            "{topic} و {other} را مقایسه کن"
+        ],
+        "explicit_goals": list(user_mental_model.EXPLICIT_GOAL_INDICATORS),
+        "implicit_goals": list(user_mental_model.IMPLICIT_GOAL_CLUES),
+        "emotions": [indicator for indicators in user_mental_model.EMOTIONAL_INDICATORS.values() for indicator in indicators],
+        "limitations": [indicator for indicators, _ in self_awareness.LIMITATION_INDICATORS for indicator in indicators],
+        "identity": "من اسمم {name} است",
+        "names": ["سارا", "علی", "مریم", "رضا"],
+        "accuracy": [indicator for indicator, _ in performance_evaluation.ACCURACY_INDICATORS],
+        "inaccuracy": performance_evaluation.INACCURACY_INDICATORS,
+        "coherence": [indicator for indicator, _ in performance_evaluation.COHERENCE_INDICATORS],
+        "elements": list(performance_evaluation.RESPONSE_ELEMENTS),
+        "response": "{accuracy}، {topic} شامل {element} و {second_element} است. {coherence} {third_element} آن را روشن می‌کند{hedge}.",
+        "hedge": " {inaccuracy}",
+        "feedback_tones": ["عالی", "ممتاز", "ضعیف", "بد", "متوسط", "قابل قبول", "خوب"],
+        "feedback_lessons": ["کامل‌تر", "کوتاه‌تر", "ساده‌تر", "مثال", "منبع", "شفاف"],
+        "feedback": "پاسخ {tone} بود، لطفاً {lesson} باشد",
+        "biases": [indicator for indicators in cognitive_monitoring.BIAS_INDICATORS.values() for indicator in indicators],
+        "reasoning": "{topic} {bias} نتیجه مطلوب را می‌دهد",
+        "errors": ["دقت", "کامل بودن", "انسجام"]
+    }
+
+
+def english_vocabulary():
+    """واژگان پیکره انگلیسی؛ جدول‌های metacognitive_english.py داخل متدها تعریف شده‌اند
+    و اینجا بازنویسی شده‌اند"""
+    return {
+        "topics": [
+            "artificial intelligence", "machine learning", "programming", "mathematics",
+            "data science", "neural networks", "natural language processing"
+        ],
+        "questions": [
+            "What is {topic}?",
+            "What is the meaning of {topic}?",
+            "How do I learn {topic}?",
+            "What is the method for learning {topic}?",
+            "Why is {topic} important?",
+            "What is the reason {topic} matters?",
+            "What is the difference between {topic} and {other}?",
+            "compare {topic} and {other}"
+        ],
+        "explicit_goals": ["I want to know", "I need", "how can I", "please explain", "compare"],
+        "implicit_goals": ["a lot of time", "say simply", "give example", "source", "is it correct"],
+        "emotions": [
+            "thank you", "excellent", "very good", "well done", ":)",
+            "I'm tired", "complicated", "I don't understand", "hard", ":(",
+            "interesting", "why", "how", "I want to know", "?",
+            "urgent", "quick", "now", "immediately", "!!!",
+            "what do you mean", "wrong", "I have a question"
+        ],
+        "limitations": ["latest news", "now", "execute code", "program", "move", "physical"],
+        "identity": "I say my name is {name}",
+        "names": ["Sara", "Ali", "Maryam", "Reza"],
+        "accuracy": ["according to research", "studies show", "scientifically proven", "statistics show"],
+        "inaccuracy": ["maybe", "probably", "I think", "in my opinion"],
+        "coherence": ["first", "then", "therefore", "in conclusion", "in summary"],
+        "elements": ["definition", "explanation", "example", "conclusion", "reference"],
+        "response": "{accuracy}, {topic} includes a {element} and an {second_element}. {coherence} the {third_element} makes it clear{hedge}.",
+        "hedge": ", {inaccuracy}",
+        "feedback_tones": ["excellent", "great", "poor", "bad", "average", "acceptable", "fine"],
+        "feedback_lessons": ["more complete", "shorter", "simpler", "example", "source", "clear"],
+        "feedback": "The answer was {tone}, please make it {lesson}",
+        "biases": ["only", "always", "never", "recently", "famous", "popular", "but", "if", "only if"],
+        "reasoning": "{topic} {bias} gives the expected result",
+        "errors": ["accuracy", "completeness", "coherence"]
+    }
+
+
+VOCABULARIES = {
+    "fa": persian_vocabulary,
+    "en": english_vocabulary
+}
+
+
+def generate_corpus(language, size, seed=0):
+    """size نوبت گفتگوی قطعی به زبان language ("fa" یا "en")"""
+    vocabulary = VOCABULARIES[language]()
+    rng = random.Random(f"{language}:{seed}")
+    turns = []
+    for _ in range(size):
+        topic, other = rng.sample(vocabulary["topics"], 2)
+        parts = []
+        if rng.random() < 0.1:
+            parts.append(vocabulary["identity"].format(name=rng.choice(vocabulary["names"])))
+        if rng.random() < 0.4:
+            parts.append(rng.choice(vocabulary["explicit_goals"]))
+        parts.append(rng.choice(vocabulary["questions"]).format(topic=topic, other=other))
+        if rng.random() < 0.3:
+            parts.append(rng.choice(vocabulary["implicit_goals"]))
+        if rng.random() < 0.5:
+            parts.append(rng.choice(vocabulary["emotions"]))
+        if rng.random() < 0.1:
+            parts.append(rng.choice(vocabulary["limitations"]))
+
+        elements = rng.sample(vocabulary["elements"], 3)
+        hedge = ""
+        if rng.random() < 0.3:
+            hedge = vocabulary["hedge"].format(inaccuracy=rng.choice(vocabulary["inaccuracy"]))
+        response = vocabulary["response"].format(
+            accuracy=rng.choice(vocabulary["accuracy"]),
+            topic=topic,
+            element=elements[0],
+            second_element=elements[1],
+            third_element=elements[2],
+            coherence=rng.choice(vocabulary["coherence"]),
+            hedge=hedge
+        )
+
+        turns.append({
+            "input": " ".join(parts),
+            "response": response,
+            "feedback": vocabulary["feedback"].format(
+                tone=rng.choice(vocabulary["feedback_tones"]),
+                lesson=rng.choice(vocabulary["feedback_lessons"])
+            ),
+            "reasoning": vocabulary["reasoning"].format(topic=topic, bias=rng.choice(vocabulary["biases"])),
+            "error": rng.choice(vocabulary["errors"]),
+            "reaction": rng.choice(REACTIONS)
+        })
+    return turns
+
+
+def corpus_digest(turns):
+    """اثر انگشت پیکره برای اطمینان از یکسان بودن ورودی‌ها بین اجراها"""
+    encoded = json.dumps(turns, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
@@ -0,0 +1,80 @@
+# ============================================
+# بنچمارک دنبال کردن وضعیت عاطفی گفتگو: هزینه هر نوبت در گفتگوهای طولانی
+# ============================================
+#
+# هزینه EmotionTracker.observe و detect_emotional_state در چند نقطه از یک گفتگوی
+# طولانی اندازه‌گیری می‌شود (باید با طول گفتگو ثابت بماند) و با محاسبه دوباره
+# امتیازهای میرا روی کل تاریخچه در هر نوبت مقایسه می‌شود.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import generate_corpus
+from sizing import deep_sizeof
+from user_mental_model import EMOTIONAL_INDICATORS, UserMentalModel
+
+
+def recompute(history, decay):
+    """امتیازهای میرا با پیمایش کل تاریخچه (روش بدون حالت، برای مقایسه)"""
+    scores = {}
+    for evidence in history:
+        for emotion in scores:
+            scores[emotion] *= decay
+        top = max(evidence.values(), default=0)
+        for emotion, confidence in evidence.items():
+            scores[emotion] = scores.get(emotion, 0.0) + (1 - decay) * confidence / top
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="هزینه هر نوبت دنبال کردن وضعیت عاطفی با طول گفتگو")
+    parser.add_argument("--turns", type=int, default=200_000)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--recompute-turns", type=int, default=2000, help="طول گفتگو برای روش محاسبه دوباره")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    inputs = [turn["input"] for turn in generate_corpus("fa", 1000, args.seed)]
+    model = UserMentalModel()
+    tracker = model.emotion_tracker
+    evidences = [model.detect_emotional_state(text)["confidence_scores"] for text in inputs]
+    primaries = [max(evidence, key=evidence.get) if evidence else "neutral" for evidence in evidences]
+
+    sample_every = max(1, args.turns // args.samples)
+    samples = []
+    for start in range(0, args.turns, sample_every):
+        count = min(sample_every, args.turns - start)
+        started = time.perf_counter()
+        for index in range(start, start + count):
+            tracker.observe(evidences[index % len(evidences)], primaries[index % len(primaries)])
+        observe_us = (time.perf_counter() - started) / count * 1e6
+        started = time.perf_counter()
+        for index in range(1000):
+            model.detect_emotional_state(inputs[index])
+        samples.append({
+            "turns": start + count,
+            "observe_us": observe_us,
+            "detect_emotional_state_us": (time.perf_counter() - started) / 1000 * 1e6,
+            "tracker_bytes": deep_sizeof(tracker)
+        })
+
+    history = [evidences[index % len(evidences)] for index in range(args.recompute_turns)]
+    started = time.perf_counter()
+    for length in range(1, len(history) + 1):
+        recompute(history[:length], tracker.decay)
+    recompute_us = (time.perf_counter() - started) / len(history) * 1e6
+
+    print(json.dumps({
+        "emotions": len(EMOTIONAL_INDICATORS),
+        "samples": samples,
+        "recompute": {"turns": args.recompute_turns, "per_turn_us": recompute_us}
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
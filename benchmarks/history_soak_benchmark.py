@@ -0,0 +1,126 @@
+# ============================================
+# آزمون ماندگاری حافظه تاریخچه‌های ماژول‌ها
+# ============================================
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import SpaceSavingCounter, TopKCounter
+from cognitive_control import CognitiveControl
+from cognitive_monitoring import CognitiveMonitoring
+from performance_evaluation import PerformanceEvaluation
+from self_awareness import SelfAwareness
+from user_mental_model import UserMentalModel
+
+from corpora import generate_corpus
+from sizing import deep_sizeof
+
+QUESTIONS = ["{} چیست؟", "چگونه {} را یاد بگیرم", "چرا {} مهم است؟ فوری", "معنی {} را نمی‌دانم"]
+REACTIONS = ["satisfied", "confused", "neutral"]
+
+FREQUENCY_TRACKERS = {
+    "exact": TopKCounter,
+    "space-saving": lambda: SpaceSavingCounter(capacity=1000)
+}
+
+
+def inputs(seed=0):
+    """ورودی‌های قطعی و تقریباً همه متمایز
+
+    هر ورودی یک نوبت پیکره مصنوعی و یک پرسش درباره واژه‌ای از واژگان باز است. شماره
+    واژه توزیع دم‌بلند دارد، پس مثل متن واقعی (قانون Heaps) واژه‌های تازه مدام ظاهر
+    می‌شوند و ساختارهای وابسته به متن ورودی (active_strategies، frequent_topics،
+    knowledge_gaps) واقعاً تحت فشار قرار می‌گیرند.
+    """
+    rng = random.Random(seed)
+    turns = [turn["input"] for turn in generate_corpus("fa", 1000, seed)]
+    index = 0
+    while True:
+        # P(شماره >= k) = k^-0.5؛ تعداد واژه‌های متمایز حدود جذر تعداد نوبت‌ها رشد می‌کند
+        term = f"مفهوم‌{int((1 - rng.random()) ** -2)}"
+        yield f"{turns[index % len(turns)]} {rng.choice(QUESTIONS).format(term)}"
+        index += 1
+
+
+def structure_sizes(modules):
+    """تعداد عضوهای ساختارهایی که با متن ورودی کلید می‌خورند"""
+    _, _, control, _, user_model = modules
+    return {
+        "active_strategies": len(control.active_strategies),
+        "frequent_topics": len(user_model.interaction_patterns["frequent_topics"]),
+        "question_types": len(user_model.interaction_patterns["question_types"]),
+        "known_topics": len(user_model.user_knowledge["known_topics"]),
+        "knowledge_gaps": len(user_model.user_knowledge["knowledge_gaps"])
+    }
+
+
+def interact(modules, user_input, index):
+    """یک تعامل کامل با همان فراخوانی‌های خط لوله هسته"""
+    self_awareness, monitoring, control, evaluation, user_model = modules
+    response = f"پاسخ نمونه درباره {user_input}. در نتیجه این موضوع مهم است."
+
+    self_awareness.check_limitation(user_input)
+    self_awareness.update_context(user_input, response)
+    user_model.understand_user_goals(user_input, {})
+    user_model.detect_emotional_state(user_input)
+    control.regulate_strategy(user_input, user_model.user_profile)
+    control.allocate_attention([user_input])
+    control.regulate_processing(user_input)
+    monitoring.monitor_thought_process(user_input, ["تحلیل", "جستجو", "طراحی پاسخ"])
+    monitoring.assess_confidence("inferential", 0.7)
+    monitoring.detect_errors_gaps(response + " همیشه گاهی")
+    monitoring.track_decision(user_input, ["الف", "ب"], "الف", "نمونه")
+    evaluation.evaluate_response_quality(response, user_input)
+    evaluation.analyze_consequences(response, user_reaction=REACTIONS[index % len(REACTIONS)])
+    evaluation.process_feedback("پاسخ خوبی بود ولی نیاز به مثال دارد", response)
+    user_model.update_user_knowledge_model(user_input, response)
+    user_model.predict_future_needs(user_input, user_model.user_profile)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="اندازه وضعیت ماژول‌ها در طول تعداد زیادی تعامل")
+    parser.add_argument("--interactions", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--frequency-tracker", choices=FREQUENCY_TRACKERS, default="exact",
+                        help="شمارنده frequent_topics و question_types (exact با واژگان رشد می‌کند)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    modules = (
+        SelfAwareness(), CognitiveMonitoring(), CognitiveControl(), PerformanceEvaluation(),
+        UserMentalModel(frequency_tracker=FREQUENCY_TRACKERS[args.frequency_tracker])
+    )
+    turns = inputs(args.seed)
+    sample_every = max(1, args.interactions // args.samples)
+
+    samples = []
+    started = time.perf_counter()
+    for index in range(args.interactions):
+        interact(modules, next(turns), index)
+        if (index + 1) % sample_every == 0 or index + 1 == args.interactions:
+            samples.append({
+                "interactions": index + 1,
+                "elapsed_s": time.perf_counter() - started,
+                "state_bytes": {type(module).__name__: deep_sizeof(module) for module in modules},
+                "structure_sizes": structure_sizes(modules)
+            })
+
+    # رشد حافظه از اولین نمونه (پس از گرم شدن تاریخچه‌ها) تا آخرین نمونه
+    first = sum(samples[0]["state_bytes"].values())
+    last = sum(samples[-1]["state_bytes"].values())
+    print(json.dumps({
+        "interactions": args.interactions,
+        "frequency_tracker": args.frequency_tracker,
+        "samples": samples,
+        "growth_bytes": last - first
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# ============================================
+# بنچمارک ارزیابی افزایشی: به‌روزرسانی توکن به توکن در برابر ارزیابی دوباره پیشوند
+# ============================================
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import generate_corpus
+from incremental_evaluation import IncrementalEvaluator
+from performance_evaluation import PerformanceEvaluation
+
+
+def stream(text):
+    """تکه‌های توکن‌مانند (هر کلمه با فاصله بعدی آن)"""
+    words = text.split(" ")
+    return [word + " " for word in words[:-1]] + [words[-1]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="هزینه ارزیابی پاسخ جریانی پس از هر توکن")
+    parser.add_argument("--responses", type=int, default=50)
+    parser.add_argument("--length", type=int, default=8, help="تعداد پاسخ‌های پیکره که در هر پاسخ پشت هم می‌آیند")
+    args = parser.parse_args()
+
+    turns = generate_corpus("fa", args.responses * args.length)
+    cases = [
+        (" ".join(turn["response"] for turn in turns[index:index + args.length]), turns[index]["input"])
+        for index in range(0, len(turns), args.length)
+    ]
+    evaluation = PerformanceEvaluation()
+    tokens = sum(len(stream(response)) for response, _ in cases)
+
+    started = time.perf_counter()
+    for response, query in cases:
+        evaluator = IncrementalEvaluator(query)
+        for chunk in stream(response):
+            evaluator.feed(chunk)
+        evaluator.finish()
+    incremental = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for response, query in cases:
+        prefix = ""
+        for chunk in stream(response):
+            prefix += chunk
+            evaluation._score_response(prefix, query)
+    rescoring = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for response, query in cases:
+        evaluation._score_response(response, query)
+    final_only = time.perf_counter() - started
+
+    print(json.dumps({
+        "responses": len(cases),
+        "tokens": tokens,
+        "avg_response_chars": sum(len(response) for response, _ in cases) / len(cases),
+        "incremental_us_per_token": incremental / tokens * 1e6,
+        "prefix_rescoring_us_per_token": rescoring / tokens * 1e6,
+        "batch_final_only_us_per_response": final_only / len(cases) * 1e6
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
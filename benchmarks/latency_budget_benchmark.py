@@ -0,0 +1,59 @@
+# ============================================
+# بنچمارک بودجه زمانی: تأخیر صدک‌ها با و بدون حذف مراحل اختیاری
+# ============================================
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metacognitive_core import MetacognitiveCore
+
+SAMPLE_INPUTS = [
+    "هوش مصنوعی چیست؟",
+    "چگونه برنامه‌نویسی را یاد بگیرم",
+    "چرا ریاضی مهم است؟ لطفاً دقیق توضیح بده",
+    "می‌خواهم بدانم یادگیری ماشین چگونه کار می‌کند",
+    "سلام، یک سوال فوری دارم"
+]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def measure(latency_budget, requests):
+    core = MetacognitiveCore(latency_budget=latency_budget)
+    latencies = []
+    shed = 0
+    for index in range(requests):
+        started = time.perf_counter()
+        result = core.process_input(f"{SAMPLE_INPUTS[index % len(SAMPLE_INPUTS)]} {index}")
+        latencies.append(time.perf_counter() - started)
+        shed += bool(result["stage_timing"]["skipped_stages"])
+    latencies.sort()
+    return {
+        "latency_budget_ms": latency_budget * 1000 if latency_budget is not None else None,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "shed_ratio": shed / requests
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="تأخیر صدک‌ها با بودجه زمانی درخواست")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--budget-ms", type=float, nargs="*", default=[0.2, 0.5])
+    args = parser.parse_args()
+
+    results = [measure(None, args.requests)]
+    results += [measure(budget / 1000, args.requests) for budget in args.budget_ms]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# ============================================
+# بنچمارک بار سرور سوکت: گذردهی و تأخیر با اتصال‌های ماندگار و pipelining
+# ============================================
+#
+# بدون --host/--port/--unix، سرور (server.py) در یک پردازه جدا با درگاه آزاد اجرا
+# می‌شود تا کلاینت و سرور یک حلقه رویداد را به اشتراک نگذارند.
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpora import generate_corpus
+from instrumentation import LatencyHistogram
+from server import MetacognitiveClient
+
+
+def start_server(unix_path=None):
+    """اجرای server.py در پردازه فرزند و خواندن نشانی آن از اولین خط خروجی"""
+    command = [sys.executable, os.path.join(ROOT, "server.py")]
+    command += ["--unix", unix_path] if unix_path else ["--port", "0"]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    address = json.loads(process.stdout.readline())["address"]
+    return process, address
+
+
+async def run_connection(client, session, turns, depth, histogram):
+    """ارسال نوبت‌ها روی یک اتصال؛ هر بار depth درخواست در یک نوشتن (pipeline)"""
+    for start in range(0, len(turns), depth):
+        batch = turns[start:start + depth]
+        started = time.perf_counter()
+        await client.pipeline([{"op": "process", "session": session, "input": turn["input"]} for turn in batch])
+        elapsed = time.perf_counter() - started
+        # تأخیر هر درخواست دسته برابر زمان رفت و برگشت کل دسته است
+        for _ in batch:
+            histogram.record(elapsed)
+
+
+async def run_load(address, args):
+    turns = generate_corpus("fa", args.requests, args.seed)
+    if isinstance(address, str):
+        clients = [await MetacognitiveClient.connect(path=address) for _ in range(args.connections)]
+    else:
+        clients = [await MetacognitiveClient.connect(*address) for _ in range(args.connections)]
+    await clients[0].health()
+
+    histogram = LatencyHistogram()
+    share = len(turns) // args.connections
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        run_connection(client, f"user-{index % args.sessions}", turns[index * share:(index + 1) * share],
+                       args.depth, histogram)
+        for index, client in enumerate(clients)
+    ])
+    elapsed = time.perf_counter() - started
+
+    metrics = await clients[0].metrics()
+    for client in clients:
+        await client.close()
+    return {
+        "connections": args.connections,
+        "depth": args.depth,
+        "requests": histogram.count,
+        "throughput_per_s": histogram.count / elapsed,
+        "p50_ms": histogram.percentile(0.50) * 1000,
+        "p99_ms": histogram.percentile(0.99) * 1000,
+        "max_ms": histogram.maximum * 1000,
+        "server_process_p50_ms": metrics["operation_latency"]["process"]["p50"] * 1000,
+        "server_errors": metrics["server"]["errors"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک بار سرور سوکت هسته فراشناختی")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--depth", type=int, nargs="*", default=[1, 16], help="عمق pipeline هر اتصال")
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="اتصال به سرور در حال اجرا")
+    parser.add_argument("--unix", help="مسیر سوکت Unix؛ بدون --port سرور روی همین مسیر اجرا می‌شود")
+    args = parser.parse_args()
+
+    process = None
+    if args.port is not None:
+        address = (args.host, args.port)
+    else:
+        process, address = start_server(args.unix)
+    try:
+        results = []
+        for depth in args.depth:
+            results.append(asyncio.run(run_load(address, argparse.Namespace(**{**vars(args), "depth": depth}))))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# ============================================
+# بنچمارک ذخیره وضعیت: قالب دودویی در برابر JSON
+# ============================================
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metacognitive_core import MetacognitiveCore
+from ring_buffer import RingBuffer
+from snapshot import snapshot_state
+
+SAMPLE_INPUTS = [
+    "هوش مصنوعی چیست؟",
+    "چگونه برنامه‌نویسی را یاد بگیرم",
+    "چرا ریاضی مهم است؟ لطفاً توضیح بده",
+    "می‌خواهم بدانم یادگیری ماشین چگونه کار می‌کند",
+    "سلام، یک سوال فوری دارم"
+]
+
+
+def timed(func, repeat):
+    """کمترین زمان اجرای func در repeat تکرار (میلی‌ثانیه)"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def json_default(value):
+    """تبدیل تاریخچه‌های محدود و اشیای آماری برای json"""
+    return list(value) if isinstance(value, RingBuffer) else vars(value)
+
+
+def build_core(interactions):
+    core = MetacognitiveCore()
+    for index in range(interactions):
+        core.process_input(f"{SAMPLE_INPUTS[index % len(SAMPLE_INPUTS)]} {index}")
+    return core
+
+
+def main():
+    parser = argparse.ArgumentParser(description="مقایسه اندازه و سرعت snapshot با JSON")
+    parser.add_argument("--interactions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    core = build_core(args.interactions)
+    state = snapshot_state(core)
+
+    json_ms, json_data = timed(lambda: json.dumps(state, ensure_ascii=False, default=json_default).encode("utf-8"), args.repeat)
+    json_load_ms, _ = timed(lambda: json.loads(json_data), args.repeat)
+    binary_ms, binary_data = timed(core.snapshot, args.repeat)
+    raw_ms, raw_data = timed(lambda: core.snapshot(compress=False), args.repeat)
+
+    def restore_lazy():
+        restored = MetacognitiveCore()
+        restored.restore(binary_data)
+        return restored
+
+    def restore_full():
+        restored = restore_lazy()
+        # رمزگشایی همه تاریخچه‌ها
+        for _ in restored.interaction_history:
+            pass
+        return restored
+
+    lazy_ms, _ = timed(restore_lazy, args.repeat)
+    full_ms, _ = timed(restore_full, args.repeat)
+
+    results = {
+        "interactions": args.interactions,
+        "json": {"bytes": len(json_data), "dump_ms": json_ms, "load_ms": json_load_ms},
+        "binary": {"bytes": len(binary_data), "dump_ms": binary_ms, "restore_lazy_ms": lazy_ms, "restore_full_ms": full_ms},
+        "binary_uncompressed": {"bytes": len(raw_data), "dump_ms": raw_ms}
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
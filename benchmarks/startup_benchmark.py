@@ -0,0 +1,81 @@
+# ============================================
+# بنچمارک زمان راه‌اندازی: import بسته، دسترسی به هسته و اولین درخواست
+# ============================================
+#
+# هر اجرا در یک مفسر تازه انجام می‌شود تا هیچ ماژولی از قبل بارگذاری نشده باشد.
+# اگر میانه یک سناریو از بودجه STARTUP_BUDGETS_MS بیشتر شود، کد خروج ۱ است.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# بودجه میانه هر سناریو (میلی‌ثانیه، از شروع import بسته)
+STARTUP_BUDGETS_MS = {
+    "package_import": 5,
+    "core_access": 60,
+    "first_request": 150
+}
+
+# کدی که در مفسر تازه اجرا می‌شود و زمان‌های تجمعی را چاپ می‌کند
+PROBE = """
+import json, time
+started = time.perf_counter()
+import metacognitive
+imported = time.perf_counter()
+core_class = metacognitive.MetacognitiveCore
+accessed = time.perf_counter()
+core_class().process_input("هوش مصنوعی چیست؟")
+finished = time.perf_counter()
+print(json.dumps({
+    "package_import": (imported - started) * 1000,
+    "core_access": (accessed - started) * 1000,
+    "first_request": (finished - started) * 1000
+}))
+"""
+
+
+def probe():
+    """یک اجرای مفسر تازه؛ bytecode کش می‌شود تا زمان کامپایل در نتیجه نیاید"""
+    environment = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=environment, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="زمان راه‌اندازی بسته metacognitive در مفسرهای تازه")
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    # اجرای گرم‌کننده: ساخت فایل‌های bytecode
+    probe()
+    samples = [probe() for _ in range(args.runs)]
+
+    report = {}
+    over_budget = []
+    for scenario, budget in STARTUP_BUDGETS_MS.items():
+        values = [sample[scenario] for sample in samples]
+        median = statistics.median(values)
+        report[scenario] = {
+            "median_ms": median,
+            "min_ms": min(values),
+            "max_ms": max(values),
+            "budget_ms": budget
+        }
+        if median > budget:
+            over_budget.append(scenario)
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if over_budget:
+        print(f"خارج از بودجه: {', '.join(over_budget)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
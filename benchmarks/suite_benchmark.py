@@ -0,0 +1,211 @@
+# ============================================
+# مجموعه بنچمارک: همه متدهای عمومی ماژول‌ها و process_input (فارسی و انگلیسی)
+# ============================================
+#
+# نتایج JSON (با commit و اثر انگشت پیکره) با --output ذخیره و با --compare
+# با اجرای قبلی مقایسه می‌شوند.
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpora import corpus_digest, generate_corpus
+from instrumentation import LatencyHistogram
+
+from cognitive_control import CognitiveControl
+from cognitive_monitoring import CognitiveMonitoring
+from performance_evaluation import PerformanceEvaluation
+from self_awareness import SelfAwareness
+from user_mental_model import UserMentalModel
+
+import metacognitive_english
+from metacognitive_core import MetacognitiveCore
+
+MODULE_CLASSES = ["SelfAwareness", "CognitiveMonitoring", "CognitiveControl", "PerformanceEvaluation", "UserMentalModel"]
+
+REASONING_STEPS = ["analyze", "search", "organize", "design"]
+
+# (کلاس، متد) -> فراخوانی با یک نوبت پیکره؛ API ماژول‌های فارسی و انگلیسی یکسان است
+METHOD_CALLS = {
+    ("SelfAwareness", "identify_user"): lambda module, turn: module.identify_user(turn["input"]),
+    ("SelfAwareness", "update_system_state"): lambda module, turn: module.update_system_state({"mode": turn["reaction"]}),
+    ("SelfAwareness", "check_limitation"): lambda module, turn: module.check_limitation(turn["input"]),
+    ("SelfAwareness", "update_context"): lambda module, turn: module.update_context(turn["input"], turn["response"]),
+    ("CognitiveMonitoring", "monitor_thought_process"):
+        lambda module, turn: module.monitor_thought_process(turn["input"], REASONING_STEPS),
+    ("CognitiveMonitoring", "assess_confidence"): lambda module, turn: module.assess_confidence("inferential", 0.7),
+    ("CognitiveMonitoring", "detect_errors_gaps"):
+        lambda module, turn: module.detect_errors_gaps(turn["response"], turn["feedback"]),
+    ("CognitiveMonitoring", "track_decision"):
+        lambda module, turn: module.track_decision(turn["input"], ["a", "b"], "a", turn["reasoning"]),
+    ("CognitiveMonitoring", "check_biases"): lambda module, turn: module.check_biases(turn["reasoning"]),
+    ("CognitiveControl", "regulate_strategy"): lambda module, turn: module.regulate_strategy(turn["input"]),
+    ("CognitiveControl", "allocate_attention"):
+        lambda module, turn: module.allocate_attention([turn["input"], turn["response"]]),
+    ("CognitiveControl", "select_problem_solving_method"):
+        lambda module, turn: module.select_problem_solving_method(turn["input"]),
+    ("CognitiveControl", "regulate_processing"): lambda module, turn: module.regulate_processing(turn["input"]),
+    ("PerformanceEvaluation", "evaluate_response_quality"):
+        lambda module, turn: module.evaluate_response_quality(turn["response"], turn["input"]),
+    ("PerformanceEvaluation", "evaluate_many"):
+        lambda module, turn: module.evaluate_many([turn["response"]] * 8, [turn["input"]] * 8),
+    ("PerformanceEvaluation", "analyze_consequences"):
+        lambda module, turn: module.analyze_consequences(turn["response"], user_reaction=turn["reaction"]),
+    ("PerformanceEvaluation", "process_feedback"):
+        lambda module, turn: module.process_feedback(turn["feedback"], turn["response"]),
+    ("PerformanceEvaluation", "self_correct"): lambda module, turn: module.self_correct(turn["error"], turn["input"]),
+    ("UserMentalModel", "understand_user_goals"): lambda module, turn: module.understand_user_goals(turn["input"], {}),
+    ("UserMentalModel", "detect_emotional_state"): lambda module, turn: module.detect_emotional_state(turn["input"]),
+    ("UserMentalModel", "update_user_knowledge_model"):
+        lambda module, turn: module.update_user_knowledge_model(turn["input"], turn["response"]),
+    ("UserMentalModel", "predict_future_needs"):
+        lambda module, turn: module.predict_future_needs(turn["input"], module.user_profile),
+    ("UserMentalModel", "get_user_profile_summary"): lambda module, turn: module.get_user_profile_summary()
+}
+
+
+def persian_targets():
+    classes = {
+        "SelfAwareness": SelfAwareness,
+        "CognitiveMonitoring": CognitiveMonitoring,
+        "CognitiveControl": CognitiveControl,
+        "PerformanceEvaluation": PerformanceEvaluation,
+        "UserMentalModel": UserMentalModel
+    }
+    return classes, MetacognitiveCore
+
+
+def english_targets():
+    classes = {name: getattr(metacognitive_english, name) for name in MODULE_CLASSES}
+    return classes, metacognitive_english.MetacognitiveCore
+
+
+def measure(call, turns, iterations, warmup):
+    """زمان تک‌تک فراخوانی‌ها روی نوبت‌های پیکره (به ترتیب و چرخشی)"""
+    for index in range(warmup):
+        call(turns[index % len(turns)])
+    histogram = LatencyHistogram()
+    for index in range(iterations):
+        turn = turns[index % len(turns)]
+        started = time.perf_counter()
+        call(turn)
+        histogram.record(time.perf_counter() - started)
+    return {
+        "iterations": iterations,
+        "throughput_per_s": iterations / histogram.total if histogram.total else None,
+        "mean_us": histogram.total / iterations * 1e6,
+        "p50_us": histogram.percentile(0.50) * 1e6,
+        "p90_us": histogram.percentile(0.90) * 1e6,
+        "p99_us": histogram.percentile(0.99) * 1e6,
+        "max_us": histogram.maximum * 1e6
+    }
+
+
+def run_language(language, turns, args, output):
+    """اجرای بنچمارک همه متدها و process_input برای یک زبان"""
+    # نسخه انگلیسی در هر فراخوانی چاپ می‌کند؛ خروجی آن کنار گذاشته می‌شود
+    classes, build_core = persian_targets() if language == "fa" else english_targets()
+    results = {}
+    for (class_name, method), call in METHOD_CALLS.items():
+        name = f"{class_name}.{method}"
+        if args.filter and args.filter not in name:
+            continue
+        with contextlib.redirect_stdout(output):
+            module = classes[class_name]()
+        if not hasattr(module, method):
+            continue
+        with contextlib.redirect_stdout(output):
+            results[name] = measure(lambda turn: call(module, turn), turns, args.iterations, args.warmup)
+
+    name = "MetacognitiveCore.process_input"
+    if not args.filter or args.filter in name:
+        with contextlib.redirect_stdout(output):
+            core = build_core()
+            results[name] = measure(
+                lambda turn: core.process_input(turn["input"]), turns, args.core_iterations, args.warmup
+            )
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current):
+    """نسبت p50 و throughput هر بنچمارک به اجرای قبلی"""
+    comparison = {}
+    for language, results in current["results"].items():
+        for name, result in results.items():
+            before = previous.get("results", {}).get(language, {}).get(name)
+            if before:
+                comparison[f"{language}:{name}"] = {
+                    "p50_ratio": result["p50_us"] / before["p50_us"] if before["p50_us"] else None,
+                    "throughput_ratio": (
+                        result["throughput_per_s"] / before["throughput_per_s"]
+                        if before["throughput_per_s"] and result["throughput_per_s"] else None
+                    )
+                }
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک متدهای ماژول‌ها و process_input روی پیکره‌های مصنوعی")
+    parser.add_argument("--languages", nargs="+", default=["fa", "en"], choices=["fa", "en"])
+    parser.add_argument("--corpus-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--core-iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--filter", help="فقط بنچمارک‌هایی که نامشان شامل این متن است")
+    parser.add_argument("--output", help="مسیر فایل JSON نتایج (پیش‌فرض: خروجی استاندارد)")
+    parser.add_argument("--compare", help="فایل JSON اجرای قبلی برای مقایسه")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "corpus_size": args.corpus_size,
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "core_iterations": args.core_iterations,
+            "warmup": args.warmup,
+            "corpus_digest": {}
+        },
+        "results": {}
+    }
+    with open(os.devnull, "w") as output:
+        for language in args.languages:
+            turns = generate_corpus(language, args.corpus_size, args.seed)
+            report["meta"]["corpus_digest"][language] = corpus_digest(turns)
+            report["results"][language] = run_language(language, turns, args, output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as previous:
+            report["comparison"] = compare(json.load(previous), report)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as destination:
+            destination.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
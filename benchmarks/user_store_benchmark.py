@@ -0,0 +1,80 @@
+# ============================================
+# بنچمارک ذخیره‌سازی مدل‌های کاربر روی SQLite: نوشتن دسته‌ای و بارگذاری بر حسب نیاز
+# ============================================
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import generate_corpus
+from user_mental_model import UserMentalModel
+from user_store import SqliteUserModelStore
+
+
+def update(model, turn):
+    """به‌روزرسانی‌های مدل کاربر در یک نوبت (همان فراخوانی‌های خط لوله هسته)"""
+    model.understand_user_goals(turn["input"], {})
+    model.detect_emotional_state(turn["input"])
+    model.update_user_knowledge_model(turn["input"], turn["response"])
+
+
+def run(path, args):
+    corpus = generate_corpus("fa", 500)
+
+    # هر نوبت: مدل کاربر به‌روز و علامت‌گذاری می‌شود؛ نوشتن دسته‌ای با max_dirty
+    store = SqliteUserModelStore(path, flush_interval=None, max_dirty=args.max_dirty)
+    models = {}
+    started = time.perf_counter()
+    for turn_index in range(args.turns):
+        for user in range(args.users):
+            model = models.setdefault(user, UserMentalModel())
+            update(model, corpus[(user + turn_index) % len(corpus)])
+            store.mark_dirty(f"user-{user}", model)
+    store.flush()
+    write_seconds = time.perf_counter() - started
+    counters = dict(store.counters)
+    store.close()
+
+    # بارگذاری سرد هر کاربر در یک مدل تازه
+    store = SqliteUserModelStore(path)
+    started = time.perf_counter()
+    for user in range(args.users):
+        store.load(f"user-{user}", UserMentalModel())
+    load_seconds = time.perf_counter() - started
+    store.close()
+
+    return {
+        "users": args.users,
+        "turns_per_user": args.turns,
+        "turns_per_s": args.users * args.turns / write_seconds,
+        "loads_per_s": args.users / load_seconds,
+        "database_bytes_per_user": os.path.getsize(path) / args.users,
+        "flushes": counters["flushes"],
+        "sections_written": counters["sections_written"],
+        "sections_unchanged": counters["sections_unchanged"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="گذردهی SqliteUserModelStore")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--turns", type=int, default=3, help="نوبت‌های هر کاربر")
+    parser.add_argument("--max-dirty", type=int, default=1000)
+    parser.add_argument("--path", help="مسیر پایگاه داده (پیش‌فرض: فایل موقت)")
+    args = parser.parse_args()
+
+    if args.path:
+        result = run(args.path, args)
+    else:
+        with tempfile.TemporaryDirectory(prefix="user-store-") as directory:
+            result = run(os.path.join(directory, "users.db"), args)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# ============================================
+# بنچمارک مجموعه کارگرها: مقیاس‌پذیری گذردهی از ۱ تا N پردازه
+# ============================================
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import generate_corpus
+from worker_pool import WorkerPool
+
+
+def measure(workers, messages, warmup):
+    """گذردهی process_many با workers پردازه (درخواست در ثانیه)"""
+    with WorkerPool(workers=workers) as pool:
+        pool.process_many(messages[:warmup])
+        started = time.perf_counter()
+        responses = pool.process_many(messages)
+        elapsed = time.perf_counter() - started
+    return {
+        "workers": workers,
+        "requests": len(messages),
+        "errors": sum(1 for response in responses if not response["ok"]),
+        "throughput_per_s": len(messages) / elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="مقیاس‌پذیری گذردهی WorkerPool با تعداد کارگرها")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    turns = generate_corpus("fa", args.requests, args.seed)
+    messages = [
+        {"op": "process", "session": f"user-{index % args.sessions}", "input": turn["input"]}
+        for index, turn in enumerate(turns)
+    ]
+
+    counts = sorted({1, *[2 ** power for power in range(1, args.max_workers.bit_length())], args.max_workers})
+    results = [measure(workers, messages, args.warmup) for workers in counts]
+    for result in results:
+        result["speedup"] = result["throughput_per_s"] / results[0]["throughput_per_s"]
+        result["efficiency"] = result["speedup"] / result["workers"]
+    print(json.dumps({"cpu_count": os.cpu_count(), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,45 @@
 # بخش ۳: کنترل شناختی (Cognitive Control)
 # ============================================
 
+from analyzed_text import analyze
+from lexicon import LEXICON
+from ring_buffer import RingBuffer
+
+# کلیدواژه‌ها برای تشخیص نوع مسئله
+FEATURE_KEYWORDS = {
+    "عددی": ["عدد", "محاسبه", "ریاضی", "جمع", "تفریق", "ضرب", "تقسیم"],
+    "منطقی": ["اگر", "آنگاه", "استدلال", "منطق", "درست", "نادرست"],
+    "خلاقانه": ["ایده", "خلاقیت", "نوآوری", "جدید", "خلاق"],
+    "پیچیده": ["پیچیده", "سخت", "دشوار", "مشکل", "چالش"],
+    "چندبخشی": ["مرحله", "بخش", "قسمت", "فاز", "مرحله‌ای"]
+}
+
+LEXICON.register([keyword for keywords in FEATURE_KEYWORDS.values() for keyword in keywords])
+
+# ظرفیت پیش‌فرض تاریخچه‌ها (قابل تغییر از طریق history_capacities)
+HISTORY_CAPACITIES = {
+    "adaptation_history": 100,
+    # راهبردهای ثبت شده برای هر نوع وظیفه (کلید: متن وظیفه) در active_strategies
+    "active_strategies": 100
+}
+
+# راهبردهای پایه که هرگز از active_strategies حذف نمی‌شوند
+BASE_STRATEGIES = ("problem_solving", "explanation", "learning")
+
+# کلیدواژه‌هایی که پردازش سریع و سطحی درخواست می‌کنند
+FAST_DEMAND_MARKERS = ("فوری", "سریع")
+
+
+def demands_fast_processing(task_demand, available_resources=None):
+    """آیا خود این درخواست پردازش سریع می‌خواهد (مستقل از processing_mode ذخیره شده)"""
+    return any(marker in task_demand for marker in FAST_DEMAND_MARKERS) or bool(
+        available_resources and available_resources.get("time") == "limited"
+    )
+
+
 class CognitiveControl:
-    def __init__(self):
+    def __init__(self, history_capacities=None):
+        capacities = {**HISTORY_CAPACITIES, **(history_capacities or {})}
         self.active_strategies = {
             "problem_solving": "تحلیل مرحله‌ای",
             "explanation": "مثال‌محور",
@@ -19,7 +56,8 @@ class CognitiveControl:
             "depth": "balanced",  # shallow, balanced, deep
             "rigor": "standard"  # relaxed, standard, strict
         }
-        self.adaptation_history = []
+        self.adaptation_history = RingBuffer(capacities["adaptation_history"])
+        self.strategy_capacity = capacities["active_strategies"]
     
     def regulate_strategy(self, task_type, user_profile=None):
         """تنظیم راهبردهای شناختی بر اساس نوع وظیفه"""
@@ -51,11 +89,14 @@ class CognitiveControl:
                 if "تخصصی" not in selected_strategy:
                     selected_strategy += " با جزئیات فنی"
         
-        # به‌روزرسانی راهبردهای فعال
-        self.active_strategies[task_type] = selected_strategy
+        # به‌روزرسانی راهبردهای فعال؛ با پر شدن ظرفیت قدیمی‌ترین راهبرد وظیفه حذف می‌شود
+        strategies = self.active_strategies
+        strategies[str(task_type)] = selected_strategy
+        if len(strategies) > self.strategy_capacity + len(BASE_STRATEGIES):
+            del strategies[next(key for key in strategies if key not in BASE_STRATEGIES)]
         
         adaptation_record = {
-            "task_type": task_type,
+            "task_type": str(task_type),
             "selected_strategy": selected_strategy,
             "reason": "تنظیم خودکار بر اساس نوع وظیفه",
             "user_profile_considered": bool(user_profile)
@@ -73,7 +114,7 @@ class CognitiveControl:
         secondary_focus = []
         
         for element in input_elements:
-            element_lower = element.lower()
+            element_lower = analyze(element).normalized
             
             # بررسی کلمات کلیدی با اولویت بالا
             high_priority = False
@@ -171,20 +212,11 @@ class CognitiveControl:
         """تحلیل ویژگی‌های مسئله"""
         features = []
         
-        # کلمات کلیدی برای تشخیص نوع مسئله
-        feature_keywords = {
-            "عددی": ["عدد", "محاسبه", "ریاضی", "جمع", "تفریق", "ضرب", "تقسیم"],
-            "منطقی": ["اگر", "آنگاه", "استدلال", "منطق", "درست", "نادرست"],
-            "خلاقانه": ["ایده", "خلاقیت", "نوآوری", "جدید", "خلاق"],
-            "پیچیده": ["پیچیده", "سخت", "دشوار", "مشکل", "چالش"],
-            "چندبخشی": ["مرحله", "بخش", "قسمت", "فاز", "مرحله‌ای"]
-        }
-        
-        problem_lower = problem_description.lower()
+        found = analyze(problem_description).normalized_keywords
         
-        for feature, keywords in feature_keywords.items():
+        for feature, keywords in FEATURE_KEYWORDS.items():
             for keyword in keywords:
-                if keyword in problem_lower:
+                if keyword in found:
                     features.append(feature)
                     break
         
@@ -196,7 +228,7 @@ class CognitiveControl:
     def regulate_processing(self, task_demand, available_resources=None):
         """تنظیم سرعت و عمق پردازش"""
         # تنظیم بر اساس تقاضای وظیفه
-        if "فوری" in task_demand or "سریع" in task_demand:
+        if any(marker in task_demand for marker in FAST_DEMAND_MARKERS):
             self.processing_mode["speed"] = "fast"
             self.processing_mode["depth"] = "shallow"
         elif "دقیق" in task_demand or "موشکافانه" in task_demand:
@@ -222,35 +254,42 @@ class CognitiveControl:
         
         return self.processing_mode
 
+
 # تست بخش کنترل شناختی
-print("=" * 50)
-print("تست بخش ۳: کنترل شناختی")
-print("=" * 50)
+def demo():
+    """دموی بخش کنترل شناختی"""
+    print("=" * 50)
+    print("تست بخش ۳: کنترل شناختی")
+    print("=" * 50)
+
+    cognitive_control = CognitiveControl()
+
+    # تست تنظیم راهبرد
+    task_type = "سوال علمی پیچیده"
+    strategy = cognitive_control.regulate_strategy(task_type)
+    print(f"راهبرد انتخاب شده برای '{task_type}': {strategy}")
 
-cognitive_control = CognitiveControl()
+    # تست تخصیص توجه
+    input_elements = ["سلام", "یک سوال فوری دارم", "در مورد یادگیری ماشین"]
+    attention_allocation = cognitive_control.allocate_attention(input_elements)
+    print(f"تخصیص توجه:")
+    print(f"  - تمرکز اصلی: {attention_allocation['primary_focus']}")
+    print(f"  - تمرکز ثانویه: {attention_allocation['secondary_focus']}")
+    print(f"  - دامنه توجه: {attention_allocation['attention_span']}")
 
-# تست تنظیم راهبرد
-task_type = "سوال علمی پیچیده"
-strategy = cognitive_control.regulate_strategy(task_type)
-print(f"راهبرد انتخاب شده برای '{task_type}': {strategy}")
+    # تست انتخاب روش حل مسئله
+    problem = "چگونه یک الگوریتم برای مرتب‌سازی اعداد بنویسم که هم سریع باشد و هم حافظه کمی مصرف کند؟"
+    method = cognitive_control.select_problem_solving_method(problem)
+    print(f"روش حل مسئله برای '{problem[:30]}...': {method}")
 
-# تست تخصیص توجه
-input_elements = ["سلام", "یک سوال فوری دارم", "در مورد یادگیری ماشین"]
-attention_allocation = cognitive_control.allocate_attention(input_elements)
-print(f"تخصیص توجه:")
-print(f"  - تمرکز اصلی: {attention_allocation['primary_focus']}")
-print(f"  - تمرکز ثانویه: {attention_allocation['secondary_focus']}")
-print(f"  - دامنه توجه: {attention_allocation['attention_span']}")
+    # تست تنظیم پردازش
+    processing_mode = cognitive_control.regulate_processing("نیاز به پاسخ سریع و دقیق")
+    print(f"حالت پردازش تنظیم شده: سرعت={processing_mode['speed']}, عمق={processing_mode['depth']}, دقت={processing_mode['rigor']}")
 
-# تست انتخاب روش حل مسئله
-problem = "چگونه یک الگوریتم برای مرتب‌سازی اعداد بنویسم که هم سریع باشد و هم حافظه کمی مصرف کند؟"
-method = cognitive_control.select_problem_solving_method(problem)
-print(f"روش حل مسئله برای '{problem[:30]}...': {method}")
+    print(f"\nتاریخچه سازگاری: {len(cognitive_control.adaptation_history)} رکورد")
 
-# تست تنظیم پردازش
-processing_mode = cognitive_control.regulate_processing("نیاز به پاسخ سریع و دقیق")
-print(f"حالت پردازش تنظیم شده: سرعت={processing_mode['speed']}, عمق={processing_mode['depth']}, دقت={processing_mode['rigor']}")
+    print("\n✓ بخش کنترل شناختی با موفقیت تست شد\n")
 
-print(f"\nتاریخچه سازگاری: {len(cognitive_control.adaptation_history)} رکورد")
 
-print("\n✓ بخش کنترل شناختی با موفقیت تست شد\n")
\ No newline at end of file
+if __name__ == "__main__":
+    demo()
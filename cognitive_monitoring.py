@@ -2,16 +2,61 @@
 # بخش ۲: نظارت بر شناخت (Cognitive Monitoring)
 # ============================================
 
+from analyzed_text import analyze
+from lexicon import LEXICON
+from ring_buffer import RingBuffer
+
+# نشانه‌های هر سوگیری شناختی
+BIAS_INDICATORS = {
+    "تایید‌محوری": ["فقط", "تنها", "همیشه", "هرگز"],
+    "دسترس‌پذیری": ["اخیراً", "مشهور", "معروف", "شایع"],
+    "چارچوب‌بندی": ["اما", "اگر", "فقط اگر", "به شرطی که"]
+}
+
+# عبارت‌هایی که با هم شکاف دانش یا تناقض را نشان می‌دهند
+KNOWLEDGE_GAP_TERMS = ["نمی‌دانم", "?"]
+CONTRADICTION_TERMS = ["همیشه", "گاهی"]
+
+LEXICON.register([indicator for indicators in BIAS_INDICATORS.values() for indicator in indicators])
+
+
+def errors_and_gaps(is_empty, contains):
+    """خطاها و شکاف‌های پاسخ؛ contains(term) وجود یک عبارت در پاسخ را مشخص می‌کند"""
+    errors = []
+    gaps = []
+    
+    # بررسی خطاهای رایج
+    if is_empty:
+        errors.append("پاسخ خالی")
+    
+    if all(contains(term) for term in KNOWLEDGE_GAP_TERMS):
+        gaps.append("شکاف دانش: سوالی وجود دارد که پاسخی برای آن ندارم")
+    
+    # بررسی تناقض‌های داخلی
+    if all(contains(term) for term in CONTRADICTION_TERMS):
+        errors.append("تناقض احتمالی در بیان قطعیت")
+    
+    return errors, gaps
+
+# ظرفیت پیش‌فرض تاریخچه‌ها (قابل تغییر از طریق history_capacities)
+HISTORY_CAPACITIES = {
+    "thought_process_log": 20,
+    "error_log": 100,
+    "decision_trail": 15
+}
+
+
 class CognitiveMonitoring:
-    def __init__(self):
-        self.thought_process_log = []
+    def __init__(self, history_capacities=None):
+        capacities = {**HISTORY_CAPACITIES, **(history_capacities or {})}
+        self.thought_process_log = RingBuffer(capacities["thought_process_log"])
         self.confidence_levels = {
             "factual": 0.8,
             "inferential": 0.7,
             "creative": 0.6
         }
-        self.error_log = []
-        self.decision_trail = []
+        self.error_log = RingBuffer(capacities["error_log"])
+        self.decision_trail = RingBuffer(capacities["decision_trail"])
         self.cognitive_biases_checklist = [
             "تایید‌محوری",
             "دسترس‌پذیری",
@@ -29,10 +74,6 @@ class CognitiveMonitoring:
         
         self.thought_process_log.append(thought_record)
         
-        # حفظ اندازه معقول لاگ
-        if len(self.thought_process_log) > 20:
-            self.thought_process_log = self.thought_process_log[-20:]
-        
         return thought_record
     
     def _assess_complexity(self, reasoning_steps):
@@ -76,19 +117,7 @@ class CognitiveMonitoring:
     
     def detect_errors_gaps(self, response, user_feedback=None):
         """تشخیص خطاها و شکاف‌ها در پاسخ"""
-        errors = []
-        gaps = []
-        
-        # بررسی خطاهای رایج
-        if not response or len(response.strip()) == 0:
-            errors.append("پاسخ خالی")
-        
-        if "نمی‌دانم" in response and "?" in response:
-            gaps.append("شکاف دانش: سوالی وجود دارد که پاسخی برای آن ندارم")
-        
-        # بررسی تناقض‌های داخلی
-        if "همیشه" in response and "گاهی" in response:
-            errors.append("تناقض احتمالی در بیان قطعیت")
+        errors, gaps = errors_and_gaps(not response or len(response.strip()) == 0, response.__contains__)
         
         # اضافه کردن خطاها به لاگ
         if errors or gaps:
@@ -114,15 +143,12 @@ class CognitiveMonitoring:
         
         self.decision_trail.append(decision_record)
         
-        # حفظ اندازه معقول دنباله تصمیم
-        if len(self.decision_trail) > 15:
-            self.decision_trail = self.decision_trail[-15:]
-        
         return decision_record
     
     def check_biases(self, reasoning_process):
         """بررسی سوگیری‌های شناختی احتمالی"""
         detected_biases = []
+        reasoning_process = analyze(reasoning_process)
         
         for bias in self.cognitive_biases_checklist:
             if self._check_for_bias(bias, reasoning_process):
@@ -132,59 +158,61 @@ class CognitiveMonitoring:
     
     def _check_for_bias(self, bias_type, reasoning):
         """بررسی وجود یک سوگیری خاص"""
-        bias_indicators = {
-            "تایید‌محوری": ["فقط", "تنها", "همیشه", "هرگز"],
-            "دسترس‌پذیری": ["اخیراً", "مشهور", "معروف", "شایع"],
-            "چارچوب‌بندی": ["اما", "اگر", "فقط اگر", "به شرطی که"]
-        }
-        
-        indicators = bias_indicators.get(bias_type, [])
+        indicators = BIAS_INDICATORS.get(bias_type, [])
+        found = analyze(reasoning).keywords
         for indicator in indicators:
-            if indicator in reasoning:
+            if indicator in found:
                 return True
         
         return False
 
+
 # تست بخش نظارت بر شناخت
-print("=" * 50)
-print("تست بخش ۲: نظارت بر شناخت")
-print("=" * 50)
-
-cognitive_monitor = CognitiveMonitoring()
-
-# تست نظارت بر فرآیند تفکر
-reasoning_steps = [
-    "دریافت سوال کاربر",
-    "تحلیل کلمات کلیدی",
-    "جستجوی در دانش پایه",
-    "ساخت پاسخ اولیه",
-    "بررسی تناقض‌ها",
-    "نهایی‌سازی پاسخ"
-]
-thought_record = cognitive_monitor.monitor_thought_process("چرا آسمان آبی است؟", reasoning_steps)
-print(f"رکورد فرآیند تفکر: {thought_record['step_count']} مرحله، پیچیدگی: {thought_record['complexity']}")
-
-# تست ارزیابی اطمینان
-confidence = cognitive_monitor.assess_confidence("factual", 0.9)
-print(f"سطح اطمینان: {confidence['label']} ({confidence['numeric']:.2f})")
-
-# تست تشخیص خطا
-response_test = "من نمی‌دانم که آیا این درست است یا نه؟"
-error_detection = cognitive_monitor.detect_errors_gaps(response_test)
-print(f"تشخیص خطا: {error_detection}")
-
-# تست پیگیری تصمیم
-decision = cognitive_monitor.track_decision(
-    "انتخاب سطح جزئیات",
-    ["کوتاه", "متوسط", "مفصل"],
-    "متوسط",
-    "کاربر سطح تخصصی مشخص نکرده است"
-)
-print(f"تصمیم ثبت شده: {decision['decision_point']} -> {decision['chosen']}")
-
-# تست بررسی سوگیری
-reasoning_test = "این موضوع همیشه درست است زیرا اخیراً زیاد درباره آن شنیده‌ام"
-biases = cognitive_monitor.check_biases(reasoning_test)
-print(f"سوگیری‌های شناسایی شده: {biases}")
-
-print("\n✓ بخش نظارت بر شناخت با موفقیت تست شد\n")
\ No newline at end of file
+def demo():
+    """دموی بخش نظارت بر شناخت"""
+    print("=" * 50)
+    print("تست بخش ۲: نظارت بر شناخت")
+    print("=" * 50)
+
+    cognitive_monitor = CognitiveMonitoring()
+
+    # تست نظارت بر فرآیند تفکر
+    reasoning_steps = [
+        "دریافت سوال کاربر",
+        "تحلیل کلمات کلیدی",
+        "جستجوی در دانش پایه",
+        "ساخت پاسخ اولیه",
+        "بررسی تناقض‌ها",
+        "نهایی‌سازی پاسخ"
+    ]
+    thought_record = cognitive_monitor.monitor_thought_process("چرا آسمان آبی است؟", reasoning_steps)
+    print(f"رکورد فرآیند تفکر: {thought_record['step_count']} مرحله، پیچیدگی: {thought_record['complexity']}")
+
+    # تست ارزیابی اطمینان
+    confidence = cognitive_monitor.assess_confidence("factual", 0.9)
+    print(f"سطح اطمینان: {confidence['label']} ({confidence['numeric']:.2f})")
+
+    # تست تشخیص خطا
+    response_test = "من نمی‌دانم که آیا این درست است یا نه؟"
+    error_detection = cognitive_monitor.detect_errors_gaps(response_test)
+    print(f"تشخیص خطا: {error_detection}")
+
+    # تست پیگیری تصمیم
+    decision = cognitive_monitor.track_decision(
+        "انتخاب سطح جزئیات",
+        ["کوتاه", "متوسط", "مفصل"],
+        "متوسط",
+        "کاربر سطح تخصصی مشخص نکرده است"
+    )
+    print(f"تصمیم ثبت شده: {decision['decision_point']} -> {decision['chosen']}")
+
+    # تست بررسی سوگیری
+    reasoning_test = "این موضوع همیشه درست است زیرا اخیراً زیاد درباره آن شنیده‌ام"
+    biases = cognitive_monitor.check_biases(reasoning_test)
+    print(f"سوگیری‌های شناسایی شده: {biases}")
+
+    print("\n✓ بخش نظارت بر شناخت با موفقیت تست شد\n")
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,146 @@
+# ============================================
+# مقصدهای رویداد (Event Sinks)
+# ============================================
+
+import json
+import threading
+import time
+from collections import deque
+
+
+class EventSink:
+    """رابط مقصد رویداد؛ پیش‌فرض هیچ کاری انجام نمی‌دهد"""
+
+    # هسته فقط وقتی رویداد می‌سازد که مقصد فعال باشد
+    enabled = False
+
+    def emit(self, event_type, **fields):
+        """ثبت یک رویداد ساختاریافته"""
+
+    def flush(self):
+        """تخلیه رویدادهای بافرشده"""
+
+    def close(self):
+        """بستن مقصد"""
+        self.flush()
+
+
+class NullSink(EventSink):
+    """مقصد بی‌اثر (پیش‌فرض هسته)"""
+
+
+class RingBufferSink(EventSink):
+    """نگهداری آخرین رویدادها در حافظه برای اشکال‌زدایی"""
+
+    enabled = True
+
+    def __init__(self, capacity=1000):
+        self.events = deque(maxlen=capacity)
+
+    def emit(self, event_type, **fields):
+        self.events.append({"event": event_type, "time": time.time(), **fields})
+
+    def snapshot(self):
+        """کپی رویدادهای موجود، از قدیمی به جدید"""
+        return list(self.events)
+
+
+class JsonLinesSink(EventSink):
+    """نوشتن دسته‌ای رویدادها به صورت JSON Lines در فایل"""
+
+    enabled = True
+
+    def __init__(self, path, batch_size=100):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def emit(self, event_type, **fields):
+        record = {"event": event_type, "time": time.time(), **fields}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) < self.batch_size:
+                return
+            lines, self._buffer = self._buffer, []
+        self._write(lines)
+
+    def flush(self):
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if lines:
+            self._write(lines)
+
+    def _write(self, lines):
+        with open(self.path, "a", encoding="utf-8") as output:
+            output.write("\n".join(lines) + "\n")
+
+
+class ConsoleSink(EventSink):
+    """چاپ رویدادها در کنسول با همان قالب قبلی هسته"""
+
+    enabled = True
+
+    stage_titles = {
+        1: "مرحله ۱: خودآگاهی",
+        2: "مرحله ۲: مدل ذهنی کاربر",
+        3: "مرحله ۳: کنترل شناختی",
+        4: "مرحله ۴: نظارت بر شناخت",
+        5: "مرحله ۵: تولید پاسخ",
+        6: "مرحله ۶: ارزیابی عملکرد",
+        7: "مرحله ۷: به‌روزرسانی و یادگیری"
+    }
+
+    def emit(self, event_type, **fields):
+        handler = getattr(self, f"_on_{event_type}", None)
+        if handler:
+            handler(**fields)
+
+    def _on_core_starting(self):
+        print("=" * 60)
+        print("هسته فراشناختی در حال راه‌اندازی...")
+        print("=" * 60)
+
+    def _on_core_initialized(self, active_modules, metacognitive_level):
+        print("\n✓ هسته فراشناختی با موفقیت راه‌اندازی شد")
+        print(f"✓ تعداد ماژول‌های فعال: {active_modules}")
+        print(f"✓ سطح فراشناختی: {metacognitive_level}")
+        print("=" * 60 + "\n")
+
+    def _on_input_received(self, user_input):
+        print(f"\n{'='*40}")
+        print(f"پردازش ورودی جدید: '{user_input[:50]}...'")
+        print(f"{'='*40}")
+
+    # مراحل اختیاری ادامه گزارش مرحله اصلی خود هستند و عنوان جدا ندارند
+    continued_stages = {"consequence_analysis", "future_needs"}
+
+    def _on_stage_completed(self, stage, name=None, **details):
+        if name not in self.continued_stages:
+            print(f"\n[{self.stage_titles.get(stage, stage)}]")
+        if stage == 1:
+            if details["limitations"]:
+                print(f"   محدودیت‌های شناسایی شده: {details['limitations']}")
+        elif stage == 2:
+            print(f"   اهداف کاربر: {details['goals']}")
+            print(f"   وضعیت عاطفی: {details['emotion']}")
+        elif stage == 3:
+            print(f"   راهبرد انتخاب شده: {details['strategy']}")
+            print(f"   تمرکز: {details['focus']}")
+            print(f"   حالت پردازش: {details['processing_mode']}")
+        elif stage == 4:
+            print(f"   مراحل استدلال: {details['step_count']}")
+            print(f"   سطح اطمینان: {details['confidence']}")
+        elif stage == 5:
+            print(f"   پاسخ تولید شده: '{details['response'][:80]}...'")
+        elif stage == 6:
+            if "quality_score" in details:
+                print(f"   کیفیت پاسخ: {details['quality_score']:.2f}")
+            if "immediate_effects" in details:
+                print(f"   اثرات فوری: {details['immediate_effects']}")
+        elif stage == 7:
+            if "topics_updated" in details:
+                print(f"   موضوعات جدید: {details['topics_updated']}")
+            if "predicted_questions" in details:
+                print(f"   سوالات پیش‌بینی شده: {details['predicted_questions']}")
@@ -0,0 +1,191 @@
+# ============================================
+# ارزیابی افزایشی پاسخ جریانی (Incremental Evaluation)
+# ============================================
+#
+# پاسخ تکه به تکه (مثلاً توکن به توکن از یک مولد جریانی) وارد می‌شود و امتیازهای
+# دقت، ارتباط، انسجام، کامل بودن و به‌موقع بودن، خطاها و تناقض‌ها و نشانه‌های پیامد
+# پس از هر تکه در دسترس‌اند تا بتوان تولید را زود متوقف یا هدایت کرد.
+#
+# هزینه هر تکه O(طول تکه) است: فقط عبارت‌های هنوز پیدا نشده در پنجره‌ای شامل انتهای
+# متن قبلی و تکه جدید جستجو و شمارش کلمات و جمله‌ها با شمارنده‌های مرزی به‌روز
+# می‌شود. امتیازها با همان توابع مسیر دسته‌ای محاسبه می‌شوند، پس نتیجه پس از هر تکه
+# دقیقاً برابر ارزیابی دسته‌ای متن تا آن لحظه است.
+
+from analyzed_text import analyze
+from cognitive_monitoring import CONTRADICTION_TERMS, KNOWLEDGE_GAP_TERMS, errors_and_gaps
+from performance_evaluation import (
+    ACCURACY_INDICATORS,
+    AMBIGUOUS_TERMS,
+    COHERENCE_INDICATORS,
+    DIRECT_ANSWER_INDICATORS,
+    INACCURACY_INDICATORS,
+    KNOWLEDGE_LIMIT_INDICATOR,
+    RESPONSE_ELEMENTS,
+    SATISFACTION_INDICATORS,
+    accuracy_score,
+    coherence_score,
+    completeness_score,
+    consequence_analysis,
+    relevance_score,
+    timeliness_score
+)
+
+# همه عبارت‌هایی که امتیازها، خطاها و پیامدها به وجودشان در پاسخ وابسته‌اند
+TRACKED_TERMS = frozenset(
+    [indicator for indicator, _ in ACCURACY_INDICATORS]
+    + INACCURACY_INDICATORS
+    + [indicator for indicator, _ in COHERENCE_INDICATORS]
+    + list(RESPONSE_ELEMENTS)
+    + DIRECT_ANSWER_INDICATORS
+    + SATISFACTION_INDICATORS
+    + [KNOWLEDGE_LIMIT_INDICATOR]
+    + AMBIGUOUS_TERMS
+    + KNOWLEDGE_GAP_TERMS
+    + CONTRADICTION_TERMS
+)
+
+
+class _TokenCounter:
+    """شمارش افزایشی کلمات (مثل len(text.split())) با جداکننده‌های اضافه اختیاری"""
+
+    def __init__(self, separators=""):
+        self.separators = separators
+        self.count = 0
+        self.in_token = False
+
+    def _is_separator(self, char):
+        return char.isspace() or char in self.separators
+
+    def feed(self, chunk):
+        text = chunk
+        for separator in self.separators:
+            text = text.replace(separator, " ")
+        count = len(text.split())
+        # کلمه‌ای که از تکه قبلی ادامه پیدا می‌کند دوباره شمرده نمی‌شود
+        if count and self.in_token and not self._is_separator(chunk[0]):
+            count -= 1
+        self.count += count
+        self.in_token = not self._is_separator(chunk[-1])
+
+
+class IncrementalEvaluator:
+    """ارزیاب افزایشی یک پاسخ جریانی برای یک پرسش
+
+        evaluator = IncrementalEvaluator(query)
+        for chunk in stream:
+            evaluator.feed(chunk)
+            if evaluator.scores()["accuracy"] < 0.3:
+                break
+        result = evaluator.finish()
+
+    finish() همان امتیازهای evaluate_response_quality، همان خروجی detect_errors_gaps و
+    همان تحلیل analyze_consequences را برای کل پاسخ برمی‌گرداند.
+    """
+
+    def __init__(self, query, context=None):
+        self.query = analyze(query)
+        self.context = context
+        # کلمات پرسش که در ارتباط شمرده می‌شوند (با شکل حروف کوچک پاسخ مقایسه می‌شوند)
+        self._pending_query_keywords = {keyword for keyword in self.query.token_set if len(keyword) > 3}
+        self._pending_terms = set(TRACKED_TERMS)
+        self.found_terms = set()
+        self.keyword_matches = 0
+        # انتهای متن قبلی که برای یافتن عبارت‌های روی مرز تکه‌ها لازم است
+        self._overlap = max(len(term) for term in TRACKED_TERMS | self._pending_query_keywords) - 1
+        self._tail = ""
+        self._words = _TokenCounter()
+        self._sentence_words = _TokenCounter(".")
+        self.sentences = 1
+        self.length = 0
+        self.has_content = False
+        self._chunks = []
+        # lower() برای سیگمای پایانی یونانی به حرف بعدی وابسته است؛ در آن حالت نادر
+        # ارتباط در پایان روی کل متن دوباره محاسبه می‌شود
+        self._context_sensitive_case = False
+
+    def feed(self, chunk):
+        """افزودن یک تکه از پاسخ و به‌روزرسانی وضعیت؛ امتیازهای فعلی را برمی‌گرداند"""
+        chunk = str(chunk)
+        if not chunk:
+            return self.scores()
+        self._chunks.append(chunk)
+        window = self._tail + chunk
+
+        if self._pending_terms:
+            found = {term for term in self._pending_terms if term in window}
+            self._pending_terms -= found
+            self.found_terms |= found
+
+        if self._pending_query_keywords:
+            lowered = window.lower()
+            matched = {keyword for keyword in self._pending_query_keywords if keyword in lowered}
+            self._pending_query_keywords -= matched
+            self.keyword_matches += len(matched)
+        if "Σ" in chunk:
+            self._context_sensitive_case = True
+
+        self._words.feed(chunk)
+        self._sentence_words.feed(chunk)
+        self.sentences += chunk.count(".")
+        self.length += len(chunk)
+        if not self.has_content and chunk.strip():
+            self.has_content = True
+        self._tail = window[-self._overlap:] if self._overlap > 0 else ""
+        return self.scores()
+
+    @property
+    def word_count(self):
+        return self._words.count
+
+    @property
+    def avg_sentence_length(self):
+        return self._sentence_words.count / self.sentences
+
+    @property
+    def text(self):
+        """متن دریافت شده تا این لحظه"""
+        if len(self._chunks) > 1:
+            self._chunks[:] = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def scores(self):
+        """امتیازهای کیفیت متن دریافت شده تا این لحظه (O(1))"""
+        found = self.found_terms
+        keyword_matches = self.keyword_matches
+        if self._context_sensitive_case:
+            response_lower = self.text.lower()
+            keyword_matches = sum(
+                1 for keyword in self.query.token_set if len(keyword) > 3 and keyword in response_lower
+            )
+        evaluation = {
+            "accuracy": accuracy_score(found),
+            "relevance": relevance_score(
+                self.query, keyword_matches, any(indicator in found for indicator in DIRECT_ANSWER_INDICATORS)
+            ),
+            "coherence": coherence_score(found, self.avg_sentence_length),
+            "completeness": completeness_score(found, self.word_count),
+            "timeliness": timeliness_score(self.context, lambda: self.word_count)
+        }
+        evaluation["overall_score"] = sum(evaluation.values()) / len(evaluation)
+        return evaluation
+
+    def errors_gaps(self):
+        """همان خروجی CognitiveMonitoring.detect_errors_gaps برای متن تا این لحظه"""
+        errors, gaps = errors_and_gaps(not self.has_content, self.found_terms.__contains__)
+        return {"errors": errors, "gaps": gaps}
+
+    def consequences(self, user_reaction=None, follow_up_questions=None):
+        """همان تحلیل PerformanceEvaluation.analyze_consequences برای متن تا این لحظه"""
+        return consequence_analysis(self.found_terms.__contains__, user_reaction, follow_up_questions)
+
+    def finish(self, performance_evaluation=None, user_reaction=None, follow_up_questions=None):
+        """نتیجه نهایی کل پاسخ؛ با performance_evaluation ارزیابی مثل evaluate_response_quality ثبت می‌شود"""
+        quality = self.scores()
+        if performance_evaluation is not None:
+            performance_evaluation.record_evaluation(quality, self.query)
+        return {
+            "response": self.text,
+            "quality": quality,
+            "errors_gaps": self.errors_gaps(),
+            "consequences": self.consequences(user_reaction, follow_up_questions)
+        }
@@ -0,0 +1,282 @@
+# ============================================
+# ابزارسنجی زمان و حافظه (Instrumentation)
+# ============================================
+#
+# زمان هر مرحله و هر متد ماژول‌ها در هیستوگرام‌های HDR ثبت و در قالب متنی
+# Prometheus صادر می‌شود. هسته بدون Instrumentation هیچ هزینه‌ای ندارد.
+
+import functools
+import inspect
+import math
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# صدک‌هایی که در خروجی Prometheus گزارش می‌شوند
+EXPORTED_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+METRIC_PREFIX = "metacognitive"
+
+
+class LatencyHistogram:
+    """هیستوگرام لگاریتمی-خطی به سبک HDR برای زمان‌ها (با دقت نانوثانیه)
+
+    هر توان ۲ به 2**significant_bits زیربازه خطی تقسیم می‌شود، پس خطای نسبی هر
+    مقدار گزارش شده حداکثر 2**-(significant_bits - 1) است و ثبت O(1) است.
+    """
+
+    def __init__(self, significant_bits=7):
+        self.significant_bits = significant_bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def _index(self, nanoseconds):
+        shift = max(0, nanoseconds.bit_length() - self.significant_bits)
+        return (shift << self.significant_bits) | (nanoseconds >> shift)
+
+    def _highest_equivalent(self, index):
+        """بزرگ‌ترین مقدار (نانوثانیه) که در زیربازه index قرار می‌گیرد"""
+        shift = index >> self.significant_bits
+        base = index & ((1 << self.significant_bits) - 1)
+        return ((base + 1) << shift) - 1
+
+    def record(self, seconds):
+        nanoseconds = max(0, int(seconds * 1e9))
+        index = self._index(nanoseconds)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.minimum is None or seconds < self.minimum:
+            self.minimum = seconds
+        if self.maximum is None or seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, fraction):
+        """مقدار صدک fraction (ثانیه)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_equivalent(index) / 1e9, self.maximum)
+        return self.maximum
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.minimum,
+            "max": self.maximum,
+            **{f"p{quantile * 100:g}": self.percentile(quantile) for quantile in EXPORTED_QUANTILES}
+        }
+
+
+class Instrumentation:
+    """ثبت زمان مراحل و متدهای ماژول‌ها و صدور آن‌ها برای Prometheus
+
+    با trace_allocations=True تغییر حافظه تخصیص یافته در هر فراخوانی متد با
+    tracemalloc اندازه‌گیری می‌شود (هزینه قابل توجه؛ فقط برای عیب‌یابی).
+    """
+
+    def __init__(self, trace_allocations=False, significant_bits=7):
+        self.enabled = True
+        self.trace_allocations = trace_allocations
+        self.significant_bits = significant_bits
+        self.request_latency = LatencyHistogram(significant_bits)
+        self.stage_latency = {}
+        self.method_latency = {}
+        self.stage_skips = {}
+        self.cache_hits = 0
+        # مجموع افزایش حافظه تخصیص یافته در هر متد (بایت)
+        self.method_allocations = {}
+        self._classes = {}
+        self._lock = threading.Lock()
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def observe_request(self, timing):
+        """ثبت گزارش زمان‌بندی یک درخواست (stage_timing)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.request_latency.record(timing["wall_time"])
+            if timing.get("cache_hit"):
+                self.cache_hits += 1
+            for name, duration in timing["stage_durations"].items():
+                histogram = self.stage_latency.get(name)
+                if histogram is None:
+                    histogram = self.stage_latency[name] = LatencyHistogram(self.significant_bits)
+                histogram.record(duration)
+            for name in timing.get("skipped_stages", ()):
+                self.stage_skips[name] = self.stage_skips.get(name, 0) + 1
+
+    def observe_method(self, key, seconds, allocated=None):
+        with self._lock:
+            histogram = self.method_latency.get(key)
+            if histogram is None:
+                histogram = self.method_latency[key] = LatencyHistogram(self.significant_bits)
+            histogram.record(seconds)
+            if allocated is not None and allocated > 0:
+                self.method_allocations[key] = self.method_allocations.get(key, 0) + allocated
+
+    def instrument(self, module):
+        """سنجش متدهای عمومی یک شیء ماژول
+
+        کلاس شیء با زیرکلاسی جایگزین می‌شود که متدها را می‌سنجد؛ وضعیت شیء (vars)
+        تغییر نمی‌کند و نمونه‌های تازه از type(module) هم سنجیده می‌شوند.
+        """
+        cls = type(module)
+        if getattr(cls, "_instrumentation", None) is self:
+            return module
+        module.__class__ = self._instrumented_class(cls)
+        return module
+
+    def _instrumented_class(self, cls):
+        if cls not in self._classes:
+            methods = {
+                name for klass in cls.__mro__ if klass is not object
+                for name, value in vars(klass).items()
+                if not name.startswith("_") and inspect.isfunction(value)
+            }
+            namespace = {"_instrumentation": self, "__module__": cls.__module__}
+            for name in methods:
+                namespace[name] = self._wrap(getattr(cls, name), (cls.__name__, name))
+            self._classes[cls] = type(cls.__name__, (cls,), namespace)
+        return self._classes[cls]
+
+    def _wrap(self, method, key):
+        instrumentation = self
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return method(*args, **kwargs)
+            tracing = instrumentation.trace_allocations and tracemalloc.is_tracing()
+            allocated_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                allocated = tracemalloc.get_traced_memory()[0] - allocated_before if tracing else None
+                instrumentation.observe_method(key, elapsed, allocated)
+
+        return wrapper
+
+    def reset(self):
+        with self._lock:
+            self.request_latency = LatencyHistogram(self.significant_bits)
+            self.stage_latency.clear()
+            self.method_latency.clear()
+            self.stage_skips.clear()
+            self.method_allocations.clear()
+            self.cache_hits = 0
+
+    def render_prometheus(self):
+        """متن متریک‌ها در قالب exposition نسخه 0.0.4 Prometheus"""
+        with self._lock:
+            lines = []
+            _summary(lines, f"{METRIC_PREFIX}_request_latency_seconds",
+                     "زمان کل پردازش هر درخواست", {(): self.request_latency})
+            _counter(lines, f"{METRIC_PREFIX}_cache_hits_total",
+                     "درخواست‌هایی که پاسخشان از حافظه نهان خوانده شد", {(): self.cache_hits})
+            _summary(lines, f"{METRIC_PREFIX}_stage_latency_seconds", "زمان هر مرحله خط لوله",
+                     {(("stage", name),): histogram for name, histogram in self.stage_latency.items()})
+            _counter(lines, f"{METRIC_PREFIX}_stage_skipped_total", "تعداد حذف هر مرحله اختیاری",
+                     {(("stage", name),): count for name, count in self.stage_skips.items()})
+            _summary(lines, f"{METRIC_PREFIX}_method_latency_seconds", "زمان هر متد ماژول",
+                     {(("module", module), ("method", method)): histogram
+                      for (module, method), histogram in self.method_latency.items()})
+            _counter(lines, f"{METRIC_PREFIX}_method_calls_total", "تعداد فراخوانی هر متد ماژول",
+                     {(("module", module), ("method", method)): histogram.count
+                      for (module, method), histogram in self.method_latency.items()})
+            if self.trace_allocations:
+                _counter(lines, f"{METRIC_PREFIX}_method_allocated_bytes_total",
+                         "مجموع افزایش حافظه تخصیص یافته در هر متد (tracemalloc)",
+                         {(("module", module), ("method", method)): allocated
+                          for (module, method), allocated in self.method_allocations.items()})
+            return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """نوشتن متریک‌ها در فایل به صورت اتمی (مناسب textfile collector)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as output:
+                output.write(self.render_prometheus())
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def http_handler(self):
+        """کلاس handler برای http.server که متریک‌ها را روی /metrics برمی‌گرداند"""
+        instrumentation = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = instrumentation.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MetricsHandler
+
+    def serve_prometheus(self, host="127.0.0.1", port=9464):
+        """اجرای سرور HTTP محلی متریک‌ها در یک رشته پس‌زمینه؛ سرور را برمی‌گرداند"""
+        server = ThreadingHTTPServer((host, port), self.http_handler())
+        thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+        thread.start()
+        return server
+
+
+def _escape_help(text):
+    """در متن HELP فقط \\ و خط جدید escape می‌شوند"""
+    return str(text).replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape(value):
+    """مقدار برچسب: \\، خط جدید و " escape می‌شوند"""
+    return _escape_help(value).replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _header(lines, name, help_text, metric_type):
+    lines.append(f"# HELP {name} {_escape_help(help_text)}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+
+def _summary(lines, name, help_text, histograms):
+    _header(lines, name, help_text, "summary")
+    for labels, histogram in sorted(histograms.items()):
+        for quantile in EXPORTED_QUANTILES:
+            lines.append(f"{name}{_labels(labels + (('quantile', quantile),))} {histogram.percentile(quantile)!r}")
+        lines.append(f"{name}_sum{_labels(labels)} {histogram.total!r}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+
+def _counter(lines, name, help_text, values):
+    _header(lines, name, help_text, "counter")
+    for labels, value in sorted(values.items()):
+        lines.append(f"{name}{_labels(labels)} {value}")
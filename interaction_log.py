@@ -0,0 +1,299 @@
+# ============================================
+# لاگ تعاملات (Interaction Log)
+# ============================================
+
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import weakref
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from snapshot import decode_value, encode_value
+
+# اندازه پیش‌فرض هر قطعه پیش از چرخش به قطعه جدید
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+
+# رکوردهای تازه تا این اندازه در حافظه می‌مانند و سپس یک‌جا در قطعه نوشته می‌شوند
+WRITE_BUFFER_BYTES = 64 * 1024
+
+# حداکثر تعداد قطعه‌هایی که در کل پردازه همزمان نگاشت حافظه‌ای باز می‌مانند
+# (هر نگاشت یک توصیف‌گر فایل نگه می‌دارد)
+MAX_OPEN_MAPS = 32
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+
+# هر رکورد: طول (۴ بایت little-endian) و سپس محتوای رمزگذاری شده
+_LENGTH = struct.Struct("<I")
+
+# نگاشت‌های باز همه لاگ‌ها به ترتیب آخرین استفاده: (منابع لاگ، قطعه) -> mmap
+_open_maps = OrderedDict()
+_maps_lock = threading.Lock()
+
+
+class _Resources:
+    """منابع لاگ؛ جدا از خود لاگ تا پس از جمع‌آوری زباله هم آزاد شوند"""
+
+    def __init__(self, persistent):
+        self.persistent = persistent
+        # قطعه‌های این لاگ که در _open_maps نگاشت شده‌اند
+        self.segments = set()
+        self.temporary_directory = None
+        # رکوردهای نوشته نشده قطعه فعال و مسیر آن (در لاگ ماندگار هنگام بستن نوشته می‌شوند)
+        self.pending = bytearray()
+        self.pending_path = None
+
+    def close_maps(self):
+        with _maps_lock:
+            for segment in self.segments:
+                segment_map = _open_maps.pop((self, segment), None)
+                if segment_map is not None:
+                    segment_map.close()
+            self.segments.clear()
+
+    def write_pending(self):
+        if self.pending:
+            with open(self.pending_path, "ab") as output:
+                output.write(self.pending)
+            self.pending = bytearray()
+
+    def close(self):
+        self.close_maps()
+        if self.persistent:
+            self.write_pending()
+        elif self.temporary_directory is not None:
+            shutil.rmtree(self.temporary_directory, ignore_errors=True)
+            self.temporary_directory = None
+
+
+class InteractionLog(Sequence):
+    """لاگ فقط-افزودنی و قطعه‌بندی شده تعاملات روی دیسک
+
+    رکوردها در فایل‌های قطعه نوشته و با نگاشت حافظه‌ای خوانده می‌شوند؛ در حافظه فقط
+    محل شروع هر رکورد و رکوردهای هنوز نوشته نشده (حداکثر buffer_bytes) نگه داشته
+    می‌شود. فایل‌ها فقط هنگام نوشتن یا نگاشت باز می‌شوند، پس لاگ‌های کوچک هیچ فایل
+    یا پوشه‌ای نمی‌سازند. بدون directory، لاگ در یک پوشه موقت ساخته می‌شود که با
+    بسته شدن لاگ پاک می‌شود؛ با directory، close() یا flush() رکوردهای منتظر را می‌نویسد.
+    """
+
+    def __init__(self, directory=None, segment_bytes=DEFAULT_SEGMENT_BYTES, buffer_bytes=WRITE_BUFFER_BYTES):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.buffer_bytes = buffer_bytes
+        # برای هر قطعه: محل شروع رکوردها، اندازه (با بخش نوشته نشده) و اندیس اولین رکورد
+        self._offsets = []
+        self._sizes = []
+        self._starts = []
+        self._count = 0
+        # اندازه بخش نوشته شده قطعه فعال
+        self._written = 0
+        # رکوردهای پذیرفته شده با adopt که پیش از رکوردهای قطعه‌ها می‌آیند
+        self._adopted = ()
+        self._adopted_count = 0
+        self._lock = threading.Lock()
+        self._resources = _Resources(persistent=directory is not None)
+        self._finalizer = weakref.finalize(self, self._resources.close)
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._recover()
+
+    def __len__(self):
+        return self._adopted_count + self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._read(position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("اندیس خارج از محدوده لاگ")
+        return self._read(index)
+
+    def __iter__(self):
+        yield from self._adopted
+        for segment in range(len(self._offsets)):
+            for position in self._offsets[segment][:]:
+                yield decode_value(self._entry(segment, position))
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def append(self, record):
+        """افزودن یک رکورد به انتهای لاگ (O(1))"""
+        payload = encode_value(record)
+        entry = _LENGTH.pack(len(payload)) + payload
+        with self._lock:
+            if not self._sizes or (
+                self._sizes[-1] > 0 and self._sizes[-1] + len(entry) > self.segment_bytes
+            ):
+                self._rotate()
+            pending = self._resources.pending
+            pending += entry
+            self._offsets[-1].append(self._sizes[-1])
+            self._sizes[-1] += len(entry)
+            self._count += 1
+            if len(pending) >= self.buffer_bytes:
+                self._write_pending()
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def adopt(self, records, count=None):
+        """جایگزینی محتوای لاگ با records (مثلاً لیست تنبل snapshot) بدون رمزگشایی آن
+
+        count تعداد رکوردهاست تا len() لیست تنبل را رمزگشایی نکند. در لاگ با پوشه ثابت
+        رکوردها در قطعه‌ها نوشته می‌شوند تا ماندگار بمانند.
+        """
+        self.clear()
+        if self.directory is not None:
+            self.extend(records)
+            self.flush()
+            return
+        self._adopted = records
+        self._adopted_count = len(records) if count is None else count
+
+    def flush(self):
+        """نوشتن رکوردهای منتظر در فایل قطعه فعال"""
+        with self._lock:
+            self._write_pending()
+
+    def clear(self):
+        """حذف همه رکوردها و فایل‌های قطعه"""
+        with self._lock:
+            resources = self._resources
+            resources.close_maps()
+            resources.pending = bytearray()
+            if self.directory is not None or resources.temporary_directory is not None:
+                for segment in range(len(self._offsets)):
+                    path = self._segment_path(segment)
+                    if os.path.exists(path):
+                        os.remove(path)
+            self._offsets = []
+            self._sizes = []
+            self._starts = []
+            self._count = 0
+            self._written = 0
+            self._adopted = ()
+            self._adopted_count = 0
+
+    def close(self):
+        """بستن نگاشت‌ها و نوشتن رکوردهای منتظر (پوشه موقت حذف می‌شود)"""
+        self._finalizer()
+
+    @property
+    def segment_count(self):
+        return len(self._offsets)
+
+    def memory_bytes(self):
+        """حافظه مصرفی اندیس رکوردها و رکوردهای منتظر نوشتن (بقیه محتوا روی دیسک است)"""
+        return sum(offsets.itemsize * len(offsets) for offsets in self._offsets) + len(self._resources.pending)
+
+    def _storage_directory(self):
+        if self.directory is None:
+            resources = self._resources
+            if resources.temporary_directory is None:
+                resources.temporary_directory = tempfile.mkdtemp(prefix="interaction-log-")
+            return resources.temporary_directory
+        return self.directory
+
+    def _segment_path(self, segment):
+        return os.path.join(self._storage_directory(), f"{SEGMENT_PREFIX}{segment:06d}{SEGMENT_SUFFIX}")
+
+    def _rotate(self):
+        """نوشتن باقی‌مانده قطعه فعلی و شروع قطعه جدید"""
+        self._write_pending()
+        self._offsets.append(array("Q"))
+        self._sizes.append(0)
+        self._starts.append(self._count)
+        self._written = 0
+        if self.directory is not None:
+            self._resources.pending_path = self._segment_path(len(self._offsets) - 1)
+
+    def _write_pending(self):
+        resources = self._resources
+        if resources.pending:
+            written = len(resources.pending)
+            resources.pending_path = self._segment_path(len(self._offsets) - 1)
+            resources.write_pending()
+            self._written += written
+
+    def _entry(self, segment, position):
+        """محتوای رمزگذاری شده رکورد شروع شده در position از قطعه"""
+        with self._lock:
+            if segment == len(self._offsets) - 1 and position >= self._written:
+                pending = self._resources.pending
+                start = position - self._written
+                length = _LENGTH.unpack_from(pending, start)[0]
+                return bytes(pending[start + _LENGTH.size:start + _LENGTH.size + length])
+            size = self._written if segment == len(self._offsets) - 1 else self._sizes[segment]
+            return self._mapped_entry(segment, position, size)
+
+    def _mapped_entry(self, segment, position, size):
+        """خواندن رکورد از نگاشت قطعه؛ نگاشت قطعه فعال با رشد فایل تازه می‌شود"""
+        resources = self._resources
+        key = (resources, segment)
+        with _maps_lock:
+            segment_map = _open_maps.get(key)
+            if segment_map is not None and position < len(segment_map):
+                _open_maps.move_to_end(key)
+            else:
+                if segment_map is not None:
+                    del _open_maps[key]
+                    segment_map.close()
+                while len(_open_maps) >= MAX_OPEN_MAPS:
+                    (owner, owner_segment), evicted = _open_maps.popitem(last=False)
+                    owner.segments.discard(owner_segment)
+                    evicted.close()
+                with open(self._segment_path(segment), "rb") as source:
+                    segment_map = mmap.mmap(source.fileno(), size, access=mmap.ACCESS_READ)
+                _open_maps[key] = segment_map
+                resources.segments.add(segment)
+            length = _LENGTH.unpack_from(segment_map, position)[0]
+            start = position + _LENGTH.size
+            return segment_map[start:start + length]
+
+    def _read(self, index):
+        if index < self._adopted_count:
+            return self._adopted[index]
+        index -= self._adopted_count
+        segment = bisect_right(self._starts, index) - 1
+        position = self._offsets[segment][index - self._starts[segment]]
+        return decode_value(self._entry(segment, position))
+
+    def _recover(self):
+        """بازسازی اندیس از قطعه‌های موجود؛ رکورد ناقص انتهایی حذف می‌شود"""
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+        for segment, name in enumerate(names):
+            expected = f"{SEGMENT_PREFIX}{segment:06d}{SEGMENT_SUFFIX}"
+            if name != expected:
+                raise ValueError(f"قطعه گمشده یا نامعتبر در لاگ: {expected}")
+            path = os.path.join(self.directory, name)
+            with open(path, "rb") as source:
+                data = source.read()
+            offsets = array("Q")
+            position = 0
+            while position + _LENGTH.size <= len(data):
+                length = _LENGTH.unpack_from(data, position)[0]
+                if position + _LENGTH.size + length > len(data):
+                    break
+                offsets.append(position)
+                position += _LENGTH.size + length
+            if position < len(data):
+                with open(path, "r+b") as target:
+                    target.truncate(position)
+            self._offsets.append(offsets)
+            self._sizes.append(position)
+            self._starts.append(self._count)
+            self._count += len(offsets)
+        if self._sizes:
+            self._written = self._sizes[-1]
@@ -0,0 +1,71 @@
+# ============================================
+# نگاشت تنبل (Lazy Mapping)
+# ============================================
+
+# جای مقدار کلیدی که هنوز ساخته نشده (کلیدها از ابتدا در dict هستند تا اندازه آن درست باشد)
+_UNBUILT = object()
+
+
+class LazyMapping(dict):
+    """نگاشتی که مقدار هر کلید فقط در اولین دسترسی ساخته و نگه داشته می‌شود
+
+    builders نام هر کلید را به تابعی بدون آرگومان نگاشت می‌کند. زیرکلاس dict است تا
+    json.dumps، encode_value و هر کدی که dict می‌خواهد آن را بپذیرد؛ items()، values()،
+    keys()، مقایسه، کپی عمیق و pickle همه مقادیر را می‌سازند و مثل dict معمولی رفتار می‌کنند.
+    """
+
+    def __init__(self, builders):
+        super().__init__(dict.fromkeys(builders, _UNBUILT))
+        self._builders = builders
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if value is _UNBUILT:
+            value = self._builders[key]()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._builders:
+            self._builders[key] = None
+        dict.__setitem__(self, key, value)
+
+    def __iter__(self):
+        return iter(self._builders)
+
+    def __len__(self):
+        return len(self._builders)
+
+    def __contains__(self, key):
+        return key in self._builders
+
+    def get(self, key, default=None):
+        return self[key] if key in self._builders else default
+
+    def keys(self):
+        return self.materialize().keys()
+
+    def items(self):
+        return self.materialize().items()
+
+    def values(self):
+        return self.materialize().values()
+
+    def copy(self):
+        return self.materialize()
+
+    def materialize(self):
+        """ساخت همه مقادیر و بازگرداندن یک dict معمولی"""
+        return {key: self[key] for key in self._builders}
+
+    def __eq__(self, other):
+        return self.materialize() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        return (dict, (self.materialize(),))
+
+    def __repr__(self):
+        return f"LazyMapping({self.materialize()!r})"
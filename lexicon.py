@@ -0,0 +1,103 @@
+# ============================================
+# موتور واژگان مشترک (Shared Lexicon Engine)
+# ============================================
+
+import re
+from functools import lru_cache
+
+
+class Lexicon:
+    """مجموعه‌ای از کلیدواژه‌ها که در یک خودکاره چندالگویی کامپایل می‌شوند"""
+
+    def __init__(self, cache_size=512):
+        self.keywords = set()
+        self.cache_size = cache_size
+        self._pattern = None
+        self._closure = {}
+        self._successors = {}
+        self._cached_scan = None
+
+    def register(self, keywords):
+        """افزودن کلیدواژه‌های یک جدول به واژگان"""
+        new_keywords = {keyword for keyword in keywords if keyword} - self.keywords
+        if new_keywords:
+            self.keywords |= new_keywords
+            # خودکاره در اولین پویش بعدی دوباره ساخته می‌شود
+            self._pattern = None
+            self._cached_scan = None
+        return len(new_keywords)
+
+    def compile(self):
+        """ساخت عبارت منظم درخت‌واژه (trie) از تمام کلیدواژه‌ها"""
+        trie = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        if trie:
+            self._pattern = re.compile(self._trie_to_regex(trie))
+        else:
+            self._pattern = re.compile("(?!)")
+
+        # هر کلیدواژه، تمام کلیدواژه‌هایی را که زیررشته آن هستند نیز در متن تضمین می‌کند
+        self._closure = {
+            keyword: frozenset(other for other in self.keywords if other in keyword)
+            for keyword in self.keywords
+        }
+        # کلیدواژه‌هایی که می‌توانند وسط یک تطابق شروع شوند و از آن فراتر بروند
+        self._successors = {
+            keyword: frozenset(
+                other for other in self.keywords
+                if any(keyword[-k:] == other[:k] for k in range(1, min(len(keyword), len(other))))
+            )
+            for keyword in self.keywords
+        }
+        self._cached_scan = lru_cache(maxsize=self.cache_size)(self._scan_uncached)
+        return self._pattern
+
+    def _trie_to_regex(self, node):
+        """تبدیل یک گره درخت‌واژه به عبارت منظم با ترجیح طولانی‌ترین تطابق"""
+        branches = [
+            re.escape(char) + self._trie_to_regex(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # پایان کلیدواژه: ادامه اختیاری و حریصانه است
+            if len(branches) == 1:
+                body = "(?:" + body + ")"
+            return body + "?"
+        return body
+
+    def _scan_uncached(self, text):
+        """یک پویش کامل متن و بازگرداندن تمام کلیدواژه‌های موجود"""
+        # در هر موقعیت شروع، طولانی‌ترین کلیدواژه پیدا می‌شود و زیررشته‌هایش از پیش محاسبه شده‌اند
+        longest_matches = set(self._pattern.findall(text))
+        found = set()
+        candidates = set()
+        for keyword in longest_matches:
+            found |= self._closure[keyword]
+            candidates |= self._successors[keyword]
+        
+        # کلیدواژه‌های هم‌پوشان فقط وقتی بررسی می‌شوند که تطابقی که در آن شروع می‌شوند پیدا شده باشد
+        for keyword in candidates - found:
+            if keyword in text:
+                found |= self._closure[keyword]
+        
+        return frozenset(found)
+
+    def scan(self, text):
+        """کلیدواژه‌های موجود در متن (نتیجه برای هر متن فقط یک بار محاسبه می‌شود)"""
+        if self._cached_scan is None:
+            self.compile()
+        return self._cached_scan(text)
+
+
+# واژگان مشترک همه ماژول‌ها
+LEXICON = Lexicon()
@@ -0,0 +1,80 @@
+# ============================================
+# بسته metacognitive: نمای یکپارچه با بارگذاری تنبل
+# ============================================
+#
+# import این بسته هیچ زیرماژولی (و هیچ جدول واژگانی) را بارگذاری نمی‌کند؛ هر نام
+# در اولین دسترسی از ماژول خود import و برای دسترسی‌های بعدی نگه داشته می‌شود.
+#
+#     import metacognitive
+#     core = metacognitive.MetacognitiveCore()
+#
+# دموی ماژول‌ها: python -m metacognitive [نام دمو]
+
+import importlib
+
+# نام عمومی -> ماژولی که آن را تعریف می‌کند
+_EXPORTS = {
+    "MetacognitiveCore": "metacognitive_core",
+    "SelfAwareness": "self_awareness",
+    "CognitiveMonitoring": "cognitive_monitoring",
+    "CognitiveControl": "cognitive_control",
+    "PerformanceEvaluation": "performance_evaluation",
+    "IncrementalEvaluator": "incremental_evaluation",
+    "UserMentalModel": "user_mental_model",
+    "SessionManager": "session_manager",
+    "UserModelStore": "user_store",
+    "SqliteUserModelStore": "user_store",
+    "MetacognitiveServer": "server",
+    "MetacognitiveClient": "server",
+    "WorkerPool": "worker_pool",
+    "ResultCache": "result_cache",
+    "Instrumentation": "instrumentation",
+    "LatencyHistogram": "instrumentation",
+    "InteractionLog": "interaction_log",
+    "EventSink": "event_sinks",
+    "NullSink": "event_sinks",
+    "RingBufferSink": "event_sinks",
+    "JsonLinesSink": "event_sinks",
+    "ConsoleSink": "event_sinks",
+    "Stage": "stage_scheduler",
+    "StageScheduler": "stage_scheduler",
+    "RunningStats": "aggregates",
+    "TopKCounter": "aggregates",
+    "SpaceSavingCounter": "aggregates",
+    "EmotionTracker": "aggregates",
+    "RingBuffer": "ring_buffer",
+    "LazyMapping": "lazy_mapping",
+    "AnalyzedText": "analyzed_text",
+    "analyze": "analyzed_text",
+    "Lexicon": "lexicon",
+    "LEXICON": "lexicon"
+}
+
+# زیرماژول‌هایی که به صورت ویژگی بسته در دسترس‌اند
+_SUBMODULES = {
+    "core": "metacognitive_core",
+    "self_awareness": "self_awareness",
+    "cognitive_monitoring": "cognitive_monitoring",
+    "cognitive_control": "cognitive_control",
+    "performance_evaluation": "performance_evaluation",
+    "user_mental_model": "user_mental_model",
+    "snapshot": "snapshot",
+    "english": "metacognitive_english"
+}
+
+__all__ = sorted([*_EXPORTS, *_SUBMODULES])
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(_SUBMODULES[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
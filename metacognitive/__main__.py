@@ -0,0 +1,30 @@
+# ============================================
+# اجرای دموها: python -m metacognitive [نام دمو]
+# ============================================
+
+import argparse
+import importlib
+
+# نام دمو -> (ماژول، تابع)
+DEMOS = {
+    "core": ("metacognitive_core", "main"),
+    "self_awareness": ("self_awareness", "demo"),
+    "cognitive_monitoring": ("cognitive_monitoring", "demo"),
+    "cognitive_control": ("cognitive_control", "demo"),
+    "performance_evaluation": ("performance_evaluation", "demo"),
+    "user_mental_model": ("user_mental_model", "demo"),
+    "english": ("metacognitive_english", "main")
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m metacognitive", description="اجرای دموی ماژول‌های فراشناختی")
+    parser.add_argument("demo", nargs="?", default="core", choices=DEMOS)
+    args = parser.parse_args(argv)
+
+    module, function = DEMOS[args.demo]
+    getattr(importlib.import_module(module), function)()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,103 +2,90 @@
 # بخش ۶: هسته اصلی یکپارچه (Integrated Metacognitive Core)
 # ============================================
 
-# ابتدا کلاس‌های مورد نیاز را تعریف می‌کنیم
-class SelfAwareness:
-    def __init__(self):
-        self.interaction_context = {"topic": ""}
-    
-    def identify_user(self, user_input):
-        return {"user_type": "general", "confidence": 0.8}
-    
-    def check_limitation(self, user_input):
-        return []
-    
-    def update_context(self, user_input):
-        if "هوش" in user_input:
-            self.interaction_context["topic"] = "هوش مصنوعی"
-        else:
-            self.interaction_context["topic"] = "عمومی"
+import copy
+import time
+from collections import deque
+from functools import lru_cache
 
+from aggregates import RunningStats
+from analyzed_text import analyze
+from cognitive_control import CognitiveControl, demands_fast_processing
+from cognitive_monitoring import CognitiveMonitoring
+from event_sinks import ConsoleSink, NullSink
+from interaction_log import InteractionLog
+from lazy_mapping import LazyMapping
+from lexicon import LEXICON
+from performance_evaluation import PerformanceEvaluation
+from result_cache import ResultCache, StateVersions, normalize_input
+from self_awareness import SelfAwareness
+from snapshot import dumps, loads, restore_state, snapshot_state
+from stage_scheduler import Stage, StageScheduler
+from user_mental_model import UserMentalModel
 
-class CognitiveMonitoring:
-    def __init__(self):
-        self.confidence_levels = {"inferential": 0.7}
-    
-    def monitor_thought_process(self, user_input, reasoning_steps):
-        return {"step_count": len(reasoning_steps), "status": "completed"}
-    
-    def assess_confidence(self, confidence_type, level):
-        labels = {0.3: "پایین", 0.7: "متوسط", 0.9: "بالا"}
-        label = labels.get(level, "متوسط")
-        return {"label": label, "value": level}
+# قالب‌های پاسخ شبیه‌سازی شده بر اساس نوع سوال
+RESPONSE_TEMPLATES = {
+    "چیست": "{} یک مفهوم مهم در حوزه مرتبط است که شامل جنبه‌های مختلفی می‌شود.",
+    "چگونه": "برای درک {}، باید مراحل مختلفی را طی کنید که شامل یادگیری اصول پایه و سپس تمرین عملی است.",
+    "چرا": "{} به دلیل اهمیت و کاربردهای گسترده‌ای که دارد، موضوعی ارزشمند برای مطالعه است.",
+    "default": "سوال شما درباره '{}' جالب است. این موضوع شامل جنبه‌های مختلفی است که می‌توان از زوایای متفاوتی به آن نگاه کرد."
+}
 
+RESPONSE_TOPICS = ["هوش مصنوعی", "یادگیری ماشین", "برنامه‌نویسی", "ریاضی"]
+DEFAULT_RESPONSE_TOPIC = "این موضوع"
 
-class CognitiveControl:
-    def __init__(self):
-        self.active_strategies = {"explanation": "مثال‌محور"}
-        self.attention_focus = {"attention_span": "high"}
-        self.processing_mode = "analytical"
-    
-    def regulate_strategy(self, user_input, user_profile):
-        return "توضیح ساختاریافته"
-    
-    def allocate_attention(self, inputs):
-        return {"primary_focus": inputs[0], "attention_level": "high"}
-    
-    def regulate_processing(self, user_input):
-        return "عمیق"
+EXAMPLE_SUFFIX = " برای مثال، می‌توان موردی را در نظر گرفت که نشان‌دهنده کاربرد عملی این مفهوم باشد."
 
+# همه پاسخ‌های ممکن: (نوع سوال، موضوع، راهبرد مثال‌محور) -> پاسخ
+RESPONSE_TABLE = {
+    (question_type, topic, with_example): template.format(topic) + (EXAMPLE_SUFFIX if with_example else "")
+    for question_type, template in RESPONSE_TEMPLATES.items()
+    for topic in RESPONSE_TOPICS + [DEFAULT_RESPONSE_TOPIC]
+    for with_example in (False, True)
+}
 
-class PerformanceEvaluation:
-    def __init__(self):
-        self.improvement_suggestions = []
-    
-    def evaluate_response_quality(self, response, user_input):
-        score = min(0.7 + (len(response) / 1000) * 0.3, 0.95)
-        return {"overall_score": score, "coherence": 0.9}
-    
-    def analyze_consequences(self, response, user_reaction):
-        return {"immediate_effects": "positive", "learning_outcome": "medium"}
+LEXICON.register([question_type for question_type in RESPONSE_TEMPLATES if question_type != "default"])
+LEXICON.register(RESPONSE_TOPICS)
 
 
-class UserMentalModel:
-    def __init__(self):
-        self.user_profile = {
-            "emotional_state": "neutral",
-            "expertise_level": "intermediate"
-        }
-        self.interaction_patterns = {"frequent_topics": {}}
-    
-    def understand_user_goals(self, user_input, context):
-        return {"explicit": "دریافت اطلاعات", "implicit": "یادگیری"}
+@lru_cache(maxsize=1024)
+def _classify_response(question_keywords, topic_keywords):
+    """(نوع سوال، موضوع) پاسخ بر اساس کلیدواژه‌های ورودی"""
+    question_type = "default"
+    for q_type in RESPONSE_TEMPLATES:
+        if q_type in question_keywords:
+            question_type = q_type
+            break
     
-    def detect_emotional_state(self, user_input):
-        emotions = {"چیست": "curious", "چگونه": "interested", "چرا": "questioning"}
-        for key, emotion in emotions.items():
-            if key in user_input:
-                return {"primary_emotion": emotion, "intensity": 0.7}
-        return {"primary_emotion": "neutral", "intensity": 0.5}
+    topic = DEFAULT_RESPONSE_TOPIC
+    for t in RESPONSE_TOPICS:
+        if t in topic_keywords:
+            topic = t
+            break
     
-    def update_user_knowledge_model(self, user_input, response):
-        return {"topics_updated": 1, "new_concepts": []}
-    
-    def predict_future_needs(self, user_input, user_profile):
-        return {"next_questions": [], "related_topics": []}
+    return (question_type, topic)
 
 
-# حالا کلاس اصلی را تعریف می‌کنیم
 class MetacognitiveCore:
-    def __init__(self):
-        print("=" * 60)
-        print("هسته فراشناختی در حال راه‌اندازی...")
-        print("=" * 60)
+    def __init__(self, event_sink=None, executor=None, interaction_log=None, result_cache=None,
+                 latency_budget=None, instrumentation=None, module_options=None, frequency_tracker=None):
+        # رویدادهای هسته به این مقصد فرستاده می‌شوند (پیش‌فرض: بی‌صدا)
+        self.event_sink = event_sink or NullSink()
+        if self.event_sink.enabled:
+            self.event_sink.emit("core_starting")
+        
+        # پارامترهای سازنده هر ماژول، مثلاً {"cognitive_control": {"history_capacities": {...}}}؛
+        # نماهای جلسه هم با همین پارامترها ساخته می‌شوند. frequency_tracker سازنده شمارنده‌های
+        # پرتکرار مدل ذهنی کاربر است (مثلاً lambda: SpaceSavingCounter(capacity=1000))
+        self.module_options = {name: dict(options) for name, options in (module_options or {}).items()}
+        if frequency_tracker is not None:
+            self.module_options.setdefault("user_mental_model", {})["frequency_tracker"] = frequency_tracker
         
         # راه‌اندازی زیرسیستم‌ها
-        self.self_awareness = SelfAwareness()
-        self.cognitive_monitoring = CognitiveMonitoring()
-        self.cognitive_control = CognitiveControl()
-        self.performance_evaluation = PerformanceEvaluation()
-        self.user_mental_model = UserMentalModel()
+        self.self_awareness = self._build_module("self_awareness", SelfAwareness)
+        self.cognitive_monitoring = self._build_module("cognitive_monitoring", CognitiveMonitoring)
+        self.cognitive_control = self._build_module("cognitive_control", CognitiveControl)
+        self.performance_evaluation = self._build_module("performance_evaluation", PerformanceEvaluation)
+        self.user_mental_model = self._build_module("user_mental_model", UserMentalModel)
         
         # حالت‌های سیستمی
         self.system_state = {
@@ -114,55 +101,387 @@ class MetacognitiveCore:
             "metacognitive_level": "high"
         }
         
-        # تاریخچه تعاملات
-        self.interaction_history = []
+        # تاریخچه تعاملات (لاگ فقط-افزودنی روی دیسک؛ پیش‌فرض در پوشه موقت)
+        self.interaction_history = interaction_log if interaction_log is not None else InteractionLog()
+        
+        # آمار تجمعی کیفیت برای بینش‌ها (با هر تعامل به‌روز می‌شود)
+        self.quality_stats = RunningStats()
+        for interaction in self.interaction_history:
+            self.quality_stats.add(interaction["quality_score"])
+        
+        # خط لوله مراحل؛ با executor مراحل مستقل همزمان اجرا می‌شوند
+        self.scheduler = StageScheduler(self._build_pipeline(), executor=executor)
+        
+        # بودجه زمانی پیش‌فرض هر درخواست (ثانیه)؛ با کمبود آن مراحل اختیاری حذف می‌شوند
+        self.latency_budget = latency_budget
+        # تخمین زمان هر مرحله (EWMA زمان‌های اندازه‌گیری شده) برای تصمیم حذف
+        self.stage_latency = {stage.name: RunningStats() for stage in self.scheduler.stages}
+        
+        # ابزارسنجی اختیاری زمان مراحل و متدها (Instrumentation)؛ بدون آن هزینه‌ای ندارد
+        self.instrumentation = None
+        if instrumentation is not None:
+            self.instrument(instrumentation)
+        
+        # memo اختیاری پاسخ‌ها (ResultCache)، نه حافظه نهان کل درخواست؛ ورودی‌ها با
+        # فاصله‌گذاری یکسان‌شده پردازش می‌شوند
+        self.result_cache = result_cache
+        self.state_versions = StateVersions(self._result_dependencies())
+        self._requests_in_flight = 0
         
         # گزارش وضعیت
         self._print_system_status()
     
     def _print_system_status(self):
-        """چاپ وضعیت سیستم"""
-        print("\n✓ هسته فراشناختی با موفقیت راه‌اندازی شد")
-        print(f"✓ تعداد ماژول‌های فعال: {len(self.system_state['active_modules'])}")
-        print(f"✓ سطح فراشناختی: {self.system_state['metacognitive_level']}")
-        print("=" * 60 + "\n")
-    
-    def process_input(self, user_input, context=None):
-        """پردازش ورودی کاربر با استفاده از تمام ماژول‌های فراشناختی"""
-        print(f"\n{'='*40}")
-        print(f"پردازش ورودی جدید: '{user_input[:50]}...'")
-        print(f"{'='*40}")
-        
-        # مرحله ۱: خودآگاهی
-        print("\n[مرحله ۱: خودآگاهی]")
-        user_identity = self.self_awareness.identify_user(user_input)
+        """گزارش وضعیت سیستم به مقصد رویداد"""
+        if self.event_sink.enabled:
+            self.event_sink.emit(
+                "core_initialized",
+                active_modules=len(self.system_state['active_modules']),
+                metacognitive_level=self.system_state['metacognitive_level']
+            )
+    
+    def _build_pipeline(self):
+        """تعریف مراحل پردازش به صورت گراف با منابع خواندنی و نوشتنی هر مرحله"""
+        return [
+            Stage(
+                "self_awareness", self._stage_self_awareness,
+                reads={"input"},
+                writes={"self_awareness", "limitations"}
+            ),
+            Stage(
+                "user_mental_model", self._stage_user_mental_model,
+                reads={"input", "context"},
+                writes={"user_goals", "user_profile.emotional_state", "goals", "emotional_state"}
+            ),
+            Stage(
+                "cognitive_control", self._stage_cognitive_control,
+                reads={"input", "user_profile.expertise"},
+                writes={"cognitive_control", "strategy", "attention", "processing_mode"}
+            ),
+            Stage(
+                "cognitive_monitoring", self._stage_cognitive_monitoring,
+                reads={"input"},
+                writes={"cognitive_monitoring", "thought_process", "confidence"},
+                optional=True
+            ),
+            Stage(
+                "response_generation", self._stage_response_generation,
+                reads={"input", "cognitive_control"},
+                writes={"response"},
+                kind="io",
+                async_func=self._stage_response_generation_async
+            ),
+            Stage(
+                "performance_evaluation", self._stage_performance_evaluation,
+                reads={"input", "response"},
+                writes={"performance_evaluation", "quality"}
+            ),
+            Stage(
+                "consequence_analysis", self._stage_consequence_analysis,
+                reads={"response", "emotional_state"},
+                writes={"performance_evaluation", "consequences"},
+                optional=True
+            ),
+            Stage(
+                "update_learning", self._stage_update_learning,
+                reads={"input", "response", "user_goals"},
+                writes={"user_knowledge", "interaction_patterns", "knowledge_update"}
+            ),
+            Stage(
+                "future_needs", self._stage_future_needs,
+                reads={"input", "user_goals", "user_profile.emotional_state", "user_profile.expertise"},
+                writes={"prediction_engine", "future_predictions"},
+                optional=True
+            )
+        ]
+    
+    def _build_module(self, name, cls):
+        """ساخت یک ماژول با پارامترهای module_options آن"""
+        return cls(**self.module_options.get(name, {}))
+    
+    def instrument(self, instrumentation):
+        """فعال کردن ابزارسنجی برای درخواست‌ها و متدهای ماژول‌های فعلی هسته
+        
+        ماژولی که بعداً با شیء دیگری جایگزین شود باید دوباره instrument شود.
+        """
+        self.instrumentation = instrumentation
+        for name in self.system_state["active_modules"]:
+            instrumentation.instrument(getattr(self, name))
+    
+    def _skip_stage(self, stage, state, completed):
+        """آیا مرحله اختیاری این درخواست حذف شود
+        
+        وقتی خود درخواست پردازش سریع بخواهد (کلیدواژه «فوری»/«سریع» یا زمینه با
+        time="limited") همه مراحل اختیاری حذف می‌شوند؛ processing_mode ذخیره شده که بین
+        درخواست‌ها می‌ماند در این تصمیم اثری ندارد. با بودجه زمانی، مرحله‌ای حذف می‌شود که
+        زمان تخمینی آن به همراه مراحل ضروری باقی‌مانده از بودجه بیشتر باشد.
+        """
+        if state["fast_processing"]:
+            return True
+        
+        budget = state["latency_budget"]
+        if budget is None:
+            return False
+        estimate = self._estimated_latency(stage.name) + sum(
+            self._estimated_latency(other.name)
+            for other in self.scheduler.stages
+            if not other.optional and other.name not in completed
+        )
+        return time.perf_counter() - state["started"] + estimate > budget
+    
+    def _estimated_latency(self, stage_name):
+        return self.stage_latency[stage_name].ewma or 0.0
+    
+    def process_input(self, user_input, context=None, latency_budget=None):
+        """پردازش ورودی کاربر با استفاده از تمام ماژول‌های فراشناختی
+        
+        latency_budget (ثانیه) بودجه پیش‌فرض هسته را برای این درخواست جایگزین می‌کند؛
+        مراحل حذف شده در stage_timing["skipped_stages"] گزارش می‌شوند.
+        """
+        sink = self.event_sink if self.event_sink.enabled else None
+        if sink:
+            sink.emit("input_received", user_input=str(user_input))
+        
+        lookup = self._lookup_result(user_input, context)
+        if lookup:
+            user_input = lookup[0]
+        
+        self._requests_in_flight += 1
+        try:
+            # ورودی فقط یک بار تحلیل می‌شود و همه ماژول‌ها از همان استفاده می‌کنند
+            state = self._initial_state(user_input, context, sink, latency_budget, lookup)
+            state, timing = self.scheduler.run(state, skip=self._skip_stage)
+            result = self._finalize_interaction(state, timing)
+            if lookup:
+                self._store_result(lookup, state)
+        finally:
+            self._requests_in_flight -= 1
+        
+        return result
+    
+    async def process_input_async(self, user_input, context=None, latency_budget=None):
+        """نسخه coroutine پردازش ورودی؛ مرحله تولید پاسخ بدون مسدود کردن حلقه رویداد منتظر می‌ماند"""
+        return await self._process_async(user_input, context, latency_budget)
+    
+    async def _process_async(self, user_input, context=None, latency_budget=None, previous=None):
+        """previous (اختیاری) درخواست قبلی است؛ تعامل پس از پایان آن در تاریخچه ثبت می‌شود"""
+        sink = self.event_sink if self.event_sink.enabled else None
+        if sink:
+            sink.emit("input_received", user_input=str(user_input))
+        
+        lookup = self._lookup_result(user_input, context)
+        if lookup:
+            user_input = lookup[0]
+        
+        self._requests_in_flight += 1
+        try:
+            state = self._initial_state(user_input, context, sink, latency_budget, lookup)
+            if self.scheduler.executor is None and (
+                type(self).generate_response_async is MetacognitiveCore.generate_response_async
+            ):
+                # مولد پیش‌فرض منتظر چیزی نمی‌ماند؛ مراحل بدون ساخت وظیفه برای هر مرحله اجرا می‌شوند
+                state, timing = self.scheduler.run(state, skip=self._skip_stage)
+            else:
+                state, timing = await self.scheduler.run_async(state, skip=self._skip_stage)
+            await self._wait_for(previous)
+            result = self._finalize_interaction(state, timing)
+            if lookup:
+                self._store_result(lookup, state)
+        finally:
+            self._requests_in_flight -= 1
+        
+        return result
+    
+    def _initial_state(self, user_input, context, sink, latency_budget, lookup=None):
+        entry = lookup[2] if lookup else None
+        user_input = analyze(user_input)
+        return {
+            "input": user_input,
+            "context": context,
+            "fast_processing": demands_fast_processing(user_input, context if isinstance(context, dict) else None),
+            "sink": sink,
+            "started": time.perf_counter(),
+            "latency_budget": self.latency_budget if latency_budget is None else latency_budget,
+            # پاسخ ذخیره شده در حافظه نهان؛ مرحله تولید پاسخ به جای تولید دوباره از آن استفاده می‌کند
+            "cached_response": entry.response if entry is not None else None
+        }
+    
+    @staticmethod
+    async def _wait_for(previous):
+        """انتظار برای پایان درخواست قبلی (خطای آن اینجا اثری ندارد)"""
+        if previous is not None:
+            import asyncio
+            
+            await asyncio.wait([previous])
+    
+    async def process_stream(self, turns, max_in_flight=1):
+        """پردازش جریانی از نوبت‌های گفتگو با حداکثر max_in_flight درخواست همزمان
+        
+        هر نوبت یک رشته یا زوج (ورودی، زمینه) است و نتایج و تاریخچه تعامل به همان ترتیب
+        ورودی ثبت می‌شوند. با پیش‌فرض ۱ نتیجه‌ها دقیقاً برابر اجرای پشت سر هم هستند؛ با
+        max_in_flight بیشتر، تولید پاسخ نوبت‌ها همپوشانی دارد ولی مراحل نوبت‌های همزمان
+        وضعیت مشترک ماژول‌ها را به ترتیب اجرایشان (نه ترتیب ورودی) به‌روز می‌کنند. اگر
+        هسته executor دارد، max_in_flight را ۱ نگه دارید تا یک ماژول در چند رشته اجرا نشود.
+        """
+        import asyncio
+        
+        if not hasattr(turns, "__aiter__"):
+            turns = self._iterate_async(turns)
+        
+        pending = deque()
+        try:
+            async for turn in turns:
+                if isinstance(turn, tuple):
+                    user_input, context = turn
+                else:
+                    user_input, context = turn, None
+                previous = pending[-1] if pending else None
+                pending.append(asyncio.ensure_future(self._process_async(user_input, context, previous=previous)))
+                
+                if len(pending) >= max(1, max_in_flight):
+                    yield await pending.popleft()
+            
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def _result_dependencies(self):
+        """بخش‌هایی از وضعیت ماژول‌ها که پاسخ تولید شده به آن‌ها وابسته است (تابع خواندن هر بخش)
+        
+        پاسخ با ورودی، زمینه و مقدار این بخش‌ها در شروع درخواست تعیین می‌شود. اگر
+        generate_response_async بازنویسی شود و وضعیت بیشتری بخواند، این فهرست هم باید گسترش یابد.
+        """
+        return {
+            "explanation_strategy": lambda: self.cognitive_control.active_strategies.get("explanation")
+        }
+    
+    def _lookup_result(self, user_input, context):
+        """جستجو در حافظه نهان پاسخ‌ها: (ورودی یکسان‌شده، کلید، مدخل یا None)
+        
+        اگر حافظه نهان غیرفعال یا زمینه قابل استفاده در کلید نباشد None برمی‌گرداند.
+        """
+        if self.result_cache is None:
+            return None
+        text = normalize_input(user_input)
+        key = self.result_cache.make_key(text, context, self.state_versions.current())
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return text, key, self.result_cache.get(key)
+    
+    def _store_result(self, lookup, state):
+        """ذخیره پاسخ تولید شده برای درخواست‌های بعدی با همان کلید"""
+        # پاسخ درخواستی که همزمان با درخواست دیگری اجرا شده ممکن است به وضعیت تغییر یافته
+        # آن وابسته باشد و ذخیره نمی‌شود
+        if self._requests_in_flight != 1 or state["cached_response"] is not None:
+            return
+        # فقط متن پاسخ ذخیره می‌شود، نه ویژگی‌های محاسبه شده AnalyzedText
+        self.result_cache.put(lookup[1], str(state["response"]))
+    
+    async def _iterate_async(self, turns):
+        """تبدیل یک iterable معمولی به iterable ناهمگام"""
+        for turn in turns:
+            yield turn
+    
+    async def generate_response_async(self, user_input):
+        """تولید ناهمگام پاسخ؛ برای اتصال به مولد واقعی (مثلاً سرویس بیرونی) بازنویسی شود"""
+        return self._generate_simulated_response(user_input)
+    
+    def _finalize_interaction(self, state, timing):
+        """ذخیره تعامل و ساخت نتیجه نهایی پس از اجرای همه مراحل"""
+        user_input = state["input"]
+        simulated_response = state["response"]
+        quality = state["quality"]
+        
+        # ذخیره تعامل در تاریخچه
+        interaction_record = {
+            "input": str(user_input),
+            "response": str(simulated_response),
+            "goals": state["goals"],
+            "emotional_state": state["emotional_state"],
+            "quality_score": quality['overall_score'],
+            "timestamp": "زمان شبیه‌سازی شده"
+        }
+        self.interaction_history.append(interaction_record)
+        self.quality_stats.add(interaction_record["quality_score"])
+        state["interaction_record"] = interaction_record
+        if state["cached_response"] is not None:
+            timing["cache_hit"] = True
+        for name, duration in timing["stage_durations"].items():
+            # زمان پاسخ از حافظه نهان در تخمین زمان تولید پاسخ شمرده نمی‌شود
+            if name != "response_generation" or "cache_hit" not in timing:
+                self.stage_latency[name].add(duration)
+        if self.instrumentation is not None:
+            self.instrumentation.observe_request(timing)
+        
+        if state["sink"]:
+            state["sink"].emit("request_completed", **timing)
+        
+        # تولید گزارش نهایی
+        final_report = self._generate_metacognitive_report(
+            user_input,
+            simulated_response,
+            quality,
+            state.get("consequences")
+        )
+        
+        return {
+            "response": str(simulated_response),
+            "metacognitive_report": final_report,
+            "user_understood": True,
+            "system_aware": True,
+            "stage_timing": timing
+        }
+    
+    def _stage_self_awareness(self, state):
+        """مرحله ۱: خودآگاهی"""
+        user_input = state["input"]
+        self.self_awareness.identify_user(user_input)
         limitations = self.self_awareness.check_limitation(user_input)
         self.self_awareness.update_context(user_input)
         
-        if limitations:
-            print(f"   محدودیت‌های شناسایی شده: {limitations}")
+        if state["sink"]:
+            state["sink"].emit("stage_completed", stage=1, name="self_awareness", limitations=limitations)
         
-        # مرحله ۲: مدل ذهنی کاربر
-        print("\n[مرحله ۲: مدل ذهنی کاربر]")
-        user_goals = self.user_mental_model.understand_user_goals(user_input, context or {})
+        return {"limitations": limitations}
+    
+    def _stage_user_mental_model(self, state):
+        """مرحله ۲: مدل ذهنی کاربر"""
+        user_input = state["input"]
+        user_goals = self.user_mental_model.understand_user_goals(user_input, state["context"] or {})
         emotional_state = self.user_mental_model.detect_emotional_state(user_input)
-        print(f"   اهداف کاربر: {user_goals['explicit']}")
-        print(f"   وضعیت عاطفی: {emotional_state['primary_emotion']}")
         
-        # مرحله ۳: کنترل شناختی
-        print("\n[مرحله ۳: کنترل شناختی]")
+        if state["sink"]:
+            state["sink"].emit(
+                "stage_completed", stage=2, name="user_mental_model",
+                goals=user_goals['explicit'], emotion=emotional_state['primary_emotion']
+            )
+        
+        return {"goals": user_goals, "emotional_state": emotional_state}
+    
+    def _stage_cognitive_control(self, state):
+        """مرحله ۳: کنترل شناختی"""
+        user_input = state["input"]
         strategy = self.cognitive_control.regulate_strategy(
             user_input, 
             self.user_mental_model.user_profile
         )
         attention = self.cognitive_control.allocate_attention([user_input])
         processing_mode = self.cognitive_control.regulate_processing(user_input)
-        print(f"   راهبرد انتخاب شده: {strategy}")
-        print(f"   تمرکز: {attention['primary_focus']}")
-        print(f"   حالت پردازش: {processing_mode}")
         
-        # مرحله ۴: نظارت بر شناخت (در حین تولید پاسخ)
-        print("\n[مرحله ۴: نظارت بر شناخت]")
+        if state["sink"]:
+            state["sink"].emit(
+                "stage_completed", stage=3, name="cognitive_control",
+                strategy=strategy, focus=attention['primary_focus'], processing_mode=processing_mode
+            )
+        
+        return {"strategy": strategy, "attention": attention, "processing_mode": processing_mode}
+    
+    def _stage_cognitive_monitoring(self, state):
+        """مرحله ۴: نظارت بر شناخت (در حین تولید پاسخ)"""
         reasoning_steps = [
             "تحلیل درخواست کاربر",
             "جستجوی دانش مرتبط",
@@ -170,149 +489,199 @@ class MetacognitiveCore:
             "طراحی پاسخ"
         ]
         thought_process = self.cognitive_monitoring.monitor_thought_process(
-            user_input, 
+            state["input"], 
             reasoning_steps
         )
         confidence = self.cognitive_monitoring.assess_confidence(
             "inferential", 
             0.7
         )
-        print(f"   مراحل استدلال: {thought_process['step_count']}")
-        print(f"   سطح اطمینان: {confidence['label']}")
         
-        # مرحله ۵: تولید پاسخ شبیه‌سازی شده
-        print("\n[مرحله ۵: تولید پاسخ]")
-        simulated_response = self._generate_simulated_response(user_input)
-        print(f"   پاسخ تولید شده: '{simulated_response[:80]}...'")
+        if state["sink"]:
+            state["sink"].emit(
+                "stage_completed", stage=4, name="cognitive_monitoring",
+                step_count=thought_process['step_count'], confidence=confidence['label']
+            )
+        
+        return {"thought_process": thought_process, "confidence": confidence}
+    
+    def _stage_response_generation(self, state):
+        """مرحله ۵: تولید پاسخ شبیه‌سازی شده (یا پاسخ حافظه نهان)"""
+        simulated_response = state["cached_response"]
+        if simulated_response is None:
+            simulated_response = self._generate_simulated_response(state["input"])
+        simulated_response = analyze(simulated_response)
+        
+        if state["sink"]:
+            state["sink"].emit("stage_completed", stage=5, name="response_generation", response=str(simulated_response))
+        
+        return {"response": simulated_response}
+    
+    async def _stage_response_generation_async(self, state):
+        """مرحله ۵ (ناهمگام): تولید پاسخ از طریق generate_response_async (یا پاسخ حافظه نهان)"""
+        simulated_response = state["cached_response"]
+        if simulated_response is None:
+            simulated_response = await self.generate_response_async(state["input"])
+        simulated_response = analyze(simulated_response)
+        
+        if state["sink"]:
+            state["sink"].emit("stage_completed", stage=5, name="response_generation", response=str(simulated_response))
         
-        # مرحله ۶: ارزیابی عملکرد
-        print("\n[مرحله ۶: ارزیابی عملکرد]")
+        return {"response": simulated_response}
+    
+    def _stage_performance_evaluation(self, state):
+        """مرحله ۶: ارزیابی عملکرد"""
+        simulated_response = state["response"]
         quality = self.performance_evaluation.evaluate_response_quality(
             simulated_response, 
-            user_input
+            state["input"]
         )
+        
+        if state["sink"]:
+            state["sink"].emit(
+                "stage_completed", stage=6, name="performance_evaluation",
+                quality_score=quality['overall_score']
+            )
+        
+        return {"quality": quality}
+    
+    def _stage_consequence_analysis(self, state):
+        """مرحله ۶ (اختیاری): تحلیل پیامدهای پاسخ"""
         consequences = self.performance_evaluation.analyze_consequences(
-            simulated_response,
-            user_reaction=emotional_state['primary_emotion']
+            state["response"],
+            user_reaction=state["emotional_state"]['primary_emotion']
         )
-        print(f"   کیفیت پاسخ: {quality['overall_score']:.2f}")
-        print(f"   اثرات فوری: {consequences['immediate_effects']}")
         
-        # مرحله ۷: به‌روزرسانی و یادگیری
-        print("\n[مرحله ۷: به‌روزرسانی و یادگیری]")
+        if state["sink"]:
+            state["sink"].emit(
+                "stage_completed", stage=6, name="consequence_analysis",
+                immediate_effects=consequences['immediate_effects']
+            )
+        
+        return {"consequences": consequences}
+    
+    def _stage_update_learning(self, state):
+        """مرحله ۷: به‌روزرسانی و یادگیری"""
+        user_input = state["input"]
         knowledge_update = self.user_mental_model.update_user_knowledge_model(
             user_input,
-            simulated_response
+            state["response"]
         )
+        
+        if state["sink"]:
+            state["sink"].emit(
+                "stage_completed", stage=7, name="update_learning",
+                topics_updated=knowledge_update['topics_updated']
+            )
+        
+        return {"knowledge_update": knowledge_update}
+    
+    def _stage_future_needs(self, state):
+        """مرحله ۷ (اختیاری): پیش‌بینی نیازهای آینده کاربر"""
         future_predictions = self.user_mental_model.predict_future_needs(
-            user_input,
+            state["input"],
             self.user_mental_model.user_profile
         )
-        print(f"   موضوعات جدید: {knowledge_update['topics_updated']}")
-        print(f"   سوالات پیش‌بینی شده: {len(future_predictions['next_questions'])}")
         
-        # ذخیره تعامل در تاریخچه
-        interaction_record = {
-            "input": user_input,
-            "response": simulated_response,
-            "goals": user_goals,
-            "emotional_state": emotional_state,
-            "quality_score": quality['overall_score'],
-            "timestamp": "زمان شبیه‌سازی شده"
-        }
-        self.interaction_history.append(interaction_record)
+        if state["sink"]:
+            state["sink"].emit(
+                "stage_completed", stage=7, name="future_needs",
+                predicted_questions=len(future_predictions['next_questions'])
+            )
         
-        # تولید گزارش نهایی
-        final_report = self._generate_metacognitive_report(
-            user_input,
-            simulated_response,
-            quality,
-            consequences
-        )
-        
-        return {
-            "response": simulated_response,
-            "metacognitive_report": final_report,
-            "user_understood": True,
-            "system_aware": True
-        }
+        return {"future_predictions": future_predictions}
     
     def _generate_simulated_response(self, user_input):
-        """تولید پاسخ شبیه‌سازی شده"""
-        response_templates = {
-            "چیست": "{} یک مفهوم مهم در حوزه مرتبط است که شامل جنبه‌های مختلفی می‌شود.",
-            "چگونه": "برای درک {}، باید مراحل مختلفی را طی کنید که شامل یادگیری اصول پایه و سپس تمرین عملی است.",
-            "چرا": "{} به دلیل اهمیت و کاربردهای گسترده‌ای که دارد، موضوعی ارزشمند برای مطالعه است.",
-            "default": "سوال شما درباره '{}' جالب است. این موضوع شامل جنبه‌های مختلفی است که می‌توان از زوایای متفاوتی به آن نگاه کرد."
-        }
-        
-        question_type = "default"
-        for q_type in response_templates:
-            if q_type in user_input.lower():
-                question_type = q_type
-                break
-        
-        topic = "این موضوع"
-        common_topics = ["هوش مصنوعی", "یادگیری ماشین", "برنامه‌نویسی", "ریاضی"]
-        for t in common_topics:
-            if t in user_input:
-                topic = t
-                break
-        
-        response = response_templates[question_type].format(topic)
+        """تولید پاسخ شبیه‌سازی شده (یک دسته‌بندی و یک جستجو در جدول پاسخ‌ها)"""
+        user_input = analyze(user_input)
+        # دسته‌بندی فقط به کلیدواژه‌های یافت‌شده بستگی دارد و برای هر مجموعه یک بار انجام می‌شود
+        response_key = _classify_response(user_input.normalized_keywords, user_input.keywords)
         
-        if self.cognitive_control.active_strategies.get("explanation") == "مثال‌محور":
-            response += " برای مثال، می‌توان موردی را در نظر گرفت که نشان‌دهنده کاربرد عملی این مفهوم باشد."
-        
-        return response
+        # راهبرد توضیح هر بار خوانده می‌شود، پس تغییر active_strategies بلافاصله اعمال می‌شود
+        with_example = self.cognitive_control.active_strategies.get("explanation") == "مثال‌محور"
+        return RESPONSE_TABLE[response_key + (with_example,)]
     
     def _generate_metacognitive_report(self, user_input, response, quality, consequences):
-        """تولید گزارش فراشناختی"""
-        report = {
-            "input_analysis": {
+        """تولید گزارش فراشناختی؛ هر بخش فقط در اولین دسترسی ساخته می‌شود"""
+        # مقادیری از وضعیت که تعامل‌های بعدی تغییرشان می‌دهند همین حالا گرفته می‌شوند
+        topic = self.self_awareness.interaction_context["topic"]
+        user_profile = self.user_mental_model.user_profile
+        emotional_state = user_profile["emotional_state"]
+        expertise_level = user_profile["expertise_level"]
+        confidence = self.cognitive_monitoring.confidence_levels
+        attention_level = self.cognitive_control.attention_focus["attention_span"]
+        processing_mode = self.cognitive_control.processing_mode
+        # فهرست پیشنهادها فقط افزوده می‌شود؛ طول فعلی برای برش بعدی کافی است
+        suggestions = self.performance_evaluation.improvement_suggestions
+        suggestion_count = len(suggestions)
+        
+        return LazyMapping({
+            "input_analysis": lambda: {
                 "length": len(user_input),
                 "contains_question": "؟" in user_input or "?" in user_input,
-                "topic_detected": self.self_awareness.interaction_context["topic"]
+                "topic_detected": topic
             },
-            "response_analysis": {
+            "response_analysis": lambda: {
                 "length": len(response),
-                "word_count": len(response.split()),
+                "word_count": analyze(response).word_count,
                 "quality_score": quality["overall_score"]
             },
-            "user_model_snapshot": {
-                "emotional_state": self.user_mental_model.user_profile["emotional_state"],
-                "expertise_level": self.user_mental_model.user_profile["expertise_level"]
+            "user_model_snapshot": lambda: {
+                "emotional_state": emotional_state,
+                "expertise_level": expertise_level
             },
-            "system_self_assessment": {
-                "confidence": self.cognitive_monitoring.confidence_levels,
-                "attention_level": self.cognitive_control.attention_focus["attention_span"],
-                "processing_mode": self.cognitive_control.processing_mode
+            "system_self_assessment": lambda: {
+                "confidence": confidence,
+                "attention_level": attention_level,
+                "processing_mode": processing_mode
             },
-            "improvement_suggestions": self.performance_evaluation.improvement_suggestions[-3:] if self.performance_evaluation.improvement_suggestions else []
-        }
+            "improvement_suggestions": lambda: suggestions[max(suggestion_count - 3, 0):suggestion_count]
+        })
+    
+    def new_session_view(self):
+        """ساخت نمای یک جلسه
         
-        return report
+        همه ماژول‌ها، تاریخچه، آمار و حافظه نهان نما تازه‌اند، پس وضعیت هیچ جلسه‌ای به
+        جلسه دیگر نشت نمی‌کند؛ فقط مقصد رویداد، executor، بودجه زمانی و ابزارسنجی با این
+        هسته مشترک است.
+        """
+        view = copy.copy(self)
+        view.system_state = copy.deepcopy(self.system_state)
+        for name in self.system_state["active_modules"]:
+            setattr(view, name, self._build_module(name, type(getattr(self, name))))
+        view.interaction_history = InteractionLog(segment_bytes=self.interaction_history.segment_bytes)
+        view.quality_stats = RunningStats(self.quality_stats.ewma_alpha)
+        view.stage_latency = {name: RunningStats() for name in self.stage_latency}
+        view.state_versions = StateVersions(view._result_dependencies())
+        view._requests_in_flight = 0
+        if self.result_cache is not None:
+            view.result_cache = ResultCache(self.result_cache.max_entries, self.result_cache.max_bytes)
+        view.scheduler = StageScheduler(view._build_pipeline(), executor=self.scheduler.executor)
+        return view
+    
+    def snapshot(self, compress=True):
+        """ذخیره وضعیت کامل هسته و ماژول‌ها در قالب دودویی فشرده"""
+        return dumps(snapshot_state(self), compress=compress)
+    
+    def restore(self, data):
+        """بازیابی وضعیت از snapshot؛ تاریخچه‌های ماژول‌ها تا اولین دسترسی رمزگشایی نمی‌شوند"""
+        return restore_state(self, loads(data))
     
     def get_system_insights(self):
-        """دریافت بینش‌های سیستمی"""
+        """دریافت بینش‌های سیستمی (از آمار تجمعی؛ هزینه مستقل از طول تاریخچه)"""
         insights = {
             "total_interactions": len(self.interaction_history),
             "average_quality_score": 0,
             "user_engagement": "medium",
             "common_topics": [],
-            "system_improvements": self.performance_evaluation.improvement_suggestions[:5] if self.performance_evaluation.improvement_suggestions else []
+            "system_improvements": self.performance_evaluation.improvement_suggestions[:5] if self.performance_evaluation.improvement_suggestions else [],
+            "quality_stats": self.quality_stats.summary()
         }
         
-        if self.interaction_history:
-            total_score = sum(interaction["quality_score"] for interaction in self.interaction_history)
-            insights["average_quality_score"] = total_score / len(self.interaction_history)
+        if self.quality_stats.count:
+            insights["average_quality_score"] = self.quality_stats.mean
         
-        if self.user_mental_model.interaction_patterns["frequent_topics"]:
-            insights["common_topics"] = sorted(
-                self.user_mental_model.interaction_patterns["frequent_topics"].items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:3]
+        insights["common_topics"] = self.user_mental_model.interaction_patterns["frequent_topics"].most_common(3)
         
         return insights
     
@@ -365,13 +734,14 @@ class MetacognitiveCore:
 
 
 # تست هسته اصلی یکپارچه
-if __name__ == "__main__":
+def main():
+    """تست نهایی هسته و دموی تعاملی اختیاری"""
     print("=" * 60)
     print("تست نهایی: هسته فراشناختی یکپارچه")
     print("=" * 60)
     
     # راه‌اندازی هسته
-    metacognitive_core = MetacognitiveCore()
+    metacognitive_core = MetacognitiveCore(event_sink=ConsoleSink())
     
     # تست پردازش یک ورودی نمونه
     test_input = "هوش مصنوعی چیست و چگونه کار می‌کند؟"
@@ -402,4 +772,8 @@ if __name__ == "__main__":
         metacognitive_core.run_demo()
     else:
         print("\nپایان تست هسته فراشناختی.")
-        print("سیستم آماده ادغام با مدل زبانی اصلی است.")
\ No newline at end of file
+        print("سیستم آماده ادغام با مدل زبانی اصلی است.")
+
+
+if __name__ == "__main__":
+    main()
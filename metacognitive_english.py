@@ -1272,7 +1272,8 @@ class MetacognitiveCore:
 # Main Execution
 # ============================================
 
-if __name__ == "__main__":
+def main():
+    """Final test of the core and the optional interactive demo"""
     print("=" * 60)
     print("Final Test: Integrated Metacognitive Core")
     print("=" * 60)
@@ -1305,4 +1306,8 @@ if __name__ == "__main__":
         metacognitive_core.run_demo()
     else:
         print("\nMetacognitive core test completed.")
-        print("System ready for integration with main language model.")
\ No newline at end of file
+        print("System ready for integration with main language model.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,32 +2,210 @@
 # بخش ۴: ارزیابی عملکرد (Performance Evaluation)
 # ============================================
 
+from functools import lru_cache
+
+from analyzed_text import analyze
+from lexicon import LEXICON
+from ring_buffer import RingBuffer
+
+# نشانه‌های دقت بالا و افزایش امتیاز هر کدام
+ACCURACY_INDICATORS = [
+    ("طبق تحقیقات", 0.2),
+    ("مطالعات نشان می‌دهد", 0.15),
+    ("به طور علمی ثابت شده", 0.2),
+    ("آمار نشان می‌دهد", 0.15)
+]
+
+# نشانه‌های عدم دقت
+INACCURACY_INDICATORS = [
+    "شاید",
+    "احتمالاً",
+    "فکر می‌کنم",
+    "به نظرم"
+]
+
+# نشانه‌های انسجام
+COHERENCE_INDICATORS = [
+    ("اول", 0.05),
+    ("سپس", 0.05),
+    ("بنابراین", 0.1),
+    ("در نتیجه", 0.1),
+    ("به طور خلاصه", 0.05)
+]
+
+# عناصر مختلف یک پاسخ کامل
+RESPONSE_ELEMENTS = {
+    "تعریف": 0.1,
+    "توضیح": 0.2,
+    "مثال": 0.15,
+    "نتیجه‌گیری": 0.1,
+    "ارجاع": 0.05
+}
+
+# نشانه‌های پاسخ مستقیم به سوال (ارزیابی ارتباط)
+DIRECT_ANSWER_INDICATORS = ["پاسخ", "جواب", "بنابراین"]
+
+# نشانه‌های تحلیل پیامدها
+SATISFACTION_INDICATORS = ["متشکرم", "ممنون"]
+KNOWLEDGE_LIMIT_INDICATOR = "نمی‌دانم"
+AMBIGUOUS_TERMS = ["شاید", "احتمالاً", "ممکن است"]
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """numpy در اولین ارزیابی دسته‌ای بارگذاری می‌شود تا import این ماژول سبک بماند
+    
+    numpy اختیاری است؛ بدون آن امتیازدهی دسته‌ای به صورت حلقه انجام می‌شود.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def accuracy_score(found):
+    """امتیاز دقت از کلیدواژه‌های موجود در پاسخ"""
+    score = 0.5  # امتیاز پایه
+    
+    # نشانه‌های دقت بالا
+    for indicator, boost in ACCURACY_INDICATORS:
+        if indicator in found:
+            score += boost
+    
+    # نشانه‌های عدم دقت
+    for indicator in INACCURACY_INDICATORS:
+        if indicator in found:
+            score -= 0.05
+    
+    return max(0.1, min(1.0, score))
+
+
+def relevance_score(query, keyword_matches, direct_answer):
+    """امتیاز ارتباط از تعداد کلمات پرسش یافته شده در پاسخ"""
+    score = keyword_matches / max(1, len(query.token_set))
+    
+    # افزایش امتیاز برای پاسخ مستقیم به سوال
+    if "؟" in query or "?" in query:
+        if direct_answer:
+            score = min(1.0, score + 0.2)
+    
+    return score
+
+
+def coherence_score(found, avg_sentence_length):
+    """امتیاز انسجام از کلیدواژه‌ها و میانگین طول جمله‌ها"""
+    score = 0.5
+    for indicator, boost in COHERENCE_INDICATORS:
+        if indicator in found:
+            score += boost
+    
+    # جملات خیلی طولانی انسجام را کاهش می‌دهند
+    if avg_sentence_length > 25:
+        score -= 0.1
+    elif avg_sentence_length < 10:
+        score -= 0.05
+    
+    return max(0.1, min(1.0, score))
+
+
+def completeness_score(found, word_count):
+    """امتیاز کامل بودن از عناصر پاسخ و تعداد کلمات"""
+    score = 0.5
+    for element, value in RESPONSE_ELEMENTS.items():
+        if element in found:
+            score += value
+    
+    # پاسخ‌های خیلی کوتاه ممکن است ناقص باشند
+    if word_count < 20:
+        score -= 0.2
+    elif word_count > 100:
+        score += 0.1
+    
+    return max(0.1, min(1.0, score))
+
+
+def timeliness_score(context, word_count):
+    """امتیاز به‌موقع بودن؛ word_count تابعی است که فقط برای درخواست فوری فراخوانی می‌شود"""
+    score = 0.5
+    
+    if context:
+        if context.get("urgency") == "high":
+            # برای درخواست‌های فوری، پاسخ‌های کوتاه‌تر مناسب‌ترند
+            if word_count() < 50:
+                score += 0.2
+            else:
+                score -= 0.1
+    
+    return max(0.1, min(1.0, score))
+
+
+def consequence_analysis(contains, user_reaction=None, follow_up_questions=None):
+    """تحلیل پیامدها؛ contains(term) وجود یک عبارت در پاسخ را مشخص می‌کند"""
+    analysis = {
+        "immediate_effects": [],
+        "potential_misunderstandings": [],
+        "learning_opportunities": []
+    }
+    
+    # تحلیل اثرات فوری
+    if any(contains(indicator) for indicator in SATISFACTION_INDICATORS):
+        analysis["immediate_effects"].append("رضایت کاربر")
+    
+    if contains(KNOWLEDGE_LIMIT_INDICATOR):
+        analysis["immediate_effects"].append("افشای محدودیت دانش")
+    
+    # تحلیل سوءتفاهم‌های احتمالی
+    for term in AMBIGUOUS_TERMS:
+        if contains(term):
+            analysis["potential_misunderstandings"].append(f"ابهام در استفاده از '{term}'")
+    
+    # شناسایی فرصت‌های یادگیری
+    if follow_up_questions and len(follow_up_questions) > 0:
+        analysis["learning_opportunities"].append("نیاز به دانش عمیق‌تر")
+    
+    if user_reaction == "confused":
+        analysis["learning_opportunities"].append("نیاز به شفاف‌سازی بیشتر")
+    
+    return analysis
+
+
+LEXICON.register([indicator for indicator, _ in ACCURACY_INDICATORS])
+LEXICON.register(INACCURACY_INDICATORS)
+LEXICON.register([indicator for indicator, _ in COHERENCE_INDICATORS])
+LEXICON.register(RESPONSE_ELEMENTS)
+
+# ظرفیت پیش‌فرض تاریخچه‌ها (قابل تغییر از طریق history_capacities)
+HISTORY_CAPACITIES = {
+    "consequence_log": 100,
+    "feedback_history": 100,
+    "performance_trend": 20
+}
+
+
 class PerformanceEvaluation:
-    def __init__(self):
+    def __init__(self, history_capacities=None):
+        capacities = {**HISTORY_CAPACITIES, **(history_capacities or {})}
         self.quality_metrics = {
             "accuracy": 0.0,
             "relevance": 0.0,
             "coherence": 0.0,
             "completeness": 0.0
         }
-        self.consequence_log = []
-        self.feedback_history = []
+        self.consequence_log = RingBuffer(capacities["consequence_log"])
+        self.feedback_history = RingBuffer(capacities["feedback_history"])
         self.improvement_suggestions = []
-        self.performance_trend = []
+        self.performance_trend = RingBuffer(capacities["performance_trend"])
     
     def evaluate_response_quality(self, response, query, context=None):
         """ارزیابی کیفیت پاسخ"""
-        evaluation = {
-            "accuracy": self._assess_accuracy(response, query),
-            "relevance": self._assess_relevance(response, query),
-            "coherence": self._assess_coherence(response),
-            "completeness": self._assess_completeness(response, query),
-            "timeliness": self._assess_timeliness(response, context)
-        }
-        
-        # محاسبه امتیاز کلی
-        overall_score = sum(evaluation.values()) / len(evaluation)
-        evaluation["overall_score"] = overall_score
+        evaluation = self._score_response(response, query, context)
+        self.record_evaluation(evaluation, query)
+        return evaluation
+    
+    def record_evaluation(self, evaluation, query):
+        """ثبت یک ارزیابی در متریک‌ها و روند عملکرد (مثلاً نتیجه ارزیابی افزایشی پاسخ جریانی)"""
+        overall_score = evaluation["overall_score"]
         
         # به‌روزرسانی متریک‌ها
         for metric in self.quality_metrics:
@@ -42,177 +220,227 @@ class PerformanceEvaluation:
             "timestamp": "زمان شبیه‌سازی شده"
         }
         self.performance_trend.append(performance_record)
+    
+    def _score_response(self, response, query, context=None):
+        """محاسبه امتیازهای یک پاسخ بدون تغییر وضعیت"""
+        response = analyze(response)
+        query = analyze(query)
+        evaluation = {
+            "accuracy": self._assess_accuracy(response, query),
+            "relevance": self._assess_relevance(response, query),
+            "coherence": self._assess_coherence(response),
+            "completeness": self._assess_completeness(response, query),
+            "timeliness": self._assess_timeliness(response, context)
+        }
         
-        # حفظ اندازه معقول تاریخچه
-        if len(self.performance_trend) > 20:
-            self.performance_trend = self.performance_trend[-20:]
+        # محاسبه امتیاز کلی
+        overall_score = sum(evaluation.values()) / len(evaluation)
+        evaluation["overall_score"] = overall_score
         
         return evaluation
     
-    def _assess_accuracy(self, response, query):
-        """ارزیابی دقت"""
-        accuracy_score = 0.5  # امتیاز پایه
-        
-        # نشانه‌های دقت بالا
-        accuracy_indicators = [
-            ("طبق تحقیقات", 0.2),
-            ("مطالعات نشان می‌دهد", 0.15),
-            ("به طور علمی ثابت شده", 0.2),
-            ("آمار نشان می‌دهد", 0.15)
-        ]
+    def evaluate_many(self, responses, queries, contexts=None):
+        """ارزیابی دسته‌ای کیفیت پاسخ‌ها با همان نتایج evaluate_response_quality برای هر مورد"""
+        responses = [analyze(response) for response in responses]
+        queries = [analyze(query) for query in queries]
+        contexts = list(contexts) if contexts is not None else [None] * len(responses)
+        
+        if not (len(responses) == len(queries) == len(contexts)):
+            raise ValueError("تعداد پاسخ‌ها، پرسش‌ها و زمینه‌ها باید برابر باشد")
+        
+        if not responses:
+            return []
+        
+        if _numpy() is None:
+            evaluations = [
+                self._score_response(response, query, context)
+                for response, query, context in zip(responses, queries, contexts)
+            ]
+        else:
+            features = self._extract_batch_features(responses, queries, contexts)
+            evaluations = self._score_batch(features)
         
-        for indicator, boost in accuracy_indicators:
-            if indicator in response:
-                accuracy_score += boost
+        # به‌روزرسانی متریک‌ها و روند عملکرد در یک مرحله
+        for metric in self.quality_metrics:
+            value = self.quality_metrics[metric]
+            for evaluation in evaluations:
+                # میانگین متحرک (به همان ترتیب مسیر تکی)
+                value = (value + evaluation[metric]) / 2
+            self.quality_metrics[metric] = value
+        
+        # فقط رکوردهایی ساخته می‌شوند که در ظرفیت روند عملکرد باقی می‌مانند
+        kept = self.performance_trend.capacity
+        self.performance_trend.extend(
+            {
+                "query": query[:50],
+                "overall_score": evaluation["overall_score"],
+                "timestamp": "زمان شبیه‌سازی شده"
+            }
+            for query, evaluation in zip(queries[-kept:], evaluations[-kept:])
+        )
+        
+        return evaluations
+    
+    def _extract_batch_features(self, responses, queries, contexts):
+        """استخراج ویژگی‌های دسته‌ای پاسخ‌ها به صورت آرایه"""
+        np = _numpy()
+        keyword_columns = (
+            [indicator for indicator, _ in ACCURACY_INDICATORS]
+            + INACCURACY_INDICATORS
+            + [indicator for indicator, _ in COHERENCE_INDICATORS]
+            + list(RESPONSE_ELEMENTS)
+        )
+        presence = np.array(
+            [[keyword in response.keywords for keyword in keyword_columns] for response in responses],
+            dtype=np.float64
+        ).reshape(len(responses), len(keyword_columns))
+        
+        sentence_lengths = []
+        for response in responses:
+            counts = response.sentence_word_counts
+            sentence_lengths.append(sum(counts) / max(1, len(counts)))
         
-        # نشانه‌های عدم دقت
-        inaccuracy_indicators = [
-            "شاید",
-            "احتمالاً",
-            "فکر می‌کنم",
-            "به نظرم"
+        return {
+            "presence": presence,
+            "relevance": np.array(
+                [self._assess_relevance(response, query) for response, query in zip(responses, queries)],
+                dtype=np.float64
+            ),
+            "avg_sentence_length": np.array(sentence_lengths, dtype=np.float64),
+            "word_count": np.array([response.word_count for response in responses], dtype=np.int64),
+            "urgent": np.array(
+                [bool(context) and context.get("urgency") == "high" for context in contexts],
+                dtype=bool
+            )
+        }
+    
+    def _score_batch(self, features):
+        """امتیازدهی برداری ویژگی‌ها (جمع‌ها به همان ترتیب مسیر تکی انجام می‌شوند)"""
+        np = _numpy()
+        presence = features["presence"]
+        column = 0
+        
+        accuracy = np.full(len(presence), 0.5)
+        for _, boost in ACCURACY_INDICATORS:
+            accuracy = accuracy + presence[:, column] * boost
+            column += 1
+        for _ in INACCURACY_INDICATORS:
+            accuracy = accuracy - presence[:, column] * 0.05
+            column += 1
+        accuracy = np.maximum(0.1, np.minimum(1.0, accuracy))
+        
+        coherence = np.full(len(presence), 0.5)
+        for _, boost in COHERENCE_INDICATORS:
+            coherence = coherence + presence[:, column] * boost
+            column += 1
+        avg_sentence_length = features["avg_sentence_length"]
+        coherence = np.where(
+            avg_sentence_length > 25,
+            coherence - 0.1,
+            np.where(avg_sentence_length < 10, coherence - 0.05, coherence)
+        )
+        coherence = np.maximum(0.1, np.minimum(1.0, coherence))
+        
+        completeness = np.full(len(presence), 0.5)
+        for value in RESPONSE_ELEMENTS.values():
+            completeness = completeness + presence[:, column] * value
+            column += 1
+        word_count = features["word_count"]
+        completeness = np.where(
+            word_count < 20,
+            completeness - 0.2,
+            np.where(word_count > 100, completeness + 0.1, completeness)
+        )
+        completeness = np.maximum(0.1, np.minimum(1.0, completeness))
+        
+        timeliness = np.full(len(presence), 0.5)
+        timeliness = np.where(
+            features["urgent"],
+            np.where(word_count < 50, timeliness + 0.2, timeliness - 0.1),
+            timeliness
+        )
+        timeliness = np.maximum(0.1, np.minimum(1.0, timeliness))
+        
+        relevance = features["relevance"]
+        overall_score = (accuracy + relevance + coherence + completeness + timeliness) / 5
+        
+        return [
+            {
+                "accuracy": row[0],
+                "relevance": row[1],
+                "coherence": row[2],
+                "completeness": row[3],
+                "timeliness": row[4],
+                "overall_score": row[5]
+            }
+            for row in zip(
+                accuracy.tolist(),
+                relevance.tolist(),
+                coherence.tolist(),
+                completeness.tolist(),
+                timeliness.tolist(),
+                overall_score.tolist()
+            )
         ]
-        
-        for indicator in inaccuracy_indicators:
-            if indicator in response:
-                accuracy_score -= 0.05
-        
-        return max(0.1, min(1.0, accuracy_score))
+    
+    def _assess_accuracy(self, response, query):
+        """ارزیابی دقت"""
+        return accuracy_score(analyze(response).keywords)
     
     def _assess_relevance(self, response, query):
         """ارزیابی ارتباط"""
+        response = analyze(response)
+        query = analyze(query)
+        
         # استخراج کلمات کلیدی از پرسش
-        query_keywords = set(query.lower().split())
+        query_keywords = query.token_set
         
         # بررسی حضور کلمات کلیدی در پاسخ
-        response_lower = response.lower()
+        response_lower = response.normalized
         keyword_matches = 0
         
         for keyword in query_keywords:
             if len(keyword) > 3 and keyword in response_lower:
                 keyword_matches += 1
         
-        relevance_score = keyword_matches / max(1, len(query_keywords))
-        
-        # افزایش امتیاز برای پاسخ مستقیم به سوال
-        if "؟" in query or "?" in query:
-            if "پاسخ" in response or "جواب" in response or "بنابراین" in response:
-                relevance_score = min(1.0, relevance_score + 0.2)
-        
-        return relevance_score
+        direct_answer = any(indicator in response for indicator in DIRECT_ANSWER_INDICATORS)
+        return relevance_score(query, keyword_matches, direct_answer)
     
     def _assess_coherence(self, response):
         """ارزیابی انسجام"""
-        coherence_score = 0.5
-        
-        # نشانه‌های انسجام
-        coherence_indicators = [
-            ("اول", 0.05),
-            ("سپس", 0.05),
-            ("بنابراین", 0.1),
-            ("در نتیجه", 0.1),
-            ("به طور خلاصه", 0.05)
-        ]
-        
-        for indicator, boost in coherence_indicators:
-            if indicator in response:
-                coherence_score += boost
-        
-        # بررسی طول جملات (جملات خیلی طولانی انسجام را کاهش می‌دهند)
-        sentences = response.split('.')
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / max(1, len(sentences))
-        
-        if avg_sentence_length > 25:
-            coherence_score -= 0.1
-        elif avg_sentence_length < 10:
-            coherence_score -= 0.05
-        
-        return max(0.1, min(1.0, coherence_score))
+        response = analyze(response)
+        sentence_lengths = response.sentence_word_counts
+        avg_sentence_length = sum(sentence_lengths) / max(1, len(sentence_lengths))
+        return coherence_score(response.keywords, avg_sentence_length)
     
     def _assess_completeness(self, response, query):
         """ارزیابی کامل بودن"""
-        completeness_score = 0.5
-        
-        # بررسی وجود عناصر مختلف در پاسخ
-        response_elements = {
-            "تعریف": 0.1,
-            "توضیح": 0.2,
-            "مثال": 0.15,
-            "نتیجه‌گیری": 0.1,
-            "ارجاع": 0.05
-        }
-        
-        for element, value in response_elements.items():
-            if element in response:
-                completeness_score += value
-        
-        # بررسی طول پاسخ (پاسخ‌های خیلی کوتاه ممکن است ناقص باشند)
-        word_count = len(response.split())
-        
-        if word_count < 20:
-            completeness_score -= 0.2
-        elif word_count > 100:
-            completeness_score += 0.1
-        
-        return max(0.1, min(1.0, completeness_score))
+        response = analyze(response)
+        return completeness_score(response.keywords, response.word_count)
     
     def _assess_timeliness(self, response, context):
         """ارزیابی به‌موقع بودن"""
-        timeliness_score = 0.5
-        
-        if context:
-            if context.get("urgency") == "high":
-                # برای درخواست‌های فوری، پاسخ‌های کوتاه‌تر مناسب‌ترند
-                word_count = len(response.split())
-                if word_count < 50:
-                    timeliness_score += 0.2
-                else:
-                    timeliness_score -= 0.1
-        
-        return max(0.1, min(1.0, timeliness_score))
+        return timeliness_score(context, lambda: analyze(response).word_count)
     
     def analyze_consequences(self, response, user_reaction=None, follow_up_questions=None):
         """تحلیل پیامدهای پاسخ"""
-        consequence_analysis = {
-            "immediate_effects": [],
-            "potential_misunderstandings": [],
-            "learning_opportunities": []
-        }
-        
-        # تحلیل اثرات فوری
-        if "متشکرم" in response or "ممنون" in response:
-            consequence_analysis["immediate_effects"].append("رضایت کاربر")
-        
-        if "نمی‌دانم" in response:
-            consequence_analysis["immediate_effects"].append("افشای محدودیت دانش")
-        
-        # تحلیل سوءتفاهم‌های احتمالی
-        ambiguous_terms = ["شاید", "احتمالاً", "ممکن است"]
-        for term in ambiguous_terms:
-            if term in response:
-                consequence_analysis["potential_misunderstandings"].append(f"ابهام در استفاده از '{term}'")
-        
-        # شناسایی فرصت‌های یادگیری
-        if follow_up_questions and len(follow_up_questions) > 0:
-            consequence_analysis["learning_opportunities"].append("نیاز به دانش عمیق‌تر")
-        
-        if user_reaction == "confused":
-            consequence_analysis["learning_opportunities"].append("نیاز به شفاف‌سازی بیشتر")
+        analysis = consequence_analysis(response.__contains__, user_reaction, follow_up_questions)
         
         # ذخیره تحلیل
         consequence_record = {
             "response_sample": response[:100],
-            "analysis": consequence_analysis,
+            "analysis": analysis,
             "user_reaction": user_reaction
         }
         self.consequence_log.append(consequence_record)
         
-        return consequence_analysis
+        return analysis
     
     def process_feedback(self, feedback, response_related):
         """پردازش بازخورد و یادگیری از نتایج"""
+        feedback = analyze(feedback)
         feedback_record = {
-            "feedback": feedback,
+            "feedback": str(feedback),
             "related_response": response_related[:50] if response_related else None,
             "feedback_type": self._classify_feedback(feedback),
             "lessons_learned": []
@@ -235,7 +463,7 @@ class PerformanceEvaluation:
     
     def _classify_feedback(self, feedback):
         """طبقه‌بندی بازخورد"""
-        feedback_lower = feedback.lower()
+        feedback_lower = analyze(feedback).normalized
         
         if "عالی" in feedback_lower or "ممتاز" in feedback_lower:
             return "positive"
@@ -250,6 +478,8 @@ class PerformanceEvaluation:
         """استخراج درس‌ها از بازخورد"""
         lessons = []
         
+        feedback_lower = analyze(feedback).normalized
+        
         # الگوهای رایج در بازخورد
         lesson_patterns = {
             "کامل‌تر": "ارائه اطلاعات کامل‌تر",
@@ -261,7 +491,7 @@ class PerformanceEvaluation:
         }
         
         for pattern, lesson in lesson_patterns.items():
-            if pattern in feedback.lower():
+            if pattern in feedback_lower:
                 lessons.append(lesson)
         
         return lessons
@@ -293,46 +523,53 @@ class PerformanceEvaluation:
             "context_considered": context
         }
 
+
 # تست بخش ارزیابی عملکرد
-print("=" * 50)
-print("تست بخش ۴: ارزیابی عملکرد")
-print("=" * 50)
-
-performance_evaluator = PerformanceEvaluation()
-
-# تست ارزیابی کیفیت پاسخ
-query = "هوش مصنوعی چیست؟"
-response = "هوش مصنوعی شاخه‌ای از علوم کامپیوتر است که به ایجاد سیستم‌هایی می‌پردازد که می‌توانند کارهایی را انجام دهند که normalmente نیاز به هوش انسانی دارند. این شامل یادگیری ماشین، پردازش زبان طبیعی و بینایی کامپیوتر می‌شود."
-quality_evaluation = performance_evaluator.evaluate_response_quality(response, query)
-print(f"ارزیابی کیفیت پاسخ برای '{query}':")
-for metric, score in quality_evaluation.items():
-    if metric != "overall_score":
-        print(f"  - {metric}: {score:.2f}")
-print(f"  - امتیاز کلی: {quality_evaluation['overall_score']:.2f}")
-
-# تست تحلیل پیامدها
-consequence_analysis = performance_evaluator.analyze_consequences(
-    response,
-    user_reaction="satisfied",
-    follow_up_questions=["چه کاربردهایی دارد؟"]
-)
-print(f"\nتحلیل پیامدها:")
-print(f"  - اثرات فوری: {consequence_analysis['immediate_effects']}")
-print(f"  - سوءتفاهم‌های احتمالی: {consequence_analysis['potential_misunderstandings']}")
-print(f"  - فرصت‌های یادگیری: {consequence_analysis['learning_opportunities']}")
-
-# تست پردازش بازخورد
-feedback = "پاسخ خوبی بود ولی نیاز به مثال‌های بیشتری دارد"
-feedback_processing = performance_evaluator.process_feedback(feedback, response)
-print(f"\nپردازش بازخورد:")
-print(f"  - نوع بازخورد: {feedback_processing['feedback_type']}")
-print(f"  - درس‌های آموخته شده: {feedback_processing['lessons_learned']}")
-
-# تست تصحیح خودکار
-self_correction = performance_evaluator.self_correct("کامل بودن", "پاسخ به سوال علمی")
-print(f"\nتصحیح خودکار برای خطای 'کامل بودن':")
-print(f"  - اقدامات اصلاحی: {self_correction['correction_actions']}")
-
-print(f"\nپیشنهادات بهبود: {performance_evaluator.improvement_suggestions}")
-
-print("\n✓ بخش ارزیابی عملکرد با موفقیت تست شد\n")
\ No newline at end of file
+def demo():
+    """دموی بخش ارزیابی عملکرد"""
+    print("=" * 50)
+    print("تست بخش ۴: ارزیابی عملکرد")
+    print("=" * 50)
+
+    performance_evaluator = PerformanceEvaluation()
+
+    # تست ارزیابی کیفیت پاسخ
+    query = "هوش مصنوعی چیست؟"
+    response = "هوش مصنوعی شاخه‌ای از علوم کامپیوتر است که به ایجاد سیستم‌هایی می‌پردازد که می‌توانند کارهایی را انجام دهند که normalmente نیاز به هوش انسانی دارند. این شامل یادگیری ماشین، پردازش زبان طبیعی و بینایی کامپیوتر می‌شود."
+    quality_evaluation = performance_evaluator.evaluate_response_quality(response, query)
+    print(f"ارزیابی کیفیت پاسخ برای '{query}':")
+    for metric, score in quality_evaluation.items():
+        if metric != "overall_score":
+            print(f"  - {metric}: {score:.2f}")
+    print(f"  - امتیاز کلی: {quality_evaluation['overall_score']:.2f}")
+
+    # تست تحلیل پیامدها
+    consequence_analysis = performance_evaluator.analyze_consequences(
+        response,
+        user_reaction="satisfied",
+        follow_up_questions=["چه کاربردهایی دارد؟"]
+    )
+    print(f"\nتحلیل پیامدها:")
+    print(f"  - اثرات فوری: {consequence_analysis['immediate_effects']}")
+    print(f"  - سوءتفاهم‌های احتمالی: {consequence_analysis['potential_misunderstandings']}")
+    print(f"  - فرصت‌های یادگیری: {consequence_analysis['learning_opportunities']}")
+
+    # تست پردازش بازخورد
+    feedback = "پاسخ خوبی بود ولی نیاز به مثال‌های بیشتری دارد"
+    feedback_processing = performance_evaluator.process_feedback(feedback, response)
+    print(f"\nپردازش بازخورد:")
+    print(f"  - نوع بازخورد: {feedback_processing['feedback_type']}")
+    print(f"  - درس‌های آموخته شده: {feedback_processing['lessons_learned']}")
+
+    # تست تصحیح خودکار
+    self_correction = performance_evaluator.self_correct("کامل بودن", "پاسخ به سوال علمی")
+    print(f"\nتصحیح خودکار برای خطای 'کامل بودن':")
+    print(f"  - اقدامات اصلاحی: {self_correction['correction_actions']}")
+
+    print(f"\nپیشنهادات بهبود: {performance_evaluator.improvement_suggestions}")
+
+    print("\n✓ بخش ارزیابی عملکرد با موفقیت تست شد\n")
+
+
+if __name__ == "__main__":
+    demo()
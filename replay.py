@@ -0,0 +1,160 @@
+# ============================================
+# بازپخش دسته‌ای گفتگوهای بایگانی شده (Transcript Replay)
+# ============================================
+#
+# هر خط فایل JSONL یک نوبت است:
+#
+#     {"session_id": "ali", "text": "هوش مصنوعی چیست؟", "feedback": "پاسخ عالی بود"}
+#
+# (feedback اختیاری است.) فایل خط به خط و در دسته‌های --batch خوانده می‌شود و حافظه
+# مستقل از طول فایل است؛ تعداد جلسه‌های در حافظه با --max-sessions محدود است و با
+# --store مدل کاربران حذف شده در SQLite ذخیره و دوباره بارگذاری می‌شود.
+#
+#     python replay.py transcript.jsonl --workers 4 --store users.db
+
+import argparse
+import functools
+import itertools
+import json
+import sys
+import time
+
+from aggregates import RunningStats, TopKCounter
+from instrumentation import LatencyHistogram
+from server import MetacognitiveServer
+from session_manager import SessionManager
+from user_store import SqliteUserModelStore
+from worker_pool import WorkerPool
+
+
+def read_turns(lines):
+    """تبدیل خط‌های JSONL به درخواست‌های process؛ خط نامعتبر به صورت (شماره خط، خطا) برمی‌گردد"""
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            yield {
+                "op": "process",
+                "session": str(record["session_id"]),
+                "input": record["text"],
+                "feedback": record.get("feedback")
+            }
+        except (ValueError, KeyError, TypeError) as error:
+            yield line_number, f"{type(error).__name__}: {error}"
+
+
+class ReplayReport:
+    """آمار بازپخش با حافظه ثابت: گذردهی، صدک‌های تأخیر و بینش‌های نهایی"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.quality_stats = RunningStats()
+        self.topics = TopKCounter()
+        self.emotional_states = TopKCounter()
+        self.feedback_types = TopKCounter()
+        self.improvement_suggestions = []
+
+    def add(self, response):
+        self.rows += 1
+        if not response["ok"]:
+            self.errors += 1
+            return
+        result = response["result"]
+        report = result["metacognitive_report"]
+        self.latency.record(result["stage_timing"]["wall_time"])
+        self.quality_stats.add(report["response_analysis"]["quality_score"])
+        self.topics.increment(report["input_analysis"]["topic_detected"])
+        self.emotional_states.increment(report["user_model_snapshot"]["emotional_state"])
+        if "feedback" in result:
+            self.feedback_types.increment(result["feedback"]["feedback_type"])
+        if report["improvement_suggestions"]:
+            self.improvement_suggestions = report["improvement_suggestions"]
+
+    def add_error(self):
+        self.rows += 1
+        self.errors += 1
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "rows": self.rows,
+            "errors": self.errors,
+            "elapsed_s": elapsed,
+            "rows_per_s": self.rows / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                name: value * 1000 for name, value in self.latency.summary().items() if name != "count"
+            },
+            "insights": {
+                "quality_stats": self.quality_stats.summary(),
+                "common_topics": self.topics.most_common(5),
+                "emotional_states": self.emotional_states.most_common(),
+                "feedback_types": self.feedback_types.most_common(),
+                "system_improvements": self.improvement_suggestions
+            }
+        }
+
+
+def replay(lines, workers=1, batch_size=256, max_sessions=10000, store_path=None, progress_every=None):
+    """بازپخش نوبت‌ها؛ با workers > 1 جلسه‌ها بین پردازه‌های WorkerPool پخش می‌شوند"""
+    store_factory = functools.partial(SqliteUserModelStore, store_path) if store_path else None
+    pool = sessions = None
+    if workers > 1:
+        pool = WorkerPool(workers=workers, max_sessions=max_sessions, store_factory=store_factory).start()
+        run_batch = pool.process_many
+    else:
+        user_store = store_factory() if store_factory else None
+        sessions = SessionManager(max_sessions=max_sessions, user_store=user_store)
+        handler = MetacognitiveServer(sessions)
+        run_batch = lambda messages: [handler.handle(message) for message in messages]
+
+    report = ReplayReport()
+    turns = read_turns(lines)
+    try:
+        while True:
+            batch = list(itertools.islice(turns, batch_size))
+            if not batch:
+                break
+            messages = []
+            for turn in batch:
+                if isinstance(turn, tuple):
+                    report.add_error()
+                    print(f"خط {turn[0]} نامعتبر است: {turn[1]}", file=sys.stderr)
+                else:
+                    messages.append(turn)
+            for response in run_batch(messages):
+                report.add(response)
+            if progress_every and report.rows // progress_every != (report.rows - len(batch)) // progress_every:
+                print(f"{report.rows} ردیف، {report.summary()['rows_per_s']:.0f} ردیف در ثانیه", file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.close()
+        else:
+            sessions.close()
+    return report.summary()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="بازپخش فایل JSONL گفتگوها از طریق process_input و process_feedback")
+    parser.add_argument("transcript", help="مسیر فایل JSONL یا - برای ورودی استاندارد")
+    parser.add_argument("--workers", type=int, default=1, help="تعداد پردازه‌ها (جلسه‌ها بین آن‌ها پخش می‌شوند)")
+    parser.add_argument("--batch", type=int, default=256, help="تعداد نوبت‌های هر دسته خواندن")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="سقف جلسه‌های در حافظه هر پردازه")
+    parser.add_argument("--store", help="پایگاه داده SQLite مدل کاربران")
+    parser.add_argument("--progress", type=int, help="گزارش پیشرفت پس از هر این تعداد ردیف")
+    args = parser.parse_args(argv)
+
+    if args.transcript == "-":
+        summary = replay(sys.stdin, args.workers, args.batch, args.max_sessions, args.store, args.progress)
+    else:
+        with open(args.transcript, encoding="utf-8") as transcript:
+            summary = replay(transcript, args.workers, args.batch, args.max_sessions, args.store, args.progress)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# ============================================
+# memo پاسخ درخواست‌ها (Result Cache)
+# ============================================
+
+import threading
+from collections import OrderedDict
+
+from sizing import deep_sizeof
+
+
+def normalize_input(user_input):
+    """شکل کلید ورودی: فاصله‌های اضافه حذف و فاصله‌های پشت سر هم یکی می‌شوند"""
+    return " ".join(str(user_input).split())
+
+
+def freeze(value):
+    """تبدیل مقدار (زمینه درخواست یا بخشی از وضعیت) به شکل hashable"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    return value
+
+
+class StateVersions:
+    """شماره نسخه بخش‌هایی از وضعیت که پاسخ درخواست به آن‌ها وابسته است
+
+    parts نام هر بخش را به تابع خواندن آن نگاشت می‌کند. هر مقدار متمایز یک بخش شماره
+    نسخه ثابتی می‌گیرد، پس با تغییر یک بخش فقط مدخل‌های وابسته به مقدار قبلی آن باطل
+    می‌شوند و بازگشت به مقدار قبلی، مدخل‌های قدیمی را دوباره معتبر می‌کند. برای هر بخش
+    فقط max_values مقدار اخیر نگه داشته می‌شود؛ مقدار فراموش شده در بازگشت شماره تازه
+    می‌گیرد (شماره‌ها تکرار نمی‌شوند) و مدخل‌های قدیمی آن دیگر پیدا نمی‌شوند.
+    """
+
+    def __init__(self, parts, max_values=1024):
+        self.parts = parts
+        self.max_values = max_values
+        self._ids = {name: OrderedDict() for name in parts}
+        self._next_id = dict.fromkeys(parts, 0)
+
+    def current(self):
+        """نسخه فعلی هر بخش"""
+        versions = {}
+        for name, read in self.parts.items():
+            ids = self._ids[name]
+            value = freeze(read())
+            version = ids.get(value)
+            if version is None:
+                version = ids[value] = self._next_id[name]
+                self._next_id[name] += 1
+                if len(ids) > self.max_values:
+                    ids.popitem(last=False)
+            else:
+                ids.move_to_end(value)
+            versions[name] = version
+        return versions
+
+
+class CacheEntry:
+    def __init__(self, response, size_bytes):
+        self.response = response
+        self.size_bytes = size_bytes
+
+
+class ResultCache:
+    """memo LRU متن پاسخ‌های تولید شده process_input با سقف تعداد و حافظه
+
+    این حافظه نهان کل درخواست نیست: فقط مرحله تولید پاسخ از آن خوانده می‌شود و بقیه
+    مراحل (ارزیابی، یادگیری و تاریخچه‌ها) برای هر درخواست اجرا می‌شوند تا وضعیت هسته با
+    و بدون آن یکسان بماند. سود آن صرفه‌جویی در فراخوانی مولد پاسخ است (مثلاً مولد بیرونی
+    در generate_response_async)؛ با مولد شبیه‌سازی شده، تقریباً بی‌اثر است.
+
+    کلید هر مدخل شامل نسخه بخش‌های وابسته وضعیت است: با تغییر یک بخش، مدخل‌های وابسته
+    به مقدار قبلی آن دیگر پیدا نمی‌شوند (و با LRU حذف می‌شوند) و بقیه معتبر می‌مانند.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "stores": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text, context, versions):
+        """کلید مدخل: ورودی یکسان‌شده، زمینه و نسخه بخش‌های وابسته وضعیت"""
+        return (text, freeze(context), tuple(versions.items()))
+
+    def get(self, key):
+        """مدخل ذخیره شده برای کلید، یا None"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry
+
+    def put(self, key, response):
+        """ذخیره پاسخ تولید شده برای یک درخواست"""
+        entry = CacheEntry(response, deep_sizeof(response))
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = entry
+            self.total_bytes += entry.size_bytes
+            self.counters["stores"] += 1
+            while self.entries and (
+                len(self.entries) > self.max_entries
+                or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self.entries)))
+                self.counters["evictions"] += 1
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        self.total_bytes -= entry.size_bytes
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """آمار نرخ برخورد و اشغال"""
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "memory_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self.counters["hits"] / lookups if lookups else 0.0,
+                **self.counters
+            }
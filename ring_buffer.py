@@ -0,0 +1,74 @@
+# ============================================
+# تاریخچه با ظرفیت ثابت (Ring Buffer)
+# ============================================
+
+from collections.abc import Sequence
+
+
+class RingBuffer(Sequence):
+    """تاریخچه محدود با ظرفیت ثابت؛ با پر شدن، قدیمی‌ترین رکورد جایگزین می‌شود
+
+    فضای رکوردها یک بار هنگام ساخت رزرو می‌شود و افزودن O(1) و بدون کپی است.
+    ترتیب پیمایش و اندیس‌گذاری از قدیمی به جدید است (مثل لیست قبلی).
+    """
+
+    def __init__(self, capacity, items=()):
+        if capacity < 1:
+            raise ValueError("ظرفیت تاریخچه باید حداقل ۱ باشد")
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._start = 0
+        self._size = 0
+        self.extend(items)
+
+    def append(self, item):
+        """افزودن رکورد؛ در صورت پر بودن، قدیمی‌ترین رکورد حذف می‌شود"""
+        if self._size < self.capacity:
+            self._items[(self._start + self._size) % self.capacity] = item
+            self._size += 1
+        else:
+            self._items[self._start] = item
+            self._start = (self._start + 1) % self.capacity
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def clear(self):
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+
+    def recent(self, count):
+        """آخرین count رکورد، از قدیمی به جدید"""
+        count = min(max(count, 0), self._size)
+        return [self._items[(self._start + offset) % self.capacity]
+                for offset in range(self._size - count, self._size)]
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        items, start, capacity = self._items, self._start, self.capacity
+        for offset in range(self._size):
+            yield items[(start + offset) % capacity]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("اندیس خارج از محدوده تاریخچه")
+        return self._items[(self._start + index) % self.capacity]
+
+    def __eq__(self, other):
+        if isinstance(other, (RingBuffer, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"RingBuffer({list(self)!r}, capacity={self.capacity})"
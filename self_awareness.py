@@ -2,8 +2,31 @@
 # بخش ۱: خودآگاهی (Self-Awareness)
 # ============================================
 
+from analyzed_text import analyze
+from lexicon import LEXICON
+from ring_buffer import RingBuffer
+
+# کلیدواژه‌های محدودیت‌ها: (نشانه‌ها، هشدار)
+LIMITATION_INDICATORS = [
+    (["آخرین خبر", "اکنون"], "هشدار: دسترسی به داده‌های زمان واقعی محدود است"),
+    (["اجرای کد", "برنامه‌نویسی کن"], "هشدار: نمی‌توانم کد را مستقیماً اجرا کنم"),
+    (["حرکت کن", "فیزیکی"], "هشدار: قابلیت تعامل فیزیکی ندارم")
+]
+
+CONTEXT_TOPICS = ["علم", "تکنولوژی", "هنر", "ریاضی", "برنامه‌نویسی", "فلسفه"]
+
+LEXICON.register([indicator for indicators, _ in LIMITATION_INDICATORS for indicator in indicators])
+LEXICON.register(CONTEXT_TOPICS)
+
+# ظرفیت پیش‌فرض تاریخچه‌ها (قابل تغییر از طریق history_capacities)
+HISTORY_CAPACITIES = {
+    "interaction_history": 10
+}
+
+
 class SelfAwareness:
-    def __init__(self):
+    def __init__(self, history_capacities=None):
+        capacities = {**HISTORY_CAPACITIES, **(history_capacities or {})}
         self.user_identity = None
         self.system_state = {
             "mode": "normal",
@@ -27,7 +50,7 @@ class SelfAwareness:
             "topic": None,
             "complexity_level": "medium",
             "user_expertise": "unknown",
-            "interaction_history": []
+            "interaction_history": RingBuffer(capacities["interaction_history"])
         }
     
     def identify_user(self, user_input):
@@ -54,25 +77,21 @@ class SelfAwareness:
     def check_limitation(self, task):
         """بررسی محدودیت‌ها برای یک وظیفه خاص"""
         limitation_checks = []
+        found = analyze(task).keywords
         
-        if "آخرین خبر" in task or "اکنون" in task:
-            limitation_checks.append("هشدار: دسترسی به داده‌های زمان واقعی محدود است")
-        
-        if "اجرای کد" in task or "برنامه‌نویسی کن" in task:
-            limitation_checks.append("هشدار: نمی‌توانم کد را مستقیماً اجرا کنم")
-        
-        if "حرکت کن" in task or "فیزیکی" in task:
-            limitation_checks.append("هشدار: قابلیت تعامل فیزیکی ندارم")
+        for indicators, warning in LIMITATION_INDICATORS:
+            if any(indicator in found for indicator in indicators):
+                limitation_checks.append(warning)
         
         return limitation_checks
     
     def update_context(self, user_input, response=None):
         """به‌روزرسانی زمینه تعامل"""
         # تشخیص موضوع
-        topics = ["علم", "تکنولوژی", "هنر", "ریاضی", "برنامه‌نویسی", "فلسفه"]
+        found = analyze(user_input).keywords
         detected_topic = None
-        for topic in topics:
-            if topic in user_input:
+        for topic in CONTEXT_TOPICS:
+            if topic in found:
                 detected_topic = topic
                 break
         
@@ -90,35 +109,38 @@ class SelfAwareness:
         
         self.interaction_context["interaction_history"].append(interaction_record)
         
-        # حفظ اندازه معقول تاریخچه
-        if len(self.interaction_context["interaction_history"]) > 10:
-            self.interaction_context["interaction_history"] = self.interaction_context["interaction_history"][-10:]
-        
         return self.interaction_context
 
+
 # تست بخش خودآگاهی
-print("=" * 50)
-print("تست بخش ۱: خودآگاهی")
-print("=" * 50)
-
-self_awareness = SelfAwareness()
-
-# تست شناسایی کاربر
-test_input = "سلام، اسمم احمد است"
-identification_result = self_awareness.identify_user(test_input)
-print(f"نتیجه شناسایی کاربر: {identification_result}")
-print(f"هویت کاربر: {self_awareness.user_identity}")
-
-# تست بررسی محدودیت‌ها
-task_test = "آخرین خبر را بگو"
-limitations = self_awareness.check_limitation(task_test)
-print(f"بررسی محدودیت برای '{task_test}':")
-for lim in limitations:
-    print(f"  - {lim}")
-
-# تست به‌روزرسانی زمینه
-context_update = self_awareness.update_context("در مورد هوش مصنوعی توضیح بده")
-print(f"زمینه به‌روز شده: {context_update['topic']}")
-print(f"طول تاریخچه: {len(context_update['interaction_history'])}")
-
-print("\n✓ بخش خودآگاهی با موفقیت تست شد\n")
\ No newline at end of file
+def demo():
+    """دموی بخش خودآگاهی"""
+    print("=" * 50)
+    print("تست بخش ۱: خودآگاهی")
+    print("=" * 50)
+
+    self_awareness = SelfAwareness()
+
+    # تست شناسایی کاربر
+    test_input = "سلام، اسمم احمد است"
+    identification_result = self_awareness.identify_user(test_input)
+    print(f"نتیجه شناسایی کاربر: {identification_result}")
+    print(f"هویت کاربر: {self_awareness.user_identity}")
+
+    # تست بررسی محدودیت‌ها
+    task_test = "آخرین خبر را بگو"
+    limitations = self_awareness.check_limitation(task_test)
+    print(f"بررسی محدودیت برای '{task_test}':")
+    for lim in limitations:
+        print(f"  - {lim}")
+
+    # تست به‌روزرسانی زمینه
+    context_update = self_awareness.update_context("در مورد هوش مصنوعی توضیح بده")
+    print(f"زمینه به‌روز شده: {context_update['topic']}")
+    print(f"طول تاریخچه: {len(context_update['interaction_history'])}")
+
+    print("\n✓ بخش خودآگاهی با موفقیت تست شد\n")
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,459 @@
+# ============================================
+# سرور سوکت محلی (TCP یا Unix) برای هسته فراشناختی
+# ============================================
+#
+# هر پیام یک قاب است: طول بدنه (۴ بایت big-endian) و سپس بدنه با رمزگذاری فشرده
+# snapshot.encode_value. درخواست‌ها dict هستند:
+#
+#     {"id": 1, "op": "process", "session": "ali", "input": "هوش مصنوعی چیست؟"}
+#
+# (درخواست process می‌تواند feedback هم داشته باشد تا پس از پاسخ همان نوبت ثبت شود)
+#
+# و پاسخ با همان id برمی‌گردد: {"id": 1, "ok": True, "result": ...} یا
+# {"id": 1, "ok": False, "error": "..."}. روی یک اتصال می‌توان بدون انتظار برای پاسخ
+# چند درخواست پشت سر هم فرستاد (pipelining)؛ پاسخ‌ها به همان ترتیب فرستاده می‌شوند.
+#
+#     python server.py --port 9470        یا        python server.py --unix /tmp/metacognitive.sock
+
+import argparse
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+
+from instrumentation import LatencyHistogram
+from session_manager import SessionManager
+from snapshot import decode_value, encode_value
+
+DEFAULT_PORT = 9470
+
+# سقف اندازه بدنه هر قاب؛ قاب بزرگ‌تر اتصال را می‌بندد
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# حداکثر درخواست‌های در حال اجرای هر اتصال؛ با رسیدن به آن خواندن اتصال متوقف می‌شود
+MAX_PENDING_REQUESTS = 256
+
+# فاصله نگهداری دوره‌ای جلسه‌ها (حذف جلسه‌های منقضی و flush ذخیره‌ساز مدل کاربران)
+MAINTENANCE_INTERVAL = 1.0
+
+_header = struct.Struct(">I")
+
+# نام عملیات -> متد سرور
+OPERATIONS = {
+    "process": "_op_process",
+    "feedback": "_op_feedback",
+    "insights": "_op_insights",
+    "health": "_op_health",
+    "metrics": "_op_metrics"
+}
+
+# عملیاتی که در سرور asyncio نسخه coroutine دارند (بقیه همگام و کوتاه‌اند)
+ASYNC_OPERATIONS = {
+    "process": "_op_process_async",
+    "feedback": "_op_feedback_async",
+    "insights": "_op_insights_async"
+}
+
+
+def encode_frame(message):
+    """رمزگذاری یک پیام با سرآیند طول"""
+    body = encode_value(message)
+    return _header.pack(len(body)) + body
+
+
+def read_frames(buffer, max_frame_bytes=MAX_FRAME_BYTES):
+    """جدا کردن همه قاب‌های کامل از ابتدای buffer (bytearray) و رمزگشایی آن‌ها"""
+    messages = []
+    offset = 0
+    available = len(buffer)
+    while available - offset >= _header.size:
+        (length,) = _header.unpack_from(buffer, offset)
+        if length > max_frame_bytes:
+            raise ValueError(f"اندازه قاب ({length} بایت) از سقف مجاز بیشتر است")
+        end = offset + _header.size + length
+        if end > available:
+            break
+        messages.append(decode_value(bytes(buffer[offset + _header.size:end])))
+        offset = end
+    if offset:
+        del buffer[:offset]
+    return messages
+
+
+class _Connection(asyncio.Protocol):
+    """یک اتصال: هر قاب یک وظیفه asyncio است و پاسخ‌ها به ترتیب درخواست‌ها نوشته می‌شوند
+
+    درخواست‌های پشت سر هم (pipelining) همزمان اجرا می‌شوند و پاسخ‌های آماده ابتدای صف
+    با هم نوشته می‌شوند.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.buffer = bytearray()
+        # وظیفه‌های درخواست به ترتیب رسیدن
+        self.responses = deque()
+        self.writer = None
+        self.writing_paused = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.counters["connections"] += 1
+        self.server.open_connections += 1
+
+    def connection_lost(self, exc):
+        self.server.open_connections -= 1
+
+    def data_received(self, data):
+        self.buffer += data
+        try:
+            messages = read_frames(self.buffer, self.server.max_frame_bytes)
+        except (ValueError, IndexError, KeyError, TypeError, struct.error, UnicodeDecodeError):
+            self.server.counters["protocol_errors"] += 1
+            self.transport.close()
+            return
+        for message in messages:
+            self.responses.append(asyncio.ensure_future(self.server.handle_async(message)))
+        if self.responses and self.writer is None:
+            self.writer = asyncio.ensure_future(self._write_responses())
+        self._update_reading()
+
+    async def _write_responses(self):
+        """نوشتن پاسخ‌ها به ترتیب درخواست‌ها؛ درخواست‌های اتصال بسته شده تا پایان اجرا می‌شوند"""
+        try:
+            while self.responses:
+                frames = [encode_frame(await self.responses[0])]
+                self.responses.popleft()
+                while self.responses and self.responses[0].done():
+                    frames.append(encode_frame(self.responses.popleft().result()))
+                if not self.transport.is_closing():
+                    self.transport.writelines(frames)
+                self._update_reading()
+        finally:
+            self.writer = None
+
+    # فشار معکوس: با پر بودن بافر نوشتن یا صف درخواست‌ها، درخواست تازه خوانده نمی‌شود
+    def _update_reading(self):
+        if self.transport.is_closing():
+            return
+        if self.writing_paused or len(self.responses) >= MAX_PENDING_REQUESTS:
+            self.transport.pause_reading()
+        else:
+            self.transport.resume_reading()
+
+    def pause_writing(self):
+        self.writing_paused = True
+        self._update_reading()
+
+    def resume_writing(self):
+        self.writing_paused = False
+        self._update_reading()
+
+
+class MetacognitiveServer:
+    """سرور asyncio برای process_input، بازخورد، بینش‌ها، سلامت و متریک‌ها
+
+    درخواست‌ها با شناسه session به جلسه‌های SessionManager فرستاده می‌شوند. هر درخواست
+    یک وظیفه asyncio است (handle_async) و process منتظر process_input_async جلسه می‌ماند،
+    پس درخواست کند (مثلاً مولد پاسخ بیرونی در generate_response_async) اتصال‌های دیگر را
+    متوقف نمی‌کند. درخواست‌های یک جلسه با قفل ناهمگام آن به ترتیب اجرا می‌شوند و پاسخ‌های
+    هر اتصال به ترتیب درخواست‌ها برمی‌گردند. handle نسخه همگام برای کارگرها و بازپخش است.
+    """
+
+    def __init__(self, sessions=None, max_frame_bytes=MAX_FRAME_BYTES, clock=time.monotonic,
+                 maintenance_interval=MAINTENANCE_INTERVAL):
+        self.sessions = sessions or SessionManager()
+        self.max_frame_bytes = max_frame_bytes
+        self.maintenance_interval = maintenance_interval
+        self.clock = clock
+        self.started_at = clock()
+        self.open_connections = 0
+        self.counters = {"connections": 0, "requests": 0, "errors": 0, "protocol_errors": 0}
+        self.operation_latency = {operation: LatencyHistogram() for operation in OPERATIONS}
+        self._server = None
+        self._maintenance = None
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        """شروع گوش دادن روی TCP یا (با path) سوکت Unix"""
+        loop = asyncio.get_running_loop()
+        if path is not None:
+            self._server = await loop.create_unix_server(lambda: _Connection(self), path)
+        else:
+            self._server = await loop.create_server(lambda: _Connection(self), host, port)
+        if self.maintenance_interval is not None:
+            self._maintenance = loop.call_later(self.maintenance_interval, self._maintain)
+        return self
+
+    def _maintain(self):
+        """نگهداری دوره‌ای جلسه‌ها در حلقه رویداد (همان رشته درخواست‌ها)"""
+        try:
+            self.sessions.maintain()
+        finally:
+            self._maintenance = asyncio.get_running_loop().call_later(self.maintenance_interval, self._maintain)
+
+    @property
+    def address(self):
+        """نشانی گوش دادن: مسیر سوکت Unix یا (میزبان، درگاه)"""
+        address = self._server.sockets[0].getsockname()
+        return address if isinstance(address, str) else address[:2]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """بستن سوکت و سپس جلسه‌ها (تغییرات منتظر ذخیره‌ساز نوشته می‌شوند)"""
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            self._maintenance = None
+        self._server.close()
+        await self._server.wait_closed()
+        self.sessions.close()
+
+    def handle(self, message):
+        """اجرای همگام یک درخواست و ساخت پاسخ (خطاها به صورت پاسخ ناموفق برمی‌گردند)"""
+        request_id, operation, failure = self._accept(message)
+        if failure is not None:
+            return failure
+
+        started = time.perf_counter()
+        try:
+            result = getattr(self, OPERATIONS[operation])(message)
+        except Exception as error:
+            return self._failure(request_id, error)
+        finally:
+            self.operation_latency[operation].record(time.perf_counter() - started)
+        return {"id": request_id, "ok": True, "result": result}
+
+    async def handle_async(self, message):
+        """نسخه coroutine handle برای سرور asyncio"""
+        request_id, operation, failure = self._accept(message)
+        if failure is not None:
+            return failure
+
+        started = time.perf_counter()
+        try:
+            if operation in ASYNC_OPERATIONS:
+                result = await getattr(self, ASYNC_OPERATIONS[operation])(message)
+            else:
+                result = getattr(self, OPERATIONS[operation])(message)
+        except Exception as error:
+            return self._failure(request_id, error)
+        finally:
+            self.operation_latency[operation].record(time.perf_counter() - started)
+        return {"id": request_id, "ok": True, "result": result}
+
+    def _accept(self, message):
+        """(شناسه درخواست، عملیات، پاسخ ناموفق برای عملیات ناشناخته یا None)"""
+        self.counters["requests"] += 1
+        request_id = message.get("id") if isinstance(message, dict) else None
+        operation = message.get("op") if isinstance(message, dict) else None
+        if operation not in OPERATIONS:
+            self.counters["errors"] += 1
+            return request_id, operation, {"id": request_id, "ok": False, "error": f"عملیات ناشناخته: {operation}"}
+        return request_id, operation, None
+
+    def _failure(self, request_id, error):
+        self.counters["errors"] += 1
+        return {"id": request_id, "ok": False, "error": f"{type(error).__name__}: {error}"}
+
+    def _op_process(self, message):
+        """پردازش ورودی؛ بازخورد اختیاری همراه درخواست بلافاصله روی پاسخ همان نوبت ثبت می‌شود"""
+        session_id = message.get("session", "default")
+        result = self.sessions.process_input(
+            session_id,
+            message["input"],
+            message.get("context"),
+            message.get("latency_budget")
+        )
+        if message.get("feedback") is not None:
+            result["feedback"] = self._op_feedback(
+                {"session": session_id, "feedback": message["feedback"], "response": result["response"]}
+            )
+        return result
+
+    async def _op_process_async(self, message):
+        session_id = message.get("session", "default")
+        result = await self.sessions.process_input_async(
+            session_id,
+            message["input"],
+            message.get("context"),
+            message.get("latency_budget")
+        )
+        if message.get("feedback") is not None:
+            result["feedback"] = await self._op_feedback_async(
+                {"session": session_id, "feedback": message["feedback"], "response": result["response"]}
+            )
+        return result
+
+    def _op_feedback(self, message):
+        session = self.sessions.get_session(message.get("session", "default"))
+        with session.lock:
+            return self._feedback(session, message)
+
+    async def _op_feedback_async(self, message):
+        # مسیر ناهمگام جلسه فقط قفل ناهمگام آن را می‌گیرد (SessionManager.process_input_async)
+        session = self.sessions.get_session(message.get("session", "default"))
+        async with session.async_lock:
+            return self._feedback(session, message)
+
+    @staticmethod
+    def _feedback(session, message):
+        return session.core.performance_evaluation.process_feedback(
+            message["feedback"], message.get("response", "")
+        )
+
+    def _op_insights(self, message):
+        session = self.sessions.get_session(message.get("session", "default"))
+        with session.lock:
+            return session.core.get_system_insights()
+
+    async def _op_insights_async(self, message):
+        session = self.sessions.get_session(message.get("session", "default"))
+        async with session.async_lock:
+            return session.core.get_system_insights()
+
+    def _op_health(self, message):
+        return {
+            "status": "ok",
+            "uptime": self.clock() - self.started_at,
+            "open_connections": self.open_connections,
+            "sessions": len(self.sessions.sessions)
+        }
+
+    def _op_metrics(self, message):
+        metrics = {
+            "server": dict(self.counters, open_connections=self.open_connections),
+            "operation_latency": {
+                operation: histogram.summary()
+                for operation, histogram in self.operation_latency.items() if histogram.count
+            },
+            "sessions": self.sessions.stats()
+        }
+        instrumentation = self.sessions.core.instrumentation
+        if instrumentation is not None:
+            metrics["prometheus"] = instrumentation.render_prometheus()
+        return metrics
+
+
+class MetacognitiveClient:
+    """کلاینت asyncio با اتصال ماندگار؛ فراخوانی‌های همزمان روی یک اتصال pipeline می‌شوند"""
+
+    def __init__(self, reader, writer, max_frame_bytes=MAX_FRAME_BYTES):
+        self.reader = reader
+        self.writer = writer
+        self.max_frame_bytes = max_frame_bytes
+        self._next_id = 0
+        self._pending = {}
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        """خواندن پاسخ‌ها و رساندن هر کدام به درخواست هم‌شناسه"""
+        buffer = bytearray()
+        try:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    break
+                buffer += data
+                for response in read_frames(buffer, self.max_frame_bytes):
+                    future = self._pending.pop(response.get("id"), None)
+                    if future is not None and not future.done():
+                        future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("اتصال به سرور بسته شد"))
+            self._pending.clear()
+
+    def _send(self, requests):
+        futures = []
+        frames = []
+        loop = asyncio.get_running_loop()
+        for request in requests:
+            self._next_id += 1
+            future = loop.create_future()
+            self._pending[self._next_id] = future
+            futures.append(future)
+            frames.append(encode_frame({**request, "id": self._next_id}))
+        self.writer.writelines(frames)
+        return futures
+
+    @staticmethod
+    def _result(response):
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    async def request(self, op, **fields):
+        """ارسال یک درخواست و انتظار برای نتیجه آن"""
+        (future,) = self._send([{"op": op, **fields}])
+        await self.writer.drain()
+        return self._result(await future)
+
+    async def pipeline(self, requests):
+        """ارسال چند درخواست در یک نوشتن و دریافت نتایج به همان ترتیب"""
+        futures = self._send(requests)
+        await self.writer.drain()
+        return [self._result(response) for response in await asyncio.gather(*futures)]
+
+    async def process_input(self, session, user_input, context=None, latency_budget=None):
+        return await self.request(
+            "process", session=session, input=user_input, context=context, latency_budget=latency_budget
+        )
+
+    async def feedback(self, session, feedback, response=""):
+        return await self.request("feedback", session=session, feedback=feedback, response=response)
+
+    async def insights(self, session):
+        return await self.request("insights", session=session)
+
+    async def health(self):
+        return await self.request("health")
+
+    async def metrics(self):
+        return await self.request("metrics")
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._receiver.cancel()
+
+
+async def _serve(args):
+    sessions = SessionManager(max_sessions=args.max_sessions)
+    server = await MetacognitiveServer(sessions).start(args.host, args.port, args.unix)
+    # نشانی در یک خط JSON چاپ می‌شود تا اسکریپت‌ها (مثل بنچمارک بار) آن را بخوانند
+    print(json.dumps({"address": server.address}), flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="سرور سوکت محلی هسته فراشناختی")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="۰ برای درگاه آزاد دلخواه")
+    parser.add_argument("--unix", help="مسیر سوکت Unix (به جای TCP)")
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# ============================================
+# مدیریت جلسه‌های کاربران (Session Manager)
+# ============================================
+
+import threading
+import time
+from collections import OrderedDict
+
+from metacognitive_core import MetacognitiveCore
+from sizing import deep_sizeof
+
+
+class Session:
+    """وضعیت یک کاربر: نمای اختصاصی هسته و آمار دسترسی"""
+
+    def __init__(self, session_id, core, now):
+        self.session_id = session_id
+        self.core = core
+        self.created_at = now
+        self.last_access = now
+        self.requests = 0
+        self.size_bytes = 0
+        # اندازه ماژول‌ها در آخرین اندازه‌گیری کامل
+        self.module_bytes = 0
+        self.lock = threading.Lock()
+        self._async_lock = None
+
+    @property
+    def async_lock(self):
+        """قفل مسیر ناهمگام (asyncio.Lock)؛ در اولین استفاده ساخته می‌شود"""
+        if self._async_lock is None:
+            import asyncio
+            
+            self._async_lock = asyncio.Lock()
+        return self._async_lock
+
+
+class SessionManager:
+    """نگهداری وضعیت جلسه‌ها با حذف LRU، انقضای بیکاری و سقف حافظه
+
+    هر جلسه نمای اختصاصی خود از هسته را دارد (همه ماژول‌ها، تاریخچه تعامل و آمار؛
+    MetacognitiveCore.new_session_view). اندازه ماژول‌های جلسه در درخواست‌های ۱، ۲، ۴، ...
+    و سپس هر size_sample_interval درخواست دوباره اندازه‌گیری می‌شود. با user_store (مثل SqliteUserModelStore) مدل ذهنی کاربر هنگام ساخت جلسه بارگذاری
+    و پس از هر تعامل برای نوشتن دسته‌ای علامت‌گذاری می‌شود.
+    """
+
+    def __init__(self, core=None, max_sessions=10000, idle_ttl=1800.0,
+                 max_memory_bytes=None, on_evict=None, clock=time.monotonic, user_store=None,
+                 size_sample_interval=64, frequency_tracker=None):
+        # بدون core، هسته پایه با frequency_tracker (سازنده شمارنده‌های پرتکرار) ساخته می‌شود
+        self.core = core or MetacognitiveCore(frequency_tracker=frequency_tracker)
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_memory_bytes = max_memory_bytes
+        # در زمان حذف جلسه با (شناسه جلسه، جلسه، دلیل) فراخوانی می‌شود
+        self.on_evict = on_evict
+        self.clock = clock
+        self.user_store = user_store
+        self.size_sample_interval = size_sample_interval
+        self.sessions = OrderedDict()
+        self.total_bytes = 0
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._lock = threading.RLock()
+
+    def get_session(self, session_id):
+        """دریافت جلسه (در صورت نبود یا انقضا، جلسه تازه ساخته می‌شود)"""
+        now = self.clock()
+        with self._lock:
+            self._expire_idle(now)
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self.counters["hits"] += 1
+                self.sessions.move_to_end(session_id)
+            else:
+                self.counters["misses"] += 1
+                session = Session(session_id, self.core.new_session_view(), now)
+                if self.user_store is not None:
+                    self.user_store.load(session_id, session.core.user_mental_model)
+                session.module_bytes = self._measure_modules(session)
+                session.size_bytes = self._size(session)
+                self.sessions[session_id] = session
+                self.total_bytes += session.size_bytes
+                self._enforce_limits()
+            session.last_access = now
+            return session
+
+    def process_input(self, session_id, user_input, context=None, latency_budget=None):
+        """پردازش ورودی در جلسه کاربر"""
+        session = self.get_session(session_id)
+        with session.lock:
+            result = session.core.process_input(user_input, context, latency_budget)
+            self._account(session)
+        return result
+
+    async def process_input_async(self, session_id, user_input, context=None, latency_budget=None):
+        """نسخه coroutine پردازش ورودی در جلسه کاربر
+
+        درخواست‌های ناهمگام یک جلسه با session.async_lock به ترتیب اجرا می‌شوند. قفل رشته‌ای
+        جلسه در حین await نگه داشته نمی‌شود (حلقه رویداد را مسدود می‌کرد)، پس یک جلسه نباید
+        همزمان از مسیر همگام (process_input) و ناهمگام استفاده شود.
+        """
+        session = self.get_session(session_id)
+        async with session.async_lock:
+            result = await session.core.process_input_async(user_input, context, latency_budget)
+            self._account(session)
+        return result
+
+    def drop_session(self, session_id):
+        """حذف صریح یک جلسه"""
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self._remove(session_id, "dropped")
+            return session
+
+    def _account(self, session):
+        """به‌روزرسانی اندازه جلسه پس از یک تعامل و اعمال سقف‌ها"""
+        session.requests += 1
+        if self.user_store is not None:
+            self.user_store.mark_dirty(session.session_id, session.core.user_mental_model)
+        requests = session.requests
+        if requests % self.size_sample_interval == 0 or requests & (requests - 1) == 0:
+            session.module_bytes = self._measure_modules(session)
+        size = self._size(session)
+        with self._lock:
+            if self.sessions.get(session.session_id) is session:
+                self.total_bytes += size - session.size_bytes
+                session.size_bytes = size
+                self._enforce_limits()
+            else:
+                session.size_bytes = size
+
+    @staticmethod
+    def _measure_modules(session):
+        """اندازه کامل ماژول‌های جلسه (پرهزینه؛ فقط در نمونه‌ها)"""
+        core = session.core
+        return sum(deep_sizeof(getattr(core, name)) for name in core.system_state["active_modules"])
+
+    @staticmethod
+    def _size(session):
+        """اندازه تقریبی جلسه: آخرین اندازه ماژول‌ها و اندیس تاریخچه (محتوای آن روی دیسک است)"""
+        return session.module_bytes + session.core.interaction_history.memory_bytes()
+
+    def _expire_idle(self, now):
+        """حذف جلسه‌های بیکار؛ قدیمی‌ترین دسترسی‌ها در ابتدای ترتیب LRU هستند"""
+        if self.idle_ttl is None:
+            return
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if now - session.last_access <= self.idle_ttl:
+                break
+            self._remove(session_id, "expired")
+
+    def _enforce_limits(self):
+        """حذف کم‌استفاده‌ترین جلسه‌ها تا رعایت سقف تعداد و حافظه"""
+        while len(self.sessions) > self.max_sessions or (
+            self.max_memory_bytes is not None
+            and self.total_bytes > self.max_memory_bytes
+            and len(self.sessions) > 1
+        ):
+            session_id = next(iter(self.sessions))
+            self._remove(session_id, "evicted")
+
+    def _remove(self, session_id, reason):
+        session = self.sessions.pop(session_id)
+        self.total_bytes -= session.size_bytes
+        if reason == "expired":
+            self.counters["expirations"] += 1
+        elif reason == "evicted":
+            self.counters["evictions"] += 1
+        if self.user_store is not None:
+            self.user_store.release(session_id)
+        if self.on_evict:
+            self.on_evict(session_id, session, reason)
+        if reason != "dropped":
+            # جلسه حذف شده دیگر استفاده نمی‌شود؛ نگاشت‌ها و پوشه موقت لاگ آن آزاد می‌شوند
+            session.core.interaction_history.close()
+
+    def maintain(self):
+        """نگهداری دوره‌ای (مثلاً هر ثانیه): حذف جلسه‌های منقضی و flush تغییرات منتظر ذخیره‌ساز"""
+        expired = self.evict_expired()
+        if self.user_store is not None:
+            self.user_store.flush_if_due()
+        return expired
+
+    def close(self):
+        """حذف همه جلسه‌ها، بستن لاگ‌هایشان و نوشتن تغییرات منتظر و بستن user_store"""
+        with self._lock:
+            for session_id in list(self.sessions):
+                self._remove(session_id, "closed")
+            if self.user_store is not None:
+                self.user_store.close()
+
+    def evict_expired(self):
+        """حذف دستی همه جلسه‌های منقضی شده"""
+        with self._lock:
+            before = len(self.sessions)
+            self._expire_idle(self.clock())
+            return before - len(self.sessions)
+
+    def stats(self):
+        """آمار اشغال و نرخ برخورد"""
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                "sessions": len(self.sessions),
+                "max_sessions": self.max_sessions,
+                "occupancy": len(self.sessions) / self.max_sessions if self.max_sessions else 0.0,
+                "memory_bytes": self.total_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "hit_rate": self.counters["hits"] / lookups if lookups else 0.0,
+                **self.counters
+            }
@@ -0,0 +1,26 @@
+# ============================================
+# تخمین حافظه اشیا (Sizing)
+# ============================================
+
+import sys
+
+
+def deep_sizeof(obj):
+    """تخمین حافظه یک شیء همراه با اشیای درون آن"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__") and not isinstance(current, type):
+            stack.append(current.__dict__)
+    return total
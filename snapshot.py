@@ -0,0 +1,350 @@
+# ============================================
+# ذخیره و بازیابی وضعیت (Snapshot / Restore)
+# ============================================
+
+import struct
+import zlib
+from collections import UserList
+
+from aggregates import EmotionTracker, RunningStats, SpaceSavingCounter, TopKCounter
+from ring_buffer import RingBuffer
+
+MAGIC = b"MCSN"
+FORMAT_VERSION = 4
+
+# قدیمی‌ترین نسخه‌ای که وضعیت هسته‌اش قابل بازیابی است؛ snapshot‌های پیش از نسخه ۴ وضعیت
+# نسخه‌های ساده ماژول‌ها را دارند که ساختارش با ماژول‌های فعلی فرق دارد
+MIN_STATE_VERSION = 4
+
+# لیست‌هایی با این تعداد عضو یا بیشتر جداگانه ذخیره و هنگام بازیابی با تأخیر رمزگشایی می‌شوند
+LAZY_THRESHOLD = 8
+
+# ماژول‌هایی از هسته که وضعیتشان ذخیره می‌شود
+CORE_MODULES = [
+    "self_awareness",
+    "cognitive_monitoring",
+    "cognitive_control",
+    "performance_evaluation",
+    "user_mental_model"
+]
+
+# برچسب نوع مقادیر در رمزگذاری دودویی
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _STR_REF, _LIST, _DICT, _TUPLE, _BLOB, _RING, _STATE = range(13)
+
+# انواعی که با وضعیت خود (vars) ذخیره و بازسازی می‌شوند
+_STATE_TYPES = {cls.__name__: cls for cls in (EmotionTracker, RunningStats, SpaceSavingCounter, TopKCounter)}
+
+_pack_float = struct.Struct("<d").pack
+_unpack_float = struct.Struct("<d").unpack_from
+
+
+class LazyList(UserList):
+    """لیستی که محتوایش فقط در اولین دسترسی از داده ذخیره شده رمزگشایی می‌شود"""
+
+    def __init__(self, initlist=None, loader=None):
+        self._loader = loader
+        if loader is None:
+            super().__init__(initlist)
+
+    @property
+    def data(self):
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            self.__dict__["data"] = loader()
+        return self.__dict__["data"]
+
+    @data.setter
+    def data(self, value):
+        self._loader = None
+        self.__dict__["data"] = value
+
+    @property
+    def loaded(self):
+        """آیا محتوا رمزگشایی شده است"""
+        return self._loader is None
+
+
+class LazyRingBuffer(RingBuffer):
+    """تاریخچه محدودی که رکوردهایش فقط در اولین دسترسی رمزگشایی می‌شوند
+
+    تا آن لحظه فقط ظرفیت و تابع بارگذاری نگه داشته می‌شود؛ پس از بارگذاری همان
+    RingBuffer معمولی است و هزینه اضافه‌ای ندارد.
+    """
+
+    def __init__(self, capacity, loader):
+        self.capacity = capacity
+        self._loader = loader
+
+    def __getattr__(self, name):
+        # فقط برای ویژگی‌هایی فراخوانی می‌شود که وجود ندارند؛ وضعیت داخلی RingBuffer
+        # با اولین دسترسی ساخته می‌شود
+        if name not in ("_items", "_start", "_size") or "_loader" not in self.__dict__:
+            raise AttributeError(name)
+        RingBuffer.__init__(self, self.capacity, self.__dict__.pop("_loader")())
+        return getattr(self, name)
+
+    @property
+    def loaded(self):
+        """آیا رکوردها رمزگشایی شده‌اند"""
+        return "_loader" not in self.__dict__
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, position):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+class _Encoder:
+    """رمزگذار فشرده با ارجاع به رشته‌های تکراری"""
+
+    def __init__(self, blobs=None):
+        self.out = bytearray()
+        self.strings = {}
+        # اگر blobs داده شود، لیست‌های بزرگ به صورت جداگانه ذخیره می‌شوند
+        self.blobs = blobs
+
+    def encode(self, value):
+        out = self.out
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _pack_float(value)
+        elif isinstance(value, str):
+            index = self.strings.get(value)
+            if index is not None:
+                out.append(_STR_REF)
+                _write_varint(out, index)
+            else:
+                self.strings[value] = len(self.strings)
+                encoded = value.encode("utf-8")
+                out.append(_STR)
+                _write_varint(out, len(encoded))
+                out += encoded
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                self.encode(key)
+                self.encode(item)
+        elif isinstance(value, (list, UserList)):
+            if self.blobs is not None and len(value) >= LAZY_THRESHOLD:
+                blob = _Encoder()
+                blob.encode_items(value)
+                out.append(_BLOB)
+                _write_varint(out, len(self.blobs))
+                self.blobs.append(bytes(blob.out))
+            else:
+                out.append(_LIST)
+                self.encode_items(value)
+        elif isinstance(value, tuple):
+            out.append(_TUPLE)
+            self.encode_items(value)
+        elif isinstance(value, RingBuffer):
+            # نسخه ۲: تاریخچه با ظرفیت ثابت (ظرفیت و سپس رکوردها)
+            out.append(_RING)
+            _write_varint(out, value.capacity)
+            self.encode(list(value))
+        elif type(value).__name__ in _STATE_TYPES:
+            # نسخه ۳: اشیای آماری (نام نوع و سپس وضعیت)
+            out.append(_STATE)
+            self.encode(type(value).__name__)
+            self.encode(value.__getstate__() if hasattr(value, "__getstate__") else vars(value))
+        else:
+            raise TypeError(f"نوع {type(value).__name__} قابل ذخیره نیست")
+
+    def encode_items(self, items):
+        _write_varint(self.out, len(items))
+        for item in items:
+            self.encode(item)
+
+
+class _Decoder:
+    """رمزگشای متناظر با _Encoder"""
+
+    def __init__(self, data, blob_loader=None):
+        self.data = data
+        self.position = 0
+        self.strings = []
+        self.blob_loader = blob_loader
+
+    def decode(self):
+        data = self.data
+        tag = data[self.position]
+        self.position += 1
+        if tag == _NONE:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _INT:
+            value, self.position = _read_varint(data, self.position)
+            return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+        if tag == _FLOAT:
+            value = _unpack_float(data, self.position)[0]
+            self.position += 8
+            return value
+        if tag == _STR:
+            length, self.position = _read_varint(data, self.position)
+            end = self.position + length
+            value = bytes(data[self.position:end]).decode("utf-8")
+            self.position = end
+            self.strings.append(value)
+            return value
+        if tag == _STR_REF:
+            index, self.position = _read_varint(data, self.position)
+            return self.strings[index]
+        if tag == _DICT:
+            count, self.position = _read_varint(data, self.position)
+            result = {}
+            for _ in range(count):
+                key = self.decode()
+                result[key] = self.decode()
+            return result
+        if tag == _LIST:
+            return self.decode_items()
+        if tag == _TUPLE:
+            return tuple(self.decode_items())
+        if tag == _BLOB:
+            index, self.position = _read_varint(data, self.position)
+            return self.blob_loader(index)
+        if tag == _RING:
+            capacity, self.position = _read_varint(data, self.position)
+            items = self.decode()
+            if isinstance(items, LazyList) and not items.loaded:
+                return LazyRingBuffer(capacity, lambda: items)
+            return RingBuffer(capacity, items)
+        if tag == _STATE:
+            cls = _STATE_TYPES[self.decode()]
+            value = cls.__new__(cls)
+            state = self.decode()
+            if hasattr(value, "__setstate__"):
+                value.__setstate__(state)
+            else:
+                vars(value).update(state)
+            return value
+        raise ValueError(f"برچسب نامعتبر در داده ذخیره شده: {tag}")
+
+    def decode_items(self):
+        count, self.position = _read_varint(self.data, self.position)
+        return [self.decode() for _ in range(count)]
+
+
+def encode_value(value):
+    """رمزگذاری یک مقدار بدون سرآیند و فشرده‌سازی (برای رکوردهای کوچک)"""
+    encoder = _Encoder()
+    encoder.encode(value)
+    return bytes(encoder.out)
+
+
+def decode_value(data):
+    """رمزگشایی خروجی encode_value"""
+    return _Decoder(data).decode()
+
+
+def dumps(value, compress=True):
+    """رمزگذاری یک مقدار به قالب دودویی نسخه‌دار"""
+    blobs = []
+    root = _Encoder(blobs)
+    root.encode(value)
+
+    sections = [bytes(root.out)] + blobs
+    if compress:
+        sections = [zlib.compress(section) for section in sections]
+
+    out = bytearray(MAGIC)
+    out.append(FORMAT_VERSION)
+    out.append(1 if compress else 0)
+    _write_varint(out, len(sections))
+    for section in sections:
+        _write_varint(out, len(section))
+    for section in sections:
+        out += section
+    return bytes(out)
+
+
+def loads(data, lazy=True):
+    """رمزگشایی قالب دودویی؛ لیست‌های بزرگ تا اولین دسترسی رمزگشایی نمی‌شوند"""
+    data = memoryview(data)
+    if bytes(data[:4]) != MAGIC:
+        raise ValueError("داده ذخیره شده معتبر نیست")
+    version = data[4]
+    if version > FORMAT_VERSION:
+        raise ValueError(f"نسخه {version} قالب ذخیره پشتیبانی نمی‌شود")
+    compressed = bool(data[5])
+
+    count, position = _read_varint(data, 6)
+    lengths = []
+    for _ in range(count):
+        length, position = _read_varint(data, position)
+        lengths.append(length)
+    sections = []
+    for length in lengths:
+        sections.append(data[position:position + length])
+        position += length
+
+    def section_bytes(index):
+        section = sections[index]
+        return zlib.decompress(section) if compressed else section
+
+    def load_blob(index):
+        return _Decoder(section_bytes(index + 1)).decode_items()
+
+    def blob_loader(index):
+        if lazy:
+            return LazyList(loader=lambda: load_blob(index))
+        return load_blob(index)
+
+    return _Decoder(section_bytes(0), blob_loader).decode()
+
+
+def snapshot_state(core):
+    """جمع‌آوری وضعیت کامل هسته و ماژول‌هایش"""
+    return {
+        "format_version": FORMAT_VERSION,
+        "system_state": core.system_state,
+        "interaction_history": list(core.interaction_history),
+        "interaction_count": len(core.interaction_history),
+        "quality_stats": core.quality_stats,
+        "modules": {name: vars(getattr(core, name)) for name in CORE_MODULES}
+    }
+
+
+def restore_state(core, state):
+    """بازگرداندن وضعیت ذخیره شده روی یک هسته (snapshot‌های قدیمی‌تر از MIN_STATE_VERSION رد می‌شوند)"""
+    version = state.get("format_version", 0)
+    if version < MIN_STATE_VERSION:
+        raise ValueError(
+            f"وضعیت ذخیره شده با نسخه {version} قالب با ماژول‌های فعلی سازگار نیست "
+            f"(حداقل نسخه {MIN_STATE_VERSION})"
+        )
+    core.system_state = state["system_state"]
+    # لاگ هسته لیست تنبل تاریخچه را بدون رمزگشایی و نوشتن دوباره می‌پذیرد
+    core.interaction_history.adopt(state["interaction_history"], state["interaction_count"])
+    core.quality_stats = state["quality_stats"]
+    for name, module_state in state["modules"].items():
+        if name in CORE_MODULES:
+            vars(getattr(core, name)).update(module_state)
+    return core
@@ -0,0 +1,194 @@
+# ============================================
+# زمان‌بند مراحل (Stage Scheduler)
+# ============================================
+
+import time
+
+
+class Stage:
+    """یک مرحله از خط لوله با مجموعه منابعی که می‌خواند و می‌نویسد"""
+
+    def __init__(self, name, func, reads=(), writes=(), kind="cpu", async_func=None, optional=False):
+        self.name = name
+        self.func = func
+        # نسخه coroutine مرحله (در صورت وجود) برای اجرای ناهمگام
+        self.async_func = async_func
+        self.reads = frozenset(reads)
+        self.writes = frozenset(writes)
+        # cpu: محاسباتی، io: منتظر منبع بیرونی (مثلاً مولد واقعی پاسخ)
+        self.kind = kind
+        # مرحله اختیاری در حالت سریع یا با کمبود بودجه زمانی حذف می‌شود؛
+        # مراحل بعدی نباید به خروجی آن نیاز داشته باشند
+        self.optional = optional
+
+    def conflicts_with(self, other):
+        """آیا این مرحله و مرحله دیگر نباید همزمان اجرا شوند"""
+        return bool(
+            self.writes & (other.reads | other.writes)
+            or self.reads & other.writes
+        )
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+class StageScheduler:
+    """اجرای مراحل به صورت گراف وابستگی (DAG)
+
+    ترتیب تعریف مراحل اولویت را مشخص می‌کند: هر مرحله به مراحل قبلی که با آن
+    تداخل خواندن/نوشتن دارند وابسته است و بقیه می‌توانند همزمان اجرا شوند.
+    
+    تابع اختیاری skip(stage، state، completed) درست پیش از شروع هر مرحله اختیاری
+    فراخوانی می‌شود (completed: زمان مراحل تمام شده) و با True آن مرحله اجرا نمی‌شود.
+    """
+
+    def __init__(self, stages, executor=None):
+        self.stages = list(stages)
+        self.executor = executor
+        self.dependencies = {}
+        for index, stage in enumerate(self.stages):
+            self.dependencies[stage.name] = {
+                earlier.name for earlier in self.stages[:index]
+                if earlier.conflicts_with(stage)
+            }
+
+    def levels(self):
+        """گروه‌بندی مراحل در موج‌هایی که اعضای هر موج مستقل از هم هستند"""
+        depth = {}
+        for stage in self.stages:
+            depth[stage.name] = 1 + max(
+                (depth[dependency] for dependency in self.dependencies[stage.name]),
+                default=-1
+            )
+        waves = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for stage in self.stages:
+            waves[depth[stage.name]].append(stage.name)
+        return waves
+
+    def _run_stage(self, stage, state):
+        started = time.perf_counter()
+        outputs = stage.func(state)
+        return outputs, time.perf_counter() - started
+
+    def _should_skip(self, stage, state, durations, skip):
+        return stage.optional and skip is not None and skip(stage, state, durations)
+
+    def run(self, state, skip=None):
+        """اجرای مراحل روی state و بازگرداندن (state، گزارش زمان‌بندی)"""
+        started = time.perf_counter()
+        durations = {}
+        skipped = []
+
+        if self.executor is None:
+            for stage in self.stages:
+                if self._should_skip(stage, state, durations, skip):
+                    skipped.append(stage.name)
+                    continue
+                outputs, durations[stage.name] = self._run_stage(stage, state)
+                if outputs:
+                    state.update(outputs)
+        else:
+            from concurrent.futures import FIRST_COMPLETED, wait
+
+            remaining = {stage.name: set(self.dependencies[stage.name]) for stage in self.stages}
+            by_name = {stage.name: stage for stage in self.stages}
+            running = {}
+            try:
+                while remaining or running:
+                    ready = [name for name, deps in remaining.items() if not deps]
+                    while ready:
+                        name = ready.pop(0)
+                        del remaining[name]
+                        if self._should_skip(by_name[name], state, durations, skip):
+                            # مرحله حذف شده بلافاصله تمام شده حساب می‌شود
+                            skipped.append(name)
+                            for other, deps in remaining.items():
+                                deps.discard(name)
+                                if not deps and other not in ready:
+                                    ready.append(other)
+                            continue
+                        future = self.executor.submit(self._run_stage, by_name[name], state)
+                        running[future] = name
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        outputs, durations[name] = future.result()
+                        if outputs:
+                            state.update(outputs)
+                        for deps in remaining.values():
+                            deps.discard(name)
+            finally:
+                for future in running:
+                    future.cancel()
+
+        return state, self._timing_report(durations, time.perf_counter() - started, skipped)
+
+    async def run_async(self, state, skip=None):
+        """اجرای مراحل به صورت وظایف asyncio؛ مراحل همگام در executor اجرا می‌شوند"""
+        # asyncio فقط در مسیر ناهمگام لازم است و هنگام import بارگذاری نمی‌شود
+        import asyncio
+        import inspect
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        durations = {}
+        skipped = []
+        tasks = {}
+
+        async def run_one(stage):
+            for dependency in self.dependencies[stage.name]:
+                await tasks[dependency]
+            if self._should_skip(stage, state, durations, skip):
+                skipped.append(stage.name)
+                return
+            stage_started = time.perf_counter()
+            if stage.async_func is not None:
+                outputs = await stage.async_func(state)
+            elif inspect.iscoroutinefunction(stage.func):
+                outputs = await stage.func(state)
+            elif self.executor is not None:
+                outputs = await loop.run_in_executor(self.executor, stage.func, state)
+            else:
+                outputs = stage.func(state)
+            durations[stage.name] = time.perf_counter() - stage_started
+            if outputs:
+                state.update(outputs)
+
+        for stage in self.stages:
+            tasks[stage.name] = asyncio.ensure_future(run_one(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        return state, self._timing_report(durations, time.perf_counter() - started, skipped)
+
+    def _timing_report(self, durations, wall_time, skipped=()):
+        """محاسبه مسیر بحرانی: طولانی‌ترین زنجیره وابستگی بر اساس زمان‌های اندازه‌گیری شده"""
+        finish = {}
+        previous = {}
+        for stage in self.stages:
+            dependencies = self.dependencies[stage.name]
+            slowest = max(dependencies, key=lambda name: finish[name], default=None)
+            # مرحله حذف شده در مسیر نمی‌آید و زنجیره از وابستگی آن ادامه پیدا می‌کند
+            if slowest in skipped:
+                slowest = previous[slowest]
+            previous[stage.name] = slowest
+            finish[stage.name] = durations.get(stage.name, 0.0) + (finish[slowest] if slowest else 0.0)
+
+        path = []
+        name = max((name for name in finish if name not in skipped), key=finish.get, default=None)
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+
+        return {
+            "wall_time": wall_time,
+            "critical_path_latency": finish[path[0]] if path else 0.0,
+            "critical_path": list(reversed(path)),
+            "stage_durations": durations,
+            "skipped_stages": [stage.name for stage in self.stages if stage.name in skipped]
+        }
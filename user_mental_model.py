@@ -2,8 +2,88 @@
 # بخش ۵: مدل ذهنی کاربر (User Mental Model)
 # ============================================
 
+from aggregates import EmotionTracker, TopKCounter
+from analyzed_text import analyze
+from lexicon import LEXICON
+from ring_buffer import RingBuffer
+
+# نشانه‌های اهداف صریح
+EXPLICIT_GOAL_INDICATORS = {
+    "می‌خواهم بدانم": "دریافت اطلاعات",
+    "نیاز دارم به": "دریافت کمک",
+    "چگونه می‌توانم": "راهنمایی عملی",
+    "لطفاً توضیح بده": "درخواست توضیح",
+    "مقایسه کن": "تحلیل مقایسه‌ای"
+}
+
+# سرنخ‌های اهداف ضمنی
+IMPLICIT_GOAL_CLUES = {
+    "زمان زیادی": "دریافت پاسخ سریع",
+    "ساده بگو": "دریافت توضیح ساده",
+    "مثال بزن": "درک عملی",
+    "منبع": "اطمینان از صحت",
+    "آیا درست است": "تأیید اطلاعات"
+}
+
+# نشانه‌های هر وضعیت عاطفی
+EMOTIONAL_INDICATORS = {
+    "happy": ["ممنون", "عالی", "خیلی خوب", "آفرین", ":)"],
+    "frustrated": ["خسته شدم", "پیچیده است", "نمی‌فهمم", "سخت است", ":( "],
+    "curious": ["جالب است", "چرا", "چگونه", "می‌خواهم بدانم", "؟"],
+    "urgent": ["فوری", "سریع", "الان", "همین حالا", "!!!"],
+    "confused": ["منظورت چیست", "نمی‌فهمم", "اشتباه است", "سوال دارم"]
+}
+
+# موضوعات رایج قابل تشخیص
+COMMON_TOPICS = [
+    "هوش مصنوعی", "یادگیری ماشین", "برنامه‌نویسی", "ریاضی", 
+    "علم داده", "شبکه‌های عصبی", "پردازش زبان طبیعی"
+]
+TOPIC_WINDOW = max(len(topic) for topic in COMMON_TOPICS)
+
+# نشانه‌های شکاف دانش
+GAP_INDICATORS = [
+    "چیست", "چگونه", "چرا", "معنی",
+    "نمی‌دانم", "نفهمیدم", "توضیح بده"
+]
+
+# نشانه‌های انواع سوالات
+QUESTION_TYPES = {
+    "تعریفی": ["چیست", "معنی", "تعریف"],
+    "روشی": ["چگونه", "روش", "طریقه"],
+    "علتی": ["چرا", "علت", "دلیل"],
+    "مقایسه‌ای": ["تفاوت", "مقایسه", "کدام بهتر"]
+}
+
+LEXICON.register(EXPLICIT_GOAL_INDICATORS)
+LEXICON.register(IMPLICIT_GOAL_CLUES)
+LEXICON.register([indicator for indicators in EMOTIONAL_INDICATORS.values() for indicator in indicators])
+LEXICON.register(COMMON_TOPICS)
+LEXICON.register(GAP_INDICATORS)
+LEXICON.register([indicator for indicators in QUESTION_TYPES.values() for indicator in indicators])
+
+# ظرفیت پیش‌فرض تاریخچه‌ها (قابل تغییر از طریق history_capacities)
+HISTORY_CAPACITIES = {
+    "goal_history": 15,
+    "knowledge_gaps": 50
+}
+
+# پارامترهای دنبال کردن وضعیت عاطفی گفتگو (قابل تغییر از طریق emotion_tracking)
+EMOTION_TRACKING = {
+    "decay": 0.7,  # سهم امتیاز قبلی در هر نوبت
+    "window": 3,  # تعداد نوبت‌های اخیر برای تأیید هیجان تکراری
+    "enter_threshold": 0.25,  # امتیاز لازم برای خروج از neutral (یک نوبت با هیجان روشن)
+    "exit_threshold": 0.1,  # امتیاز کمتر از این، بازگشت به neutral
+    "switch_margin": 0.15  # برتری لازم برای تغییر از یک هیجان به هیجان دیگر
+}
+
+
 class UserMentalModel:
-    def __init__(self):
+    def __init__(self, history_capacities=None, frequency_tracker=None, emotion_tracking=None):
+        capacities = {**HISTORY_CAPACITIES, **(history_capacities or {})}
+        # سازنده شمارنده‌های پرتکرار؛ پیش‌فرض شمارنده دقیق، برای حافظه ثابت:
+        # frequency_tracker=lambda: SpaceSavingCounter(capacity=1000)
+        frequency_tracker = frequency_tracker or TopKCounter
         self.user_profile = {
             "identity": {"name": None, "recognized": False},
             "expertise_level": "unknown",  # beginner, intermediate, expert
@@ -14,16 +94,16 @@ class UserMentalModel:
         self.user_goals = {
             "explicit_goals": [],
             "implicit_goals": [],
-            "goal_history": []
+            "goal_history": RingBuffer(capacities["goal_history"])
         }
         self.user_knowledge = {
             "known_topics": [],
-            "knowledge_gaps": [],
+            "knowledge_gaps": RingBuffer(capacities["knowledge_gaps"]),
             "misconceptions": []
         }
         self.interaction_patterns = {
-            "frequent_topics": {},
-            "question_types": {},
+            "frequent_topics": frequency_tracker(),
+            "question_types": frequency_tracker(),
             "preferred_detail_level": "medium"
         }
         self.prediction_engine = {
@@ -31,6 +111,8 @@ class UserMentalModel:
             "likely_needs": [],
             "potential_confusions": []
         }
+        # وضعیت عاطفی گفتگو در طول نوبت‌ها؛ user_profile["emotional_state"] از آن خوانده می‌شود
+        self.emotion_tracker = EmotionTracker(**{**EMOTION_TRACKING, **(emotion_tracking or {})})
     
     def understand_user_goals(self, user_input, interaction_context):
         """درک اهداف و نیات کاربر"""
@@ -39,30 +121,16 @@ class UserMentalModel:
             "implicit": []
         }
         
-        # تشخیص اهداف صریح
-        explicit_goal_indicators = {
-            "می‌خواهم بدانم": "دریافت اطلاعات",
-            "نیاز دارم به": "دریافت کمک",
-            "چگونه می‌توانم": "راهنمایی عملی",
-            "لطفاً توضیح بده": "درخواست توضیح",
-            "مقایسه کن": "تحلیل مقایسه‌ای"
-        }
+        found = analyze(user_input).keywords
         
-        for indicator, goal in explicit_goal_indicators.items():
-            if indicator in user_input:
+        # تشخیص اهداف صریح
+        for indicator, goal in EXPLICIT_GOAL_INDICATORS.items():
+            if indicator in found:
                 goals_identified["explicit"].append(goal)
         
         # استنباط اهداف ضمنی
-        implicit_goal_clues = {
-            "زمان زیادی": "دریافت پاسخ سریع",
-            "ساده بگو": "دریافت توضیح ساده",
-            "مثال بزن": "درک عملی",
-            "منبع": "اطمینان از صحت",
-            "آیا درست است": "تأیید اطلاعات"
-        }
-        
-        for clue, goal in implicit_goal_clues.items():
-            if clue in user_input:
+        for clue, goal in IMPLICIT_GOAL_CLUES.items():
+            if clue in found:
                 goals_identified["implicit"].append(goal)
         
         # به‌روزرسانی تاریخچه اهداف
@@ -74,10 +142,6 @@ class UserMentalModel:
         }
         self.user_goals["goal_history"].append(goal_record)
         
-        # حفظ اندازه معقول تاریخچه
-        if len(self.user_goals["goal_history"]) > 15:
-            self.user_goals["goal_history"] = self.user_goals["goal_history"][-15:]
-        
         # به‌روزرسانی اهداف جاری
         self.user_goals["explicit_goals"] = goals_identified["explicit"]
         self.user_goals["implicit_goals"] = goals_identified["implicit"]
@@ -85,22 +149,19 @@ class UserMentalModel:
         return goals_identified
     
     def detect_emotional_state(self, user_input, previous_interactions=None):
-        """تشخیص وضعیت عاطفی کاربر"""
-        emotional_indicators = {
-            "happy": ["ممنون", "عالی", "خیلی خوب", "آفرین", ":)"],
-            "frustrated": ["خسته شدم", "پیچیده است", "نمی‌فهمم", "سخت است", ":( "],
-            "curious": ["جالب است", "چرا", "چگونه", "می‌خواهم بدانم", "؟"],
-            "urgent": ["فوری", "سریع", "الان", "همین حالا", "!!!"],
-            "confused": ["منظورت چیست", "نمی‌فهمم", "اشتباه است", "سوال دارم"]
-        }
+        """تشخیص وضعیت عاطفی کاربر
         
+        primary_emotion هیجان همین پیام است؛ user_profile["emotional_state"] وضعیت
+        پایدار گفتگو (tracked_emotion) است که از emotion_tracker خوانده می‌شود.
+        """
         detected_emotions = []
         confidence_scores = {}
+        found = analyze(user_input).keywords
         
-        for emotion, indicators in emotional_indicators.items():
+        for emotion, indicators in EMOTIONAL_INDICATORS.items():
             score = 0
             for indicator in indicators:
-                if indicator in user_input:
+                if indicator in found:
                     score += 1
             
             if score > 0:
@@ -113,25 +174,36 @@ class UserMentalModel:
             # انتخاب هیجانی با بیشترین امتیاز
             primary_emotion = max(confidence_scores.items(), key=lambda x: x[1])[0]
         
-        # در نظر گرفتن تعاملات قبلی
+        # در نظر گرفتن تعاملات قبلی (بدون previous_interactions، پنجره نوبت‌های اخیر گفتگو)
         if previous_interactions:
             recent_emotions = [interaction.get("emotion", "neutral") 
                               for interaction in previous_interactions[-3:]]
-            
-            if recent_emotions.count(primary_emotion) >= 2:
-                # تأیید هیجان با توجه به الگوی اخیر
-                confidence_scores[primary_emotion] = min(1.0, confidence_scores.get(primary_emotion, 0) + 0.2)
+            recent_count = recent_emotions.count(primary_emotion)
+        else:
+            recent_count = self.emotion_tracker.count(primary_emotion)
+        
+        # وضعیت گفتگو با شواهد همین نوبت (پیش از تأیید) به‌روز می‌شود
+        tracked_emotion = self.emotion_tracker.observe(confidence_scores, primary_emotion)
         
-        self.user_profile["emotional_state"] = primary_emotion
+        if recent_count >= 2:
+            # تأیید هیجان با توجه به الگوی اخیر
+            confidence_scores[primary_emotion] = min(1.0, confidence_scores.get(primary_emotion, 0) + 0.2)
+        
+        self.user_profile["emotional_state"] = tracked_emotion
         
         return {
             "primary_emotion": primary_emotion,
             "all_detected": detected_emotions,
-            "confidence_scores": confidence_scores
+            "confidence_scores": confidence_scores,
+            "tracked_emotion": tracked_emotion,
+            "emotion_scores": dict(self.emotion_tracker.scores)
         }
     
     def update_user_knowledge_model(self, user_input, system_response, correctness_feedback=None):
         """به‌روزرسانی مدل دانش کاربر"""
+        user_input = analyze(user_input)
+        system_response = analyze(system_response)
+        
         # استخراج موضوعات از تعامل
         topics = self._extract_topics(user_input, system_response)
         
@@ -166,32 +238,26 @@ class UserMentalModel:
     def _extract_topics(self, user_input, system_response):
         """استخراج موضوعات از متن"""
         # در اینجا می‌توان از الگوریتم‌های پیچیده‌تر NLP استفاده کرد
-        common_topics = [
-            "هوش مصنوعی", "یادگیری ماشین", "برنامه‌نویسی", "ریاضی", 
-            "علم داده", "شبکه‌های عصبی", "پردازش زبان طبیعی"
-        ]
-        
         detected_topics = []
-        combined_text = user_input + " " + system_response
+        found = analyze(user_input).keywords | analyze(system_response).keywords
+        # موضوعی که از مرز ورودی و پاسخ عبور می‌کند فقط در این پنجره کوچک دیده می‌شود
+        boundary = user_input[-TOPIC_WINDOW:] + " " + system_response[:TOPIC_WINDOW]
         
-        for topic in common_topics:
-            if topic in combined_text:
+        for topic in COMMON_TOPICS:
+            if topic in found or topic in boundary:
                 detected_topics.append(topic)
         
         return detected_topics
     
     def _identify_knowledge_gaps(self, user_input, system_response):
         """شناسایی شکاف‌های دانش"""
-        gap_indicators = [
-            "چیست", "چگونه", "چرا", "معنی",
-            "نمی‌دانم", "نفهمیدم", "توضیح بده"
-        ]
-        
         gaps = []
-        for indicator in gap_indicators:
-            if indicator in user_input:
+        user_input = analyze(user_input)
+        found = user_input.keywords
+        for indicator in GAP_INDICATORS:
+            if indicator in found:
                 # استخراج موضوع مرتبط
-                words = user_input.split()
+                words = user_input.tokens
                 for i, word in enumerate(words):
                     if indicator in word and i > 0:
                         context_topic = words[i-1]
@@ -216,30 +282,24 @@ class UserMentalModel:
     
     def _analyze_interaction_patterns(self, user_input, system_response):
         """تحلیل الگوهای تعامل"""
+        user_input = analyze(user_input)
+        
         # تحلیل موضوعات پرتکرار
-        words = user_input.split()
+        words = user_input.tokens
         for word in words:
             if len(word) > 3:  # نادیده گرفتن کلمات خیلی کوتاه
-                self.interaction_patterns["frequent_topics"][word] = \
-                    self.interaction_patterns["frequent_topics"].get(word, 0) + 1
+                self.interaction_patterns["frequent_topics"].increment(word)
         
         # تحلیل انواع سوالات
-        question_types = {
-            "تعریفی": ["چیست", "معنی", "تعریف"],
-            "روشی": ["چگونه", "روش", "طریقه"],
-            "علتی": ["چرا", "علت", "دلیل"],
-            "مقایسه‌ای": ["تفاوت", "مقایسه", "کدام بهتر"]
-        }
-        
-        for q_type, indicators in question_types.items():
+        found = user_input.keywords
+        for q_type, indicators in QUESTION_TYPES.items():
             for indicator in indicators:
-                if indicator in user_input:
-                    self.interaction_patterns["question_types"][q_type] = \
-                        self.interaction_patterns["question_types"].get(q_type, 0) + 1
+                if indicator in found:
+                    self.interaction_patterns["question_types"].increment(q_type)
                     break
         
         # تحلیل سطح جزئیات مورد علاقه
-        word_count = len(system_response.split())
+        word_count = analyze(system_response).word_count
         if word_count < 50:
             detail_level = "low"
         elif word_count < 150:
@@ -280,7 +340,7 @@ class UserMentalModel:
         
         # پیش‌بینی بر اساس الگوهای تاریخی
         if self.user_goals["goal_history"]:
-            recent_goals = [goal["goals"] for goal in self.user_goals["goal_history"][-3:]]
+            recent_goals = [goal["goals"] for goal in self.user_goals["goal_history"].recent(3)]
             
             # تحلیل تکراری بودن اهداف
             goal_counts = {}
@@ -308,57 +368,60 @@ class UserMentalModel:
             "emotional_state": self.user_profile["emotional_state"],
             "known_topics_count": len(self.user_knowledge["known_topics"]),
             "knowledge_gaps_count": len(self.user_knowledge["knowledge_gaps"]),
-            "frequent_topics": sorted(
-                self.interaction_patterns["frequent_topics"].items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:5]
+            "frequent_topics": self.interaction_patterns["frequent_topics"].most_common(5)
         }
         
         return summary
 
+
 # تست بخش مدل ذهنی کاربر
-print("=" * 50)
-print("تست بخش ۵: مدل ذهنی کاربر")
-print("=" * 50)
+def demo():
+    """دموی بخش مدل ذهنی کاربر"""
+    print("=" * 50)
+    print("تست بخش ۵: مدل ذهنی کاربر")
+    print("=" * 50)
+
+    user_model = UserMentalModel()
+
+    # تست درک اهداف کاربر
+    user_input = "می‌خواهم بدانم هوش مصنوعی چگونه کار می‌کند"
+    goals = user_model.understand_user_goals(user_input, {"topic": "هوش مصنوعی"})
+    print(f"اهداف شناسایی شده برای '{user_input}':")
+    print(f"  - صریح: {goals['explicit']}")
+    print(f"  - ضمنی: {goals['implicit']}")
 
-user_model = UserMentalModel()
+    # تست تشخیص وضعیت عاطفی
+    emotional_state = user_model.detect_emotional_state("خیلی ممنون! پاسخ شما عالی بود :)")
+    print(f"\nوضعیت عاطفی تشخیص داده شده: {emotional_state['primary_emotion']}")
+    print(f"  - تمام هیجانات: {emotional_state['all_detected']}")
 
-# تست درک اهداف کاربر
-user_input = "می‌خواهم بدانم هوش مصنوعی چگونه کار می‌کند"
-goals = user_model.understand_user_goals(user_input, {"topic": "هوش مصنوعی"})
-print(f"اهداف شناسایی شده برای '{user_input}':")
-print(f"  - صریح: {goals['explicit']}")
-print(f"  - ضمنی: {goals['implicit']}")
+    # تست به‌روزرسانی مدل دانش
+    knowledge_update = user_model.update_user_knowledge_model(
+        "یادگیری ماشین چیست؟",
+        "یادگیری ماشین شاخه‌ای از هوش مصنوعی است که...",
+        correctness_feedback=None
+    )
+    print(f"\nبه‌روزرسانی مدل دانش:")
+    print(f"  - موضوعات به‌روز شده: {knowledge_update['topics_updated']}")
+    print(f"  - شکاف‌های شناسایی شده: {knowledge_update['knowledge_gaps_identified']}")
 
-# تست تشخیص وضعیت عاطفی
-emotional_state = user_model.detect_emotional_state("خیلی ممنون! پاسخ شما عالی بود :)")
-print(f"\nوضعیت عاطفی تشخیص داده شده: {emotional_state['primary_emotion']}")
-print(f"  - تمام هیجانات: {emotional_state['all_detected']}")
+    # تست پیش‌بینی نیازهای آینده
+    user_model.user_profile["expertise_level"] = "beginner"
+    user_model.user_profile["emotional_state"] = "curious"
+    predictions = user_model.predict_future_needs("هوش مصنوعی چیست؟", user_model.user_profile)
+    print(f"\nپیش‌بینی نیازهای آینده:")
+    print(f"  - سوالات احتمالی بعدی: {predictions['next_questions']}")
+    print(f"  - نیازهای محتمل: {predictions['likely_needs']}")
+    print(f"  - سوءتفاهم‌های احتمالی: {predictions['potential_confusions']}")
 
-# تست به‌روزرسانی مدل دانش
-knowledge_update = user_model.update_user_knowledge_model(
-    "یادگیری ماشین چیست؟",
-    "یادگیری ماشین شاخه‌ای از هوش مصنوعی است که...",
-    correctness_feedback=None
-)
-print(f"\nبه‌روزرسانی مدل دانش:")
-print(f"  - موضوعات به‌روز شده: {knowledge_update['topics_updated']}")
-print(f"  - شکاف‌های شناسایی شده: {knowledge_update['knowledge_gaps_identified']}")
+    # تست خلاصه پروفایل
+    profile_summary = user_model.get_user_profile_summary()
+    print(f"\nخلاصه پروفایل کاربر:")
+    for key, value in profile_summary.items():
+        print(f"  - {key}: {value}")
 
-# تست پیش‌بینی نیازهای آینده
-user_model.user_profile["expertise_level"] = "beginner"
-user_model.user_profile["emotional_state"] = "curious"
-predictions = user_model.predict_future_needs("هوش مصنوعی چیست؟", user_model.user_profile)
-print(f"\nپیش‌بینی نیازهای آینده:")
-print(f"  - سوالات احتمالی بعدی: {predictions['next_questions']}")
-print(f"  - نیازهای محتمل: {predictions['likely_needs']}")
-print(f"  - سوءتفاهم‌های احتمالی: {predictions['potential_confusions']}")
+    print("\n✓ بخش مدل ذهنی کاربر با موفقیت تست شد\n")
 
-# تست خلاصه پروفایل
-profile_summary = user_model.get_user_profile_summary()
-print(f"\nخلاصه پروفایل کاربر:")
-for key, value in profile_summary.items():
-    print(f"  - {key}: {value}")
 
-print("\n✓ بخش مدل ذهنی کاربر با موفقیت تست شد\n")
\ No newline at end of file
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,184 @@
+# ============================================
+# ذخیره‌سازی ماندگار مدل ذهنی کاربران (User Model Store)
+# ============================================
+#
+# بخش‌های PERSISTED_SECTIONS از UserMentalModel هر کاربر هنگام ساخت جلسه بارگذاری
+# می‌شوند. پس از هر تعامل فقط جلسه «کثیف» علامت می‌خورد؛ در زمان flush هر بخش
+# رمزگذاری و با اثر انگشت آخرین نسخه نوشته شده مقایسه می‌شود و فقط بخش‌های تغییر
+# کرده، همه در یک تراکنش، نوشته می‌شوند.
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+from snapshot import decode_value, encode_value
+
+# بخش‌هایی از مدل ذهنی کاربر که ذخیره می‌شوند (prediction_engine در هر نوبت بازسازی می‌شود)
+PERSISTED_SECTIONS = ["user_profile", "user_goals", "user_knowledge", "interaction_patterns", "emotion_tracker"]
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class UserModelStore:
+    """رابط ذخیره‌سازی مدل‌های کاربر با تشخیص بخش‌های تغییر کرده و نوشتن دسته‌ای
+
+    زیرکلاس‌ها فقط _read (بخش‌های ذخیره شده یک کاربر) و _write (یک دسته ردیف) را
+    پیاده می‌کنند. flush با گذشت flush_interval ثانیه از flush قبلی یا رسیدن تعداد
+    جلسه‌های کثیف به max_dirty، در همان فراخوانی mark_dirty انجام می‌شود؛ بدون ترافیک،
+    flush_if_due (مثلاً از SessionManager.maintain) و close تغییرات منتظر را می‌نویسند.
+    اگر نوشتن شکست بخورد، جلسه‌های آن دسته برای flush بعدی کثیف می‌مانند.
+    """
+
+    def __init__(self, flush_interval=1.0, max_dirty=1000, clock=time.monotonic):
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        self.clock = clock
+        self.last_flush = clock()
+        # شناسه جلسه -> مدل منتظر نوشتن
+        self._dirty = {}
+        # (شناسه جلسه، بخش) -> اثر انگشت آخرین داده خوانده یا نوشته شده
+        self._digests = {}
+        # جلسه‌های حذف شده که اثر انگشتشان پس از flush کنار گذاشته می‌شود
+        self._released = set()
+        self._lock = threading.RLock()
+        self.counters = {"loads": 0, "hits": 0, "flushes": 0, "sections_written": 0, "sections_unchanged": 0}
+
+    def load(self, session_id, model):
+        """بارگذاری بخش‌های ذخیره شده روی model؛ اگر کاربر ذخیره شده باشد True"""
+        with self._lock:
+            if session_id in self._dirty:
+                # جلسه پیش از نوشته شدن حذف و دوباره ساخته شده است
+                self.flush()
+            self._released.discard(session_id)
+            self.counters["loads"] += 1
+            stored = self._read(session_id)
+            for section, data in stored.items():
+                if section in PERSISTED_SECTIONS:
+                    setattr(model, section, decode_value(data))
+                    self._digests[(session_id, section)] = _digest(data)
+            if stored:
+                self.counters["hits"] += 1
+            return bool(stored)
+
+    def mark_dirty(self, session_id, model):
+        """علامت‌گذاری مدل برای نوشتن در flush بعدی"""
+        with self._lock:
+            self._dirty[session_id] = model
+            if len(self._dirty) >= self.max_dirty:
+                self.flush()
+            else:
+                self.flush_if_due()
+
+    def flush_if_due(self):
+        """flush اگر جلسه کثیفی هست و flush_interval از flush قبلی گذشته است"""
+        with self._lock:
+            if self._dirty and (
+                self.flush_interval is not None and self.clock() - self.last_flush >= self.flush_interval
+            ):
+                return self.flush()
+            return 0
+
+    def release(self, session_id):
+        """جلسه از حافظه حذف شده است؛ تغییرات منتظر همچنان در flush بعدی نوشته می‌شوند"""
+        with self._lock:
+            if session_id in self._dirty:
+                self._released.add(session_id)
+            else:
+                self._forget(session_id)
+
+    def flush(self):
+        """نوشتن بخش‌های تغییر کرده همه جلسه‌های کثیف در یک دسته"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            self.last_flush = self.clock()
+            rows = []
+            digests = {}
+            for session_id, model in dirty.items():
+                for section in PERSISTED_SECTIONS:
+                    data = encode_value(getattr(model, section))
+                    digest = _digest(data)
+                    if self._digests.get((session_id, section)) == digest:
+                        self.counters["sections_unchanged"] += 1
+                        continue
+                    rows.append((session_id, section, data))
+                    digests[(session_id, section)] = digest
+            if rows:
+                try:
+                    self._write(rows)
+                except BaseException:
+                    # دسته نوشته نشده دوباره کثیف می‌شود (علامت‌های تازه‌تر حفظ می‌شوند)
+                    for session_id, model in dirty.items():
+                        self._dirty.setdefault(session_id, model)
+                    raise
+                self._digests.update(digests)
+                self.counters["sections_written"] += len(rows)
+            self.counters["flushes"] += 1
+            for session_id in self._released:
+                self._forget(session_id)
+            self._released.clear()
+            return len(rows)
+
+    def _forget(self, session_id):
+        for section in PERSISTED_SECTIONS:
+            self._digests.pop((session_id, section), None)
+
+    def close(self):
+        self.flush()
+
+    def _read(self, session_id):
+        """بخش‌های ذخیره شده یک کاربر: {نام بخش: داده رمزگذاری شده}"""
+        return {}
+
+    def _write(self, rows):
+        """نوشتن ردیف‌های (شناسه جلسه، بخش، داده)"""
+
+
+class SqliteUserModelStore(UserModelStore):
+    """پیاده‌سازی مرجع روی SQLite (حالت WAL، یک ردیف برای هر بخش هر کاربر)
+
+    دستورهای SQL ثابت‌اند و sqlite3 آن‌ها را یک بار آماده (prepare) و در کش دستورهای
+    اتصال نگه می‌دارد؛ هر flush یک executemany در یک تراکنش است.
+    """
+
+    _CREATE = (
+        "CREATE TABLE IF NOT EXISTS user_model_sections ("
+        " session_id TEXT NOT NULL,"
+        " section TEXT NOT NULL,"
+        " data BLOB NOT NULL,"
+        " updated_at REAL NOT NULL,"
+        " PRIMARY KEY (session_id, section)"
+        ") WITHOUT ROWID"
+    )
+    _SELECT = "SELECT section, data FROM user_model_sections WHERE session_id = ?"
+    _UPSERT = "INSERT OR REPLACE INTO user_model_sections (session_id, section, data, updated_at) VALUES (?, ?, ?, ?)"
+
+    def __init__(self, path, flush_interval=1.0, max_dirty=1000, synchronous="NORMAL", clock=time.monotonic):
+        super().__init__(flush_interval, max_dirty, clock)
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # در حالت WAL، synchronous=NORMAL فقط در checkpoint همگام‌سازی می‌کند
+        self.connection.execute(f"PRAGMA synchronous={synchronous}")
+        self.connection.execute(self._CREATE)
+
+    def _read(self, session_id):
+        return {section: data for section, data in self.connection.execute(self._SELECT, (str(session_id),))}
+
+    def _write(self, rows):
+        now = time.time()
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                self._UPSERT, [(str(session_id), section, data, now) for session_id, section, data in rows]
+            )
+
+    def count(self):
+        """تعداد کاربران ذخیره شده"""
+        return self.connection.execute("SELECT COUNT(DISTINCT session_id) FROM user_model_sections").fetchone()[0]
+
+    def close(self):
+        super().close()
+        self.connection.close()
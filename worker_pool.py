@@ -0,0 +1,170 @@
+# ============================================
+# مجموعه پردازه‌های کارگر (Prefork Worker Pool) با مسیریابی چسبنده جلسه‌ها
+# ============================================
+#
+# وضعیت ماژول‌ها (user_profile، goal_history، frequent_topics و ...) برای اشتراک بین
+# رشته‌ها امن نیست و یک هسته فقط از یک هسته پردازنده استفاده می‌کند. این مجموعه
+# جدول‌ها و واژگان را یک بار در پردازه والد بارگذاری و کامپایل می‌کند، آن‌ها را از
+# جمع‌آوری زباله بیرون می‌گذارد (gc.freeze) تا صفحه‌های حافظه بین کارگرها مشترک
+# (copy-on-write) بمانند و سپس N کارگر fork می‌کند. هر شناسه جلسه با hash پایدار
+# همیشه به یک کارگر ثابت می‌رود و در آن کارگر نمای اختصاصی خود از هسته را دارد
+# (ماژول‌ها و تاریخچه جدا؛ MetacognitiveCore.new_session_view)، پس وضعیت یک جلسه نه
+# بین کارگرها و نه بین جلسه‌های یک کارگر مشترک است. با حذف جلسه (LRU یا بیکاری) وضعیت
+# آن از بین می‌رود، مگر اینکه store_factory مدل ذهنی کاربر را ماندگار کند.
+#
+#     with WorkerPool(workers=4) as pool:
+#         result = pool.process_input("ali", "هوش مصنوعی چیست؟")
+
+import gc
+import multiprocessing
+import os
+import zlib
+from collections import deque
+
+from lexicon import LEXICON
+from metacognitive_core import MetacognitiveCore
+from server import MetacognitiveServer
+from session_manager import SessionManager
+
+# حداکثر درخواست‌های بی‌پاسخ هر کارگر در process_many؛ درخواست‌های در راه باید در بافر
+# لوله جا شوند تا والد و کارگر هنگام نوشتن همزمان منتظر هم نمانند
+PIPELINE_WINDOW = 32
+
+# کارگر بیکار پس از این مدت (ثانیه) نگهداری جلسه‌ها را انجام می‌دهد (SessionManager.maintain)
+MAINTENANCE_INTERVAL = 1.0
+
+
+def route(session_id, workers):
+    """اندیس کارگر یک جلسه (crc32 در همه پردازه‌ها و اجراها یکسان است)"""
+    return zlib.crc32(str(session_id).encode("utf-8")) % workers
+
+
+def _worker_main(connection, core, max_sessions, store_factory):
+    """حلقه کارگر: دریافت درخواست، اجرای آن با عملیات سرور سوکت و ارسال پاسخ"""
+    # ذخیره‌ساز پس از fork ساخته می‌شود تا اتصال‌های پایگاه داده بین پردازه‌ها مشترک نباشند
+    user_store = store_factory() if store_factory is not None else None
+    sessions = SessionManager(core=core, max_sessions=max_sessions, user_store=user_store)
+    handler = MetacognitiveServer(sessions)
+    try:
+        while True:
+            try:
+                if not connection.poll(MAINTENANCE_INTERVAL):
+                    sessions.maintain()
+                    continue
+                message = connection.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+            connection.send(handler.handle(message))
+    finally:
+        sessions.close()
+        connection.close()
+
+
+class WorkerPool:
+    """N پردازه کارگر fork شده، هر کدام با SessionManager خود
+
+    درخواست‌ها همان dictهای سرور سوکت هستند ({"op": "process", "session": ..., ...})؛
+    هسته پایه و جدول‌ها پیش از fork در والد ساخته می‌شوند. store_factory (اختیاری)
+    در هر کارگر یک UserModelStore می‌سازد.
+    """
+
+    def __init__(self, workers=None, core_factory=MetacognitiveCore, max_sessions=10000, store_factory=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.core_factory = core_factory
+        self.max_sessions = max_sessions
+        self.store_factory = store_factory
+        self.processes = []
+        self.connections = []
+
+    def start(self):
+        context = multiprocessing.get_context("fork")
+        # بارگذاری و کامپایل یک‌باره در والد؛ کارگرها نتیجه را از طریق fork به ارث می‌برند
+        LEXICON.compile()
+        core = self.core_factory()
+        gc.collect()
+        gc.freeze()
+        try:
+            for index in range(self.workers):
+                parent_end, child_end = context.Pipe()
+                process = context.Process(
+                    target=_worker_main,
+                    args=(child_end, core, self.max_sessions, self.store_factory),
+                    name=f"metacognitive-worker-{index}",
+                    daemon=True
+                )
+                process.start()
+                child_end.close()
+                self.processes.append(process)
+                self.connections.append(parent_end)
+        finally:
+            gc.unfreeze()
+        return self
+
+    def worker_for(self, session_id):
+        return route(session_id, self.workers)
+
+    def request(self, message):
+        """ارسال یک درخواست به کارگر جلسه آن و انتظار برای پاسخ"""
+        return self._send_to(self.worker_for(message.get("session", "default")), message)
+
+    def process_many(self, messages):
+        """اجرای موازی چند درخواست روی کارگرها؛ پاسخ‌ها به ترتیب درخواست‌ها برمی‌گردند
+
+        درخواست‌های یک جلسه به ترتیب در یک کارگر اجرا می‌شوند.
+        """
+        responses = [None] * len(messages)
+        # اندیس درخواست‌های بی‌پاسخ هر کارگر (پاسخ‌های یک لوله به ترتیب ارسال می‌رسند)
+        pending = [deque() for _ in self.connections]
+        for index, message in enumerate(messages):
+            worker = self.worker_for(message.get("session", "default"))
+            if len(pending[worker]) >= PIPELINE_WINDOW:
+                responses[pending[worker].popleft()] = self.connections[worker].recv()
+            self.connections[worker].send(message)
+            pending[worker].append(index)
+        for worker, indices in enumerate(pending):
+            for index in indices:
+                responses[index] = self.connections[worker].recv()
+        return responses
+
+    def process_input(self, session_id, user_input, context=None, latency_budget=None):
+        response = self.request({
+            "op": "process", "session": session_id, "input": user_input,
+            "context": context, "latency_budget": latency_budget
+        })
+        return self._result(response)
+
+    def metrics(self):
+        """متریک‌های هر کارگر (فهرستی به ترتیب اندیس کارگر)"""
+        return [self._result(self._send_to(worker, {"op": "metrics"})) for worker in range(self.workers)]
+
+    def _send_to(self, worker, message):
+        self.connections[worker].send(message)
+        return self.connections[worker].recv()
+
+    @staticmethod
+    def _result(response):
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.connections = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()